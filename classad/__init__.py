@@ -1,5 +1,5 @@
 """Python package to parse and interpret HTCondor classads"""
-from ._base_expression import Expression, PrimitiveExpression
+from ._base_expression import Expression, PrimitiveExpression, References
 from ._functions import (  # noqa: F401
     eval,
     unparse,
@@ -50,11 +50,24 @@ from ._functions import (  # noqa: F401
     userHome,
     userMap,
 )
-from ._grammar import parse  # noqa: F401
+from ._expression import ChainedClassAd  # noqa: F401
+from ._grammar import parse, ParseCache  # noqa: F401
+from ._intern import intern  # noqa: F401
+from ._regex import PatternCache, pattern_cache  # noqa: F401
+from ._registry import register_function  # noqa: F401
+from ._memo import EvaluationCache, evaluation_cache  # noqa: F401
+from ._io import load_long, load_long_path  # noqa: F401
+from ._parallel import parse_many  # noqa: F401
+from ._matchmaking import match, iter_matches, best_matches  # noqa: F401
+from ._index import MachineIndex, Predicate, extract_predicates  # noqa: F401
+from ._table import ClassAdTable  # noqa: F401
+from ._autocluster import Autoclusters, significant_attributes  # noqa: F401
+from ._incremental import IncrementalMatcher  # noqa: F401
 
 __all__ = [
     "Expression",
     "PrimitiveExpression",
+    "References",
     "eval",
     "unparse",
     "ifThenElse",
@@ -103,6 +116,27 @@ __all__ = [
     "stringList_regexpMember",
     "userHome",
     "userMap",
+    "ChainedClassAd",
     "parse",
+    "ParseCache",
+    "intern",
+    "PatternCache",
+    "pattern_cache",
+    "register_function",
+    "EvaluationCache",
+    "evaluation_cache",
+    "load_long",
+    "load_long_path",
+    "parse_many",
+    "match",
+    "iter_matches",
+    "best_matches",
+    "MachineIndex",
+    "Predicate",
+    "extract_predicates",
+    "ClassAdTable",
+    "Autoclusters",
+    "significant_attributes",
+    "IncrementalMatcher",
 ]
 __version__ = "0.4.1"
@@ -0,0 +1,170 @@
+"""
+Grouping of jobs into autoclusters that are matched only once
+
+Machines only look at a few attributes of a job, namely those their
+attributes reference via ``TARGET``. Together with the
+``Requirements`` and ``Rank`` of the job itself, these *significant attributes*
+decide how a job matches. Jobs with identical significant attributes form an
+autocluster: matching any one of them gives the result for all of them.
+"""
+from typing import Iterable, List, Dict, Set, Optional, Hashable, FrozenSet
+
+from classad._base_expression import Expression
+from classad._expression import ClassAd, FunctionExpression
+from classad._matchmaking import match
+from classad._primitives import (
+    Undefined,
+    Error,
+    HTCBool,
+    HTCInt,
+    HTCFloat,
+    HTCStr,
+    HTCList,
+)
+
+#: attributes of machines and jobs that decide whether and how well they match
+MATCH_KEYS = ("requirements", "rank")
+
+
+def _target_references(
+    ad: ClassAd, keys: Optional[Iterable[str]] = None
+) -> Optional[Set[str]]:
+    """
+    Get the casefolded names of all attributes that :py:attr:`keys` of an ad
+    read from ``TARGET``, or :py:data:`None` if they cannot be known without
+    evaluation
+
+    If no :py:attr:`keys` are given, the references of all attributes are used.
+    """
+    names = set()
+    for key in ad if keys is None else keys:
+        references = ad._get(key.casefold()).references(my=ad)
+        if references.dynamic:
+            return None
+        names |= references.target
+    return names
+
+
+def significant_attributes(
+    machines: Iterable[ClassAd], keys: Optional[Iterable[str]] = None
+) -> Optional[FrozenSet[str]]:
+    """
+    Get the casefolded names of all job attributes that :py:attr:`machines` read
+
+    Attributes are collected from the expressions of the :py:attr:`keys` of each
+    machine, following attributes that the machine itself defines. Plain names
+    that a machine does not define are looked up in the job and thus significant
+    as well. By default, all attributes of the machines are used: besides
+    ``Requirements`` and ``Rank``, a job may read any machine attribute via
+    ``TARGET`` and thus indirectly whatever job attributes its value reads.
+    Such a value is evaluated with the job as ``MY``, so all names it reads via
+    ``MY`` or as plain names are looked up in the job first.
+
+    The result is :py:data:`None` if any machine reads job attributes that
+    cannot be known without evaluation; every job attribute is significant then.
+    """
+    significant = set()
+    for machine in machines:
+        references = _target_references(machine, keys)
+        if references is None:
+            return None
+        significant |= references
+        if keys is None:
+            # values read by the job via TARGET are evaluated with the job as MY
+            for key in machine:
+                significant |= machine._get(key).references().my
+    return frozenset(significant)
+
+
+def _value_key(value) -> Hashable:
+    """Hashable key that is equal for values only if they are identical"""
+    if isinstance(value, HTCBool):
+        return HTCBool, bool(value)
+    elif isinstance(value, (Undefined, Error)):
+        return (type(value),)
+    elif isinstance(value, HTCInt):
+        return HTCInt, int(value)
+    elif isinstance(value, HTCFloat):
+        return HTCFloat, repr(float(value))
+    elif isinstance(value, HTCStr):
+        return HTCStr, str(value)
+    elif isinstance(value, (HTCList, tuple)):
+        return type(value), tuple(_value_key(element) for element in value)
+    elif isinstance(value, ClassAd):
+        return ClassAd, tuple(sorted((key, _value_key(value[key])) for key in value))
+    elif isinstance(value, FunctionExpression):
+        return FunctionExpression, value._name.casefold(), _value_key(value._expression)
+    elif isinstance(value, Expression):
+        return type(value), _value_key(value._expression)
+    return value
+
+
+class Autoclusters(object):
+    """
+    Matchmaking of many jobs by autoclusters of their significant attributes
+
+    Jobs are grouped by a signature of their significant attributes, which
+    includes the attributes read by any of the machines as well as the
+    attributes read by the ``Requirements`` and ``Rank`` of the job. Only one
+    job of each group is matched against the pool.
+
+    .. code:: python3
+
+        autoclusters = Autoclusters(machines)
+        autoclusters.match(jobs)  # same as [match(job, machines) for job in jobs]
+
+    .. Note::
+
+        The significant attributes are computed once from the machines. The
+        autoclusters assume that the machine ads do not change once created.
+    """
+
+    __slots__ = ("_machines", "significant")
+
+    def __init__(self, machines: Iterable[ClassAd]):
+        self._machines = list(machines)
+        #: casefolded names of job attributes read by the machines, or ``None``
+        #: if the machines may read any job attribute
+        self.significant = significant_attributes(self._machines)
+
+    def signature(self, job: ClassAd) -> Hashable:
+        """Get a key that is equal for jobs that match the same machines"""
+        if self.significant is None:
+            return _value_key(job)
+        # values of significant attributes may read further attributes of the job
+        pending, names = [*self.significant, *MATCH_KEYS], set()
+        while pending:
+            name = pending.pop()
+            if name in names:
+                continue
+            names.add(name)
+            references = job._get(name).references()
+            if references.dynamic:
+                return _value_key(job)
+            pending.extend(references.my | references.target)
+        return tuple(sorted((name, _value_key(job._get(name))) for name in names))
+
+    def group(self, jobs: Iterable[ClassAd]) -> Dict[Hashable, List[ClassAd]]:
+        """Group :py:attr:`jobs` by their signature"""
+        groups = {}
+        for job in jobs:
+            groups.setdefault(self.signature(job), []).append(job)
+        return groups
+
+    def match(self, jobs: Iterable[ClassAd]) -> List[List[ClassAd]]:
+        """
+        Get the machines matching each of the :py:attr:`jobs`
+
+        The result is the same as for :py:func:`~.match` of each job, but only
+        one job of each autocluster is evaluated. Jobs of the same autocluster
+        share the same list of machines.
+        """
+        matches, results = {}, []
+        for job in jobs:
+            signature = self.signature(job)
+            try:
+                results.append(matches[signature])
+            except KeyError:
+                result = matches[signature] = match(job, self._machines)
+                results.append(result)
+        return results
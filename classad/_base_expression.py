@@ -1,15 +1,172 @@
 import pyparsing as pp
 
-from typing import Iterable, Any, TYPE_CHECKING, Union, Optional, Tuple
+from typing import (
+    Iterable,
+    Any,
+    TYPE_CHECKING,
+    Union,
+    Optional,
+    Tuple,
+    Callable,
+    NamedTuple,
+    FrozenSet,
+    Hashable,
+)
 
 if TYPE_CHECKING:
     from ._expression import ClassAd
     from ._primitives import Undefined, Error, HTCBool
 
 
+#: function evaluating a compiled expression for given ``my`` and ``target`` ads
+Evaluator = Callable[["Optional[ClassAd]", "Optional[ClassAd]"], "Expression"]
+
+
+class References(NamedTuple):
+    """Attributes read by an expression, see :py:meth:`~.Expression.references`"""
+
+    #: casefolded names of attributes read from ``MY``
+    my: FrozenSet[str]
+    #: casefolded names of attributes read from ``TARGET``
+    target: FrozenSet[str]
+    #: whether further attributes may be read that are only known by evaluation
+    dynamic: bool = False
+
+
+#: casefolded names read via ``MY``, via ``TARGET`` and as plain names, and
+#: whether further attributes may be read that are only known by evaluation
+Scopes = Tuple[FrozenSet[str], FrozenSet[str], FrozenSet[str], bool]
+
+NO_SCOPES: Scopes = (frozenset(), frozenset(), frozenset(), False)
+DYNAMIC_SCOPES: Scopes = (frozenset(), frozenset(), frozenset(), True)
+
+
+def merge_scopes(expressions: "Iterable[Expression]") -> Scopes:
+    """Get the combined scopes of several expressions"""
+    my, target, plain, dynamic = set(), set(), set(), False
+    for expression in expressions:
+        own, other, unscoped, more = expression._references()
+        my |= own
+        target |= other
+        plain |= unscoped
+        dynamic = dynamic or more
+    return frozenset(my), frozenset(target), frozenset(plain), dynamic
+
+
+def _token(value: Any) -> Hashable:
+    """
+    Hashable stand-in for an element of an expression tree, see :py:func:`_same`
+
+    Literals are tagged with their type, so that for example ``1`` and ``1.0``
+    differ. Compound expressions stand for themselves via their structural
+    hash; mutable ones such as ads only via their identity.
+    """
+    if isinstance(value, tuple):
+        return type(value), tuple(map(_token, value))
+    elif isinstance(value, float):
+        # distinguishes 0.0 from -0.0 and makes nan equal to itself
+        return type(value), value.hex()
+    elif isinstance(value, PrimitiveExpression):
+        return type(value), value
+    elif isinstance(value, Expression) and type(value).__hash__ is None:
+        return type(value), id(value)
+    return value
+
+
+def _same(first: Any, second: Any) -> bool:
+    """Check whether two elements of expression trees are identical"""
+    if first is second:
+        return True
+    elif type(first) is not type(second):
+        return False
+    elif isinstance(first, tuple):
+        return len(first) == len(second) and all(map(_same, first, second))
+    elif isinstance(first, float):
+        return first.hex() == second.hex()
+    elif isinstance(first, Expression) and type(first).__hash__ is None:
+        return False
+    return bool(first == second)
+
+
 class Expression:
     __slots__ = ()
 
+    def compile(
+        self, key: "Optional[Iterable[Union[str, CompoundExpression]]]" = None
+    ) -> Evaluator:
+        """
+        Translate the expression to a function of the ``my`` and ``target`` ads
+
+        Operators, functions and the way attributes are looked up are resolved
+        only once, so that ``expression.compile(key)(my, target)`` is equivalent
+        to but much faster than ``expression.evaluate(key, my, target)``. This
+        pays off when the same expression is evaluated for many ads, e.g. the
+        ``Requirements`` of a job for every machine of a pool.
+
+        .. code:: python3
+
+            requirements = job.compile("Requirements")
+            matches = [machine for machine in machines if requirements(job, machine)]
+
+        .. Note::
+
+            The compiled function captures the expression as it is at compile time.
+            Changing an ad after compiling one of its attributes is not reflected.
+        """
+        if isinstance(key, str):
+            key = key.split(".")
+        return self._compile(key)
+
+    def _compile(
+        self, key: "Optional[Iterable[Union[str, CompoundExpression]]]" = None
+    ) -> Evaluator:
+        raise NotImplementedError
+
+    def references(self, my: "Optional[ClassAd]" = None) -> References:
+        """
+        Get the names of all attributes the expression reads from ``MY`` and ``TARGET``
+
+        Plain attribute names are read from ``MY`` and, if they are not defined
+        there, from ``TARGET``. If the :py:attr:`my` ad is given, the attributes
+        read from it are followed: the result includes what their values read,
+        and plain names defined by :py:attr:`my` are not read from ``TARGET``.
+
+        .. code:: python3
+
+            parse("TARGET.Memory >= RequestMemory").references()
+            # References(my={'requestmemory'}, target={'memory', 'requestmemory'})
+
+        Some attributes, for example those read via ``eval``, cannot be known
+        without evaluation. The result is marked as
+        :py:attr:`~.References.dynamic` if there may be such attributes.
+        """
+        if my is not None:
+            return my._follow_references(self._references())
+        own, target, plain, dynamic = self._references()
+        return References(own | plain, target | plain, dynamic)
+
+    def _references(self) -> Scopes:
+        """Get the names of attributes read by ``MY``, ``TARGET`` and plain names"""
+        return NO_SCOPES
+
+    def specialize(self, my: "ClassAd") -> "Expression":
+        """
+        Partially evaluate the expression for a fixed :py:attr:`my` ad
+
+        The result gives the same values as the expression when evaluated with
+        the same :py:attr:`my` and any ``TARGET``, but only needs to look up the
+        ``TARGET`` attributes. See :py:func:`~.specialize` for details.
+
+        .. code:: python3
+
+            requirements = job["Requirements"].specialize(my=job).compile([])
+            matches = [machine for machine in machines if requirements(job, machine)]
+        """
+        # the optimizations are built on top of all expression types
+        from classad._optimize import specialize
+
+        return specialize(self, my)
+
     def evaluate(
         self,
         key: "Optional[Iterable[Union[str, CompoundExpression]]]" = None,
@@ -32,10 +189,26 @@ class Expression:
 
 
 class CompoundExpression(Expression):
-    __slots__ = "_expression"
+    __slots__ = ("_expression", "_referenced", "_hash", "__weakref__")
 
     _expression: Tuple[Expression, ...]
 
+    def _structure(self) -> Tuple:
+        """Get the elements that decide whether two expressions are identical"""
+        return self._expression
+
+    def _references(self) -> Scopes:
+        try:
+            return self._referenced
+        except AttributeError:
+            self._referenced = self._collect_references()
+            return self._referenced
+
+    def _collect_references(self) -> Scopes:
+        """Find the attributes read by the expression, see :py:meth:`_references`"""
+        # expressions without a dedicated analysis may read anything
+        return DYNAMIC_SCOPES
+
     def evaluate(
         self,
         key: "Optional[Iterable[Union[str, CompoundExpression]]]" = None,
@@ -54,6 +227,17 @@ class CompoundExpression(Expression):
     ) -> Any:
         return NotImplemented
 
+    def _compile(
+        self, key: "Optional[Iterable[Union[str, CompoundExpression]]]" = None
+    ) -> Evaluator:
+        # fallback for expressions without a dedicated compiled form
+        evaluate = self._evaluate
+
+        def evaluator(my, target):
+            return evaluate(key=key, my=my, target=target)
+
+        return evaluator
+
     @classmethod
     def from_grammar(cls, tokens):
         result = cls()
@@ -75,7 +259,26 @@ class CompoundExpression(Expression):
         return f"<{self.__class__.__name__}>: {self._expression}"
 
     def __eq__(self, other):
-        return type(self) == type(other) and self._expression == other._expression
+        # structural equality, matching the hash
+        return self is other or (
+            type(self) is type(other)
+            and hash(self) == hash(other)
+            and _same(self._structure(), other._structure())
+        )
+
+    def __hash__(self):
+        try:
+            return self._hash
+        except AttributeError:
+            self._hash = hash((type(self), _token(self._structure())))
+            return self._hash
+
+    def __reduce__(self):
+        # pickle only the class and the expression, not the slot names
+        return self.__class__, (), self._expression
+
+    def __setstate__(self, state):
+        self._expression = state
 
 
 class PrimitiveExpression(Expression):
@@ -97,6 +300,14 @@ class PrimitiveExpression(Expression):
     ) -> "Expression":
         return self
 
+    def _compile(
+        self, key: Optional[Iterable[Union[str, CompoundExpression]]] = None
+    ) -> Evaluator:
+        def constant(my, target):
+            return self
+
+        return constant
+
     def __htc_eq__(
         self, b: "PrimitiveExpression"
     ) -> "Union[HTCBool, Undefined, Error]":
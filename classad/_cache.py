@@ -0,0 +1,71 @@
+"""
+Bounded caches with statistics, shared by parsing, patterns and evaluation
+"""
+from collections import OrderedDict
+from typing import Any, Hashable, NamedTuple
+
+
+class CacheInfo(NamedTuple):
+    hits: int
+    misses: int
+    evictions: int
+    maxsize: int
+    currsize: int
+
+
+#: marker for keys that are not cached, since :py:data:`None` may be cached
+MISSING = object()
+
+
+class LRUCache(object):
+    """
+    Base of caches that evict the least recently used entry
+
+    Subclasses look up their entries with :py:meth:`_lookup` and add new ones
+    with :py:meth:`_store`, which count the hits, misses and evictions reported
+    by :py:meth:`info`. When more than :py:attr:`maxsize` entries are cached,
+    the least recently used one is evicted.
+    """
+
+    __slots__ = ("maxsize", "hits", "misses", "evictions", "_entries")
+
+    def __init__(self, maxsize: int):
+        if maxsize < 1:
+            raise ValueError(f"maxsize must be positive, got {maxsize}")
+        self.maxsize = maxsize
+        self.hits = self.misses = self.evictions = 0
+        self._entries = OrderedDict()
+
+    def _lookup(self, key: Hashable) -> Any:
+        """Get the entry for :py:attr:`key` or :py:data:`MISSING` if there is none"""
+        try:
+            result = self._entries[key]
+        except KeyError:
+            self.misses += 1
+            return MISSING
+        self.hits += 1
+        self._entries.move_to_end(key)
+        return result
+
+    def _store(self, key: Hashable, value: Any) -> None:
+        """Add the entry :py:attr:`value` for :py:attr:`key`"""
+        self._entries[key] = value
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def info(self) -> CacheInfo:
+        return CacheInfo(
+            self.hits, self.misses, self.evictions, self.maxsize, len(self._entries)
+        )
+
+    def clear(self):
+        """Remove all entries and reset the statistics"""
+        self._entries.clear()
+        self.hits = self.misses = self.evictions = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__}>: {self.info()}"
@@ -1,13 +1,44 @@
 import operator
+import sys
 from collections import MutableMapping
 
 import pyparsing as pp
-from typing import Iterable, List, Iterator, Optional, Union, Tuple
+from typing import (
+    Callable,
+    Iterable,
+    List,
+    Iterator,
+    Optional,
+    Union,
+    Tuple,
+    TYPE_CHECKING,
+)
 
-from classad._operator import eq_operator, ne_operator, not_operator, neg_operator
-from classad._primitives import Error, Undefined, HTCBool
-from ._base_expression import CompoundExpression, Expression
-from . import _functions
+from classad._operator import (
+    eq_operator,
+    ne_operator,
+    not_operator,
+    neg_operator,
+    shortcuts,
+    int_comparisons,
+)
+from classad._primitives import Error, Undefined, HTCBool, HTCInt, HTCStr, UNDEFINED
+from ._base_expression import (
+    CompoundExpression,
+    Expression,
+    PrimitiveExpression,
+    Evaluator,
+    References,
+    Scopes,
+    DYNAMIC_SCOPES,
+    merge_scopes,
+)
+from ._shape import CompactRecord
+from ._registry import Builtin, INVALID_CALL, lookup
+from . import _grammar, _memo
+
+if TYPE_CHECKING:
+    from ._grammar import ParseCache
 
 
 def scope_up(key: List[str]):
@@ -15,6 +46,14 @@ def scope_up(key: List[str]):
 
 
 class ClassAd(CompoundExpression, MutableMapping):
+    """
+    Record of named expressions
+
+    Attributes are stored compactly in slots shared with all ads that define
+    the same names in the same order. An ad falls back to a ``dict`` of its own
+    once an attribute is deleted or its names are not shared with other ads.
+    """
+
     __slots__ = "_data"
 
     def __add__(self, other):
@@ -24,7 +63,7 @@ class ClassAd(CompoundExpression, MutableMapping):
 
     def __init__(self):
         super().__init__()
-        self._data = dict()
+        self._data = CompactRecord()
 
     def __setitem__(
         self, key: Union[str, CompoundExpression], value: Expression
@@ -39,10 +78,23 @@ class ClassAd(CompoundExpression, MutableMapping):
             key = key._expression.casefold()
         if key in ["error", "false", "is", "isnt", "parent", "true", "undefined"]:
             raise ValueError(f"{key} is a reserved name")
-        self._data[key] = value
+        key = sys.intern(key)
+        data = self._data
+        if type(data) is not dict and not data.fits(key):
+            data = self._data = dict(data.items())
+        data[key] = value
 
     def __delitem__(self, key: Union[str, CompoundExpression]) -> None:
-        self._data.pop(key, None)
+        try:
+            key = key.casefold()
+        except AttributeError:
+            key = key._expression.casefold()
+        data = self._data
+        if type(data) is not dict:
+            if key not in data:
+                return
+            data = self._data = dict(data.items())
+        data.pop(key, None)
 
     def __getitem__(self, key: Iterable[Union[str, CompoundExpression]]) -> Expression:
         if isinstance(key, str):
@@ -62,6 +114,47 @@ class ClassAd(CompoundExpression, MutableMapping):
     def __iter__(self) -> Iterator[str]:
         return iter(self._data)
 
+    def __contains__(self, key: str) -> bool:
+        return isinstance(key, str) and key.casefold() in self._data
+
+    def _get(self, key: str) -> Expression:
+        """Look up the casefolded name of a top-level attribute"""
+        data = self._data
+        # inlined lookup of the record, which is on the path of every evaluation
+        if data.__class__ is CompactRecord:
+            index = data._shape.slots.get(key)
+            if index is None:
+                return UNDEFINED
+            return data._values[index]
+        return data.get(key, UNDEFINED)
+
+    def _references(self) -> Scopes:
+        # the content may change, so the references are never memoized
+        return merge_scopes(self._get(key) for key in self)
+
+    def _follow_references(self, scopes: Scopes) -> References:
+        """Resolve the :py:attr:`scopes` of an expression with this ad as ``MY``"""
+        own, target, plain, dynamic = scopes
+        read, target, followed = set(), set(target), set()
+        pending = [*((name, False) for name in own), *((name, True) for name in plain)]
+        while pending:
+            name, unscoped = pending.pop()
+            read.add(name)
+            value = self._get(name)
+            if isinstance(value, Undefined):
+                if unscoped:
+                    target.add(name)
+                continue
+            elif name in followed:
+                continue
+            followed.add(name)
+            own, other, plain, more = value._references()
+            target |= other
+            dynamic = dynamic or more
+            pending.extend((name, False) for name in own)
+            pending.extend((name, True) for name in plain)
+        return References(frozenset(read), frozenset(target), dynamic)
+
     def _evaluate(
         self,
         key: Optional[Iterable[Union[str, CompoundExpression]]] = None,
@@ -78,6 +171,19 @@ class ClassAd(CompoundExpression, MutableMapping):
         new_key = key[:-1]
         return expression._evaluate(key=new_key, my=self, target=target)
 
+    def _compile(
+        self, key: Optional[Iterable[Union[str, CompoundExpression]]] = None
+    ) -> Evaluator:
+        if not key:
+            # nested records are only evaluated when the call is reached
+            return super()._compile(key)
+        expression = self[key]._compile(key[:-1])
+
+        def evaluator(my, target):
+            return expression(self, target)
+
+        return evaluator
+
     @classmethod
     def from_grammar(cls, tokens):
         result = cls()
@@ -88,10 +194,165 @@ class ClassAd(CompoundExpression, MutableMapping):
     def __eq__(self, other):
         return HTCBool(type(self) == type(other) and self._data == other._data)
 
+    def __reduce__(self):
+        return self.__class__, (), None, None, iter(self._data.items())
+
     def __repr__(self):
         return f"<{self.__class__.__name__}>: {self._data}"
 
 
+class _Unparsed(object):
+    """Source of an attribute value that has not been parsed yet"""
+
+    __slots__ = ("source",)
+
+    def __init__(self, source: str):
+        self.source = source
+
+    def __reduce__(self):
+        return self.__class__, (self.source,)
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__}>: {self.source}"
+
+
+class LazyClassAd(ClassAd):
+    """
+    ClassAd that parses attribute values only once they are used
+
+    Each attribute value is kept as its source text until it is looked up for
+    the first time, e.g. during evaluation. The parsed expression then replaces
+    the source. Iterating over the ad, checking for a key and taking its
+    ``len`` never parse any values.
+    """
+
+    __slots__ = ("_backend", "_cache")
+
+    def __init__(self, backend: str = "fast", cache: "Optional[ParseCache]" = None):
+        super().__init__()
+        self._backend = backend
+        self._cache = cache
+
+    @classmethod
+    def from_source(
+        cls,
+        definitions: Iterable[Tuple[str, str]],
+        backend: str = "fast",
+        cache: "Optional[ParseCache]" = None,
+    ) -> "LazyClassAd":
+        """Create an ad from pairs of attribute names and unparsed values"""
+        result = cls(backend=backend, cache=cache)
+        for key, source in definitions:
+            result[key] = _Unparsed(source)
+        return result
+
+    def _parse(self, key: str):
+        value = self._data.get(key)
+        if type(value) is _Unparsed:
+            self._data[key] = _grammar.parse(
+                value.source, backend=self._backend, cache=self._cache
+            )
+
+    def __getitem__(self, key: Iterable[Union[str, CompoundExpression]]) -> Expression:
+        if isinstance(key, str):
+            key = [key]
+        if key:
+            self._parse(key[0].casefold())
+        return super().__getitem__(key)
+
+    def _get(self, key: str) -> Expression:
+        self._parse(key)
+        return super()._get(key)
+
+    def __eq__(self, other):
+        for key in self._data:
+            self._parse(key)
+        if isinstance(other, LazyClassAd):
+            for key in other._data:
+                other._parse(key)
+        return super().__eq__(other)
+
+    def __reduce__(self):
+        # the cache is local to each process and not transferred
+        return self.__class__, (self._backend,), None, None, iter(self._data.items())
+
+
+class ChainedClassAd(ClassAd):
+    """
+    ClassAd that looks up attributes it does not define in a parent ad
+
+    This is how HTCondor stores the ads of the jobs of a cluster: each proc ad
+    only defines the attributes specific to the proc, such as ``ProcId``, and
+    shares all other attributes with the ad of the cluster.
+
+    .. code:: python3
+
+        cluster = parse('ClusterId = 42\\nRequestMemory = 2048\\nOwner = "alice"')
+        proc = ChainedClassAd(cluster)
+        proc["ProcId"] = parse("3")
+        proc.evaluate("RequestMemory")  # HTCInt(2048)
+
+    Setting an attribute only changes the chained ad, never the parent. Deleting
+    an attribute removes it from the chained ad, so that the attribute of the
+    parent is visible again. Changes of the parent are seen by the chained ad.
+    """
+
+    __slots__ = ("_parent",)
+
+    def __init__(self, parent: ClassAd):
+        super().__init__()
+        self._parent = parent
+
+    @property
+    def parent(self) -> ClassAd:
+        """The ad providing all attributes not defined by this ad"""
+        return self._parent
+
+    def flatten(self) -> ClassAd:
+        """Get an independent ad with the attributes of the entire chain"""
+        result = ClassAd()
+        for key in self:
+            result[key] = self._get(key)
+        return result
+
+    def __getitem__(self, key: Iterable[Union[str, CompoundExpression]]) -> Expression:
+        if isinstance(key, str):
+            key = [key]
+        if key and key[0].casefold() not in self._data:
+            return self._parent[key]
+        return super().__getitem__(key)
+
+    def _get(self, key: str) -> Expression:
+        value = super()._get(key)
+        if value is UNDEFINED and key not in self._data:
+            return self._parent._get(key)
+        return value
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def __iter__(self) -> Iterator[str]:
+        yield from self._parent
+        parent = self._parent
+        for key in self._data:
+            if key not in parent:
+                yield key
+
+    def __contains__(self, key: str) -> bool:
+        return super().__contains__(key) or key in self._parent
+
+    def __eq__(self, other):
+        return HTCBool(
+            type(self) == type(other) and dict(self.items()) == dict(other.items())
+        )
+
+    def __reduce__(self):
+        return self.__class__, (self._parent,), None, None, iter(self._data.items())
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__}>: {self._data} -> {self._parent!r}"
+
+
 class NamedExpression(CompoundExpression):
     __slots__ = ()
 
@@ -105,19 +366,44 @@ class NamedExpression(CompoundExpression):
 
 
 class FunctionExpression(CompoundExpression):
-    __slots__ = ("_name",)
+    """
+    Call of a registered function by its case-insensitive name
+
+    The call is bound to the function when it is created. A call with a number
+    of arguments the function does not accept evaluates to :py:class:`~.Error`.
+    Calls of names that are not registered yet are bound when they are first
+    evaluated, and fail if there still is no such function.
+    """
+
+    __slots__ = ("_name", "_builtin")
 
     def __init__(self, name: str, args: Tuple[Expression, ...]):
         super().__init__()
         self._name = name
         self._expression = args
+        self._builtin = self._bind()
 
-    def __eq__(self, other):
-        return (
-            type(self) == type(other)
-            and self._expression == other._expression
-            and self._name == other._name
-        )
+    def _bind(self) -> "Optional[Builtin]":
+        """Get the registered function called by the expression, if any"""
+        builtin = lookup(self._name)
+        if builtin is None or builtin.accepts(len(self._expression)):
+            return builtin
+        return INVALID_CALL
+
+    def _function(self) -> Builtin:
+        """Get the registered function or fail if there is none"""
+        builtin = self._builtin
+        if builtin is None:
+            builtin = self._builtin = self._bind()
+            if builtin is None:
+                raise AttributeError(f"unknown function {self._name!r}")
+        return builtin
+
+    def _structure(self) -> Tuple:
+        return self._name, self._expression
+
+    def __reduce__(self):
+        return self.__class__, (self._name, self._expression)
 
     def _evaluate(
         self,
@@ -128,7 +414,45 @@ class FunctionExpression(CompoundExpression):
         expression = []
         for element in self._expression:
             expression.append(element._evaluate(key=key, my=my, target=target))
-        return getattr(_functions, self._name)(*expression)
+        builtin = self._function()
+        cache = _memo.current.cache
+        if cache is not None and builtin.pure:
+            return cache.call(builtin.function, tuple(expression))
+        return builtin.function(*expression)
+
+    def _compile(
+        self, key: Optional[Iterable[Union[str, CompoundExpression]]] = None
+    ) -> Evaluator:
+        if self._builtin is None and self._bind() is None:
+            # fail only if the call is actually evaluated
+            return super()._compile(key)
+        builtin = self._function()
+        function = builtin.function
+        arguments = tuple(element._compile(key) for element in self._expression)
+        if builtin.pure:
+            # the cache is looked up when called, as it is scoped to evaluations
+            current = _memo.current
+
+            def pure_call(my, target):
+                cache = current.cache
+                if cache is not None:
+                    return cache.call(
+                        function, tuple(argument(my, target) for argument in arguments)
+                    )
+                return function(*[argument(my, target) for argument in arguments])
+
+            return pure_call
+
+        def call(my, target):
+            return function(*[argument(my, target) for argument in arguments])
+
+        return call
+
+    def _collect_references(self) -> Scopes:
+        # the expression evaluated by eval is only known at runtime
+        if self._name.casefold() == "eval":
+            return DYNAMIC_SCOPES
+        return merge_scopes(self._expression)
 
     @classmethod
     def from_grammar(cls, tokens):
@@ -163,6 +487,38 @@ class TernaryExpression(CompoundExpression):
                 return if_false._evaluate(key=key, my=my, target=target)
         return Error()
 
+    def _compile(
+        self, key: Optional[Iterable[Union[str, CompoundExpression]]] = None
+    ) -> Evaluator:
+        predicate, if_true, if_false = (
+            None if element is None else element._compile(key)
+            for element in self._expression
+        )
+        if if_true is None:
+
+            def elvis(my, target):
+                result = predicate(my, target)
+                if isinstance(result, Undefined):
+                    return if_false(my, target)
+                return result
+
+            return elvis
+
+        def ternary(my, target):
+            result = predicate(my, target)
+            if isinstance(result, Undefined):
+                return Undefined()
+            if isinstance(result, HTCBool):
+                return if_true(my, target) if result else if_false(my, target)
+            return Error()
+
+        return ternary
+
+    def _collect_references(self) -> Scopes:
+        return merge_scopes(
+            element for element in self._expression if element is not None
+        )
+
 
 class DotExpression(CompoundExpression):
     __slots__ = ()
@@ -196,6 +552,11 @@ class DotExpression(CompoundExpression):
                 return Undefined()
         return to_check
 
+    def _collect_references(self) -> Scopes:
+        # attributes missing in the record are looked up in the evaluated ad
+        own, target, plain, _ = self._expression[0]._references()
+        return own, target, plain, True
+
 
 class SubscriptableExpression(CompoundExpression):
     __slots__ = ()
@@ -210,9 +571,55 @@ class SubscriptableExpression(CompoundExpression):
         index = self._expression[1]._evaluate(key=key, my=my, target=target)
         return operand[index]._evaluate(key=key, my=my, target=target)
 
+    def _compile(
+        self, key: Optional[Iterable[Union[str, CompoundExpression]]] = None
+    ) -> Evaluator:
+        operand, index = (element._compile(key) for element in self._expression)
+
+        def subscript(my, target):
+            element = operand(my, target)[index(my, target)]
+            return element._evaluate(key=key, my=my, target=target)
+
+        return subscript
+
+    def _collect_references(self) -> Scopes:
+        return merge_scopes(self._expression)
+
 
 class AttributeExpression(CompoundExpression):
-    __slots__ = ()
+    """
+    Reference to an attribute by name, possibly scoped by ``MY`` or ``TARGET``
+
+    The way to look up a single attribute at the top level of an ad is planned
+    once per expression, so that repeated evaluations only probe the scopes.
+    """
+
+    __slots__ = ("_plan",)
+
+    def _resolution_plan(self) -> "Optional[Tuple[Optional[str], str]]":
+        """
+        Get the scope and casefolded name for looking up a top-level attribute
+
+        The scope is ``"my"`` or ``"target"`` for explicitly scoped attributes
+        and ``None`` for attributes looked up in ``my`` before ``target``. There is
+        no plan for nested and dotted attributes, which use the generic lookup.
+        """
+        try:
+            return self._plan
+        except AttributeError:
+            pass
+        expression = self._expression
+        if isinstance(expression, str):
+            scope, name = None, expression
+        elif expression[0].casefold() in ("target", "my"):
+            scope, name = expression[0].casefold(), expression[1]
+        else:
+            scope, name = None, None
+        if isinstance(name, str):
+            self._plan = scope, sys.intern(name.casefold())
+        else:
+            self._plan = None
+        return self._plan
 
     def _evaluate(
         self,
@@ -220,6 +627,38 @@ class AttributeExpression(CompoundExpression):
         my: "Optional[ClassAd]" = None,
         target: "Optional[ClassAd]" = None,
     ) -> Expression:
+        plan = self._resolution_plan()
+        if plan is not None and not key:
+            scope, name = plan
+            if scope is None:
+                if my is None:
+                    return Error()
+                value = my._get(name)
+                # an ad equal to my cannot provide the attribute either
+                if isinstance(value, Undefined) and target is not None:
+                    if target is not my:
+                        value = target._get(name)
+            elif scope == "target":
+                if target is None:
+                    return Undefined()
+                value = target._get(name)
+            else:
+                if my is None:
+                    return Undefined()
+                value = my._get(name)
+            if isinstance(value, AttributeExpression):
+                return value._evaluate(key=key, my=my, target=target)
+            return value
+        return self._resolve(key=key, my=my, target=target)
+
+    def _resolve(
+        self,
+        key: Optional[Iterable[Union[str, CompoundExpression]]] = None,
+        my: "Optional[ClassAd]" = None,
+        target: "Optional[ClassAd]" = None,
+    ) -> Expression:
+        """Generic lookup of an attribute in nested and dotted scopes"""
+
         def find_scope(current_key, classad=my):
             if len(current_key) > 0:
                 return classad[current_key]
@@ -236,7 +675,7 @@ class AttributeExpression(CompoundExpression):
                 return Undefined()
             selected_classad = target
             expression = self._expression[1]
-        elif self._expression[0] == "my":
+        elif self._expression[0].casefold() == "my":
             if my is None:
                 return Undefined()
             expression = self._expression[1]
@@ -257,7 +696,7 @@ class AttributeExpression(CompoundExpression):
                         target is not None
                         and self._expression[0] != "."
                         and self._expression[0] != "target"
-                        and self._expression[0] != "my"
+                        and self._expression[0].casefold() != "my"
                         and selected_classad != target
                     ):
                         selected_classad = target
@@ -271,6 +710,71 @@ class AttributeExpression(CompoundExpression):
             return value._evaluate(key=the_key, my=my, target=target)
         return value
 
+    def _compile(
+        self, key: Optional[Iterable[Union[str, CompoundExpression]]] = None
+    ) -> Evaluator:
+        plan = self._resolution_plan()
+        if plan is None or key:
+            return super()._compile(key)
+        scope, name = plan
+
+        if scope == "target":
+
+            def target_attribute(my, target):
+                if target is None:
+                    return Undefined()
+                value = target._get(name)
+                if isinstance(value, AttributeExpression):
+                    return value._evaluate(key=key, my=my, target=target)
+                return value
+
+            return target_attribute
+        elif scope == "my":
+
+            def my_attribute(my, target):
+                if my is None:
+                    return Undefined()
+                value = my._get(name)
+                if isinstance(value, AttributeExpression):
+                    return value._evaluate(key=key, my=my, target=target)
+                return value
+
+            return my_attribute
+
+        def attribute(my, target):
+            if my is None:
+                return Error()
+            value = my._get(name)
+            if isinstance(value, Undefined) and target is not None:
+                if target is not my:
+                    value = target._get(name)
+            if isinstance(value, AttributeExpression):
+                return value._evaluate(key=key, my=my, target=target)
+            return value
+
+        return attribute
+
+    def _collect_references(self) -> Scopes:
+        plan = self._resolution_plan()
+        if plan is None:
+            # nested attributes read the record of their first name from the scope
+            expression = self._expression
+            scope = expression[0] if isinstance(expression[0], str) else ""
+            scope = scope.casefold() if scope.casefold() in ("my", "target") else None
+            names = expression if scope is None else expression[1]
+            if not isinstance(names, tuple) or not isinstance(names[0], str):
+                return DYNAMIC_SCOPES
+            elif names[0] == "." or names[0].casefold() == "parent":
+                return DYNAMIC_SCOPES
+            plan = scope, names[0].casefold()
+        scope, name = plan
+        names, empty = frozenset((name,)), frozenset()
+        if scope == "my":
+            return names, empty, empty, False
+        elif scope == "target":
+            return empty, names, empty, False
+        return empty, empty, names, False
+
     @classmethod
     def from_grammar(cls, tokens):
         result = cls()
@@ -308,6 +812,20 @@ class UnaryExpression(CompoundExpression):
         operand = self._expression[1]._evaluate(key=key, my=my, target=target)
         return self.operator_map[self._expression[0]](operand)
 
+    def _compile(
+        self, key: Optional[Iterable[Union[str, CompoundExpression]]] = None
+    ) -> Evaluator:
+        function = self.operator_map[self._expression[0]]
+        operand = self._expression[1]._compile(key)
+
+        def operation(my, target):
+            return function(operand(my, target))
+
+        return operation
+
+    def _collect_references(self) -> Scopes:
+        return self._expression[1]._references()
+
 
 class ArithmeticExpression(CompoundExpression):
     __slots__ = ()
@@ -331,24 +849,40 @@ class ArithmeticExpression(CompoundExpression):
         "is": operator.eq,
     }
 
+    #: boolean operators and the value of the first operand that decides them
+    short_circuit_map = {"&&": False, "||": True}
+
     def _calculate(self, first, second, operand) -> Expression:
         try:
             return self.operator_map[operand](first, second)
         except (ArithmeticError, AttributeError, TypeError):
             return Error()
 
-    def __eq__(self, other):
-        if type(self) == type(other):
-            # check operators
-            return all(
-                (
-                    self._expression[0] == other._expression[0],
-                    self.operator_map[self._expression[1]]
-                    == self.operator_map[other._expression[1]],
-                    self._expression[2] == other._expression[2],
-                )
-            )
-        return False
+    def _short_circuits(self, first, operand) -> bool:
+        """
+        Check whether the result of ``first`` and :py:attr:`operand` is ``first``
+        regardless of the second operand
+
+        This is the case for ``false && X`` and ``true || X`` as well as for an
+        :py:class:`~.Error` on the left hand side, which is absorbing.
+        """
+        decisive = self.short_circuit_map.get(operand)
+        if decisive is None:
+            return False
+        if isinstance(first, HTCBool):
+            return bool(first) is decisive
+        return isinstance(first, Error)
+
+    def _collect_references(self) -> Scopes:
+        return merge_scopes(self._expression[::2])
+
+    def _structure(self) -> Tuple:
+        # aliases such as "is" and "=?=" are the same operator
+        operators = self.operator_map
+        return tuple(
+            operators.get(element, element) if index % 2 else element
+            for index, element in enumerate(self._expression)
+        )
 
     def _evaluate(
         self,
@@ -358,8 +892,160 @@ class ArithmeticExpression(CompoundExpression):
     ) -> Expression:
         result = self._expression[0]._evaluate(key=key, my=my, target=target)
         for position in range(0, len(self._expression) - 1, 2):
+            operand = self._expression[position + 1]
+            if self._short_circuits(result, operand):
+                continue
             second = self._expression[position + 2]._evaluate(
                 key=key, my=my, target=target
             )
-            result = self._calculate(result, second, self._expression[position + 1])
+            result = self._calculate(result, second, operand)
         return result
+
+    def _compile(
+        self, key: Optional[Iterable[Union[str, CompoundExpression]]] = None
+    ) -> Evaluator:
+        expression = self._expression
+        operators = set(expression[1::2])
+        if len(operators) == 1 and operators <= self.short_circuit_map.keys():
+            return self._compile_chain(expression[1], key)
+        result = expression[0]._compile(key)
+        for position in range(1, len(expression), 2):
+            result = self._compile_operation(
+                result, expression[position], expression[position + 1], key
+            )
+        return result
+
+    def _compile_chain(
+        self, operand: str, key: Optional[Iterable[Union[str, CompoundExpression]]]
+    ) -> Evaluator:
+        """Compile a chain of the same boolean operator, e.g. ``a && b && c``"""
+        function = self.operator_map[operand]
+        decisive = self.short_circuit_map[operand]
+        first, *rest = (element._compile(key) for element in self._expression[::2])
+
+        def chain(my, target):
+            value = first(my, target)
+            for second in rest:
+                if value.__class__ is HTCBool:
+                    if value._value is decisive:
+                        return value
+                elif isinstance(value, Error):
+                    return value
+                other = second(my, target)
+                if value.__class__ is HTCBool and other.__class__ is HTCBool:
+                    # the first operand does not decide, so the second does
+                    value = other
+                    continue
+                try:
+                    value = function(value, other)
+                except (ArithmeticError, AttributeError, TypeError):
+                    value = Error()
+            return value
+
+        return chain
+
+    def _compile_operation(
+        self,
+        first: Evaluator,
+        operand: str,
+        second: Expression,
+        key: Optional[Iterable[Union[str, CompoundExpression]]],
+    ) -> Evaluator:
+        function = self.operator_map[operand]
+        shortcut = shortcuts.get(operand)
+        decisive = self.short_circuit_map.get(operand)
+        if decisive is not None:
+            second = second._compile(key)
+
+            def logical(my, target):
+                value = first(my, target)
+                if isinstance(value, HTCBool):
+                    if value._value is decisive:
+                        return value
+                elif isinstance(value, Error):
+                    return value
+                other = second(my, target)
+                result = shortcut(value, other)
+                if result is not None:
+                    return result
+                try:
+                    return function(value, other)
+                except (ArithmeticError, AttributeError, TypeError):
+                    return Error()
+
+            return logical
+        elif isinstance(second, PrimitiveExpression):
+            # literals are common on the right hand side, e.g. ``Memory >= 2048``
+            constant = second
+
+            def calculate(value):
+                if shortcut is not None:
+                    result = shortcut(value, constant)
+                    if result is not None:
+                        return result
+                try:
+                    return function(value, constant)
+                except (ArithmeticError, AttributeError, TypeError):
+                    return Error()
+
+            comparison = self._compile_comparison(first, operand, constant, calculate)
+            if comparison is not None:
+                return comparison
+
+            def constant_operation(my, target):
+                return calculate(first(my, target))
+
+            return constant_operation
+        second = second._compile(key)
+
+        def operation(my, target):
+            value = first(my, target)
+            other = second(my, target)
+            if shortcut is not None:
+                result = shortcut(value, other)
+                if result is not None:
+                    return result
+            try:
+                return function(value, other)
+            except (ArithmeticError, AttributeError, TypeError):
+                return Error()
+
+        return operation
+
+    @staticmethod
+    def _compile_comparison(
+        first: Evaluator,
+        operand: str,
+        constant: PrimitiveExpression,
+        calculate: Callable[[Expression], Expression],
+    ) -> Optional[Evaluator]:
+        """
+        Compile the comparison of an operand with a string or integer literal
+
+        Comparisons such as ``TARGET.Arch == "X86_64"`` or ``Memory >= 2048`` are
+        checked directly if the operand has the same type as the literal, and
+        by :py:attr:`calculate` otherwise.
+        """
+        true, false = HTCBool.TRUE, HTCBool.FALSE
+        if type(constant) is HTCStr and operand in ("==", "!="):
+            folded = constant.lower()
+            equal, unequal = (true, false) if operand == "==" else (false, true)
+
+            def string_comparison(my, target):
+                value = first(my, target)
+                if value.__class__ is HTCStr:
+                    return equal if value.lower() == folded else unequal
+                return calculate(value)
+
+            return string_comparison
+        compare = int_comparisons.get(operand)
+        if type(constant) is HTCInt and compare is not None:
+
+            def int_comparison(my, target):
+                value = first(my, target)
+                if value.__class__ is HTCInt:
+                    return true if compare(value, constant) else false
+                return calculate(value)
+
+            return int_comparison
+        return None
@@ -26,18 +26,20 @@ are excluded as those are not listed in the HTCondor Manual, those include
 * splitTime(time: Union[RelTime, AbsTime]) -> ClassAd: ...
 * formatTime(t: Union[AbsTime, int], s: str) -> str: ...
 
-.. TODO::
-
-    General check for number of attributes defined is currently not supported
-    by the given functions below. We should maybe consider overriding all functions
-    and having the general function with `*args`.
+All functions defined here are registered as builtins of expressions, see
+:py:func:`~.register_function`. The number of arguments of a call is checked
+against the signature of the function when the call is created.
 """
+import inspect
 import math
 import random as py_random
 from typing import TypeVar, List, Union, overload, Optional, Any
 
 from classad._grammar import parse
 from classad._base_expression import Expression
+from classad._regex import pattern_cache, expand
+from classad import _stringlist
+from classad._registry import register_function
 from classad._primitives import (
     Undefined,
     Error,
@@ -52,6 +54,12 @@ T = TypeVar("T", HTCFloat, HTCInt)
 number = Union[HTCFloat, HTCInt]
 literal_type = Union[number, HTCStr, HTCBool, Undefined, Error]
 
+#: functions whose result does not depend on their arguments alone
+IMPURE = frozenset(("random", "time", "formatTime", "debug", "userHome", "userMap"))
+
+#: characters separating the items of string lists by default
+DEFAULT_DELIMITER = HTCStr(", ")
+
 
 def eval(expression: Any) -> literal_type:
     """
@@ -820,7 +828,7 @@ def mergeEnvironment(env: HTCStr, *args: HTCStr) -> HTCStr:
 
 
 def stringListSize(
-    string_list: HTCStr, delimiter: Optional[HTCStr]
+    string_list: HTCStr, delimiter: Optional[HTCStr] = None
 ) -> Union[HTCInt, Error]:
     """
     Returns the number of elements in the string :py:attr:`string_list`, as
@@ -836,7 +844,11 @@ def stringListSize(
         within the :py:attr:`string_list` is ended (delimited) by one or more
         characters within the :py:attr:`delimiter` string.
     """
-    raise NotImplementedError
+    if delimiter is None:
+        delimiter = DEFAULT_DELIMITER
+    if not _all_strings(string_list, delimiter):
+        return Error()
+    return HTCInt(len(_stringlist.items(string_list, delimiter)))
 
 
 @overload
@@ -868,7 +880,10 @@ def stringListSum(string_list, delimiter=None):
         within the :py:attr:`string_list` is ended (delimited) by one or more
         characters within the :py:attr:`delimiter` string.
     """
-    raise NotImplementedError
+    values = _list_numbers(string_list, delimiter)
+    if values is None:
+        return Error()
+    return _number(sum(values))
 
 
 def stringListAvg(string_list: HTCStr, delimiter: Optional[HTCStr] = None) -> HTCFloat:
@@ -885,7 +900,12 @@ def stringListAvg(string_list: HTCStr, delimiter: Optional[HTCStr] = None) -> HT
         within the :py:attr:`string_list` is ended (delimited) by one or more
         characters within the :py:attr:`delimiter` string.
     """
-    raise NotImplementedError
+    values = _list_numbers(string_list, delimiter)
+    if values is None:
+        return Error()
+    elif not values:
+        return HTCFloat(0.0)
+    return HTCFloat(sum(values) / len(values))
 
 
 def stringListMin(
@@ -907,7 +927,12 @@ def stringListMin(
         within the :py:attr:`string_list` is ended (delimited) by one or more
         characters within the :py:attr:`delimiter` string.
     """
-    raise NotImplementedError
+    values = _list_numbers(string_list, delimiter)
+    if values is None:
+        return Error()
+    elif not values:
+        return Undefined()
+    return _number(min(values), values)
 
 
 def stringListMax(
@@ -929,7 +954,12 @@ def stringListMax(
         within the :py:attr:`string_list` is ended (delimited) by one or more
         characters within the :py:attr:`delimiter` string.
     """
-    raise NotImplementedError
+    values = _list_numbers(string_list, delimiter)
+    if values is None:
+        return Error()
+    elif not values:
+        return Undefined()
+    return _number(max(values), values)
 
 
 def stringListMember(
@@ -949,7 +979,12 @@ def stringListMember(
         within the :py:attr:`string_list` is ended (delimited) by one or more
         characters within the :py:attr:`delimiter` string.
     """
-    raise NotImplementedError
+    if delimiter is None:
+        delimiter = DEFAULT_DELIMITER
+    if not _all_strings(x, string_list, delimiter):
+        return Error()
+    # items are plain strings, which an HTCStr never equals
+    return HTCBool(str(x) in _stringlist.members(string_list, delimiter))
 
 
 def stringListIMember(
@@ -965,7 +1000,11 @@ def stringListIMember(
         within the :py:attr:`string_list` is ended (delimited) by one or more
         characters within the :py:attr:`delimiter` string.
     """
-    raise NotImplementedError
+    if delimiter is None:
+        delimiter = DEFAULT_DELIMITER
+    if not _all_strings(x, string_list, delimiter):
+        return Error()
+    return HTCBool(x.casefold() in _stringlist.folded_members(string_list, delimiter))
 
 
 def stringListsIntersect(
@@ -983,7 +1022,33 @@ def stringListsIntersect(
         within the :py:attr:`string_list` is ended (delimited) by one or more
         characters within the :py:attr:`delimiter` string.
     """
-    raise NotImplementedError
+    if delimiter is None:
+        delimiter = DEFAULT_DELIMITER
+    if not _all_strings(list_a, list_b, delimiter):
+        return Error()
+    members_a = _stringlist.members(list_a, delimiter)
+    members_b = _stringlist.members(list_b, delimiter)
+    return HTCBool(not members_a.isdisjoint(members_b))
+
+
+def _all_strings(*arguments: Any) -> bool:
+    return all(isinstance(argument, HTCStr) for argument in arguments)
+
+
+def _list_numbers(string_list: Any, delimiter: Any) -> Optional[tuple]:
+    """Get the numbers of a string list or :py:data:`None` if there are others"""
+    if delimiter is None:
+        delimiter = DEFAULT_DELIMITER
+    if not _all_strings(string_list, delimiter):
+        return None
+    return _stringlist.numbers(string_list, delimiter)
+
+
+def _number(value: Union[int, float], values: tuple = ()) -> number:
+    """Convert :py:attr:`value` to a float if it or any of :py:attr:`values` is one"""
+    if isinstance(value, float) or any(isinstance(other, float) for other in values):
+        return HTCFloat(value)
+    return HTCInt(value)
 
 
 def regexp(
@@ -1013,7 +1078,10 @@ def regexp(
     ``S`` or ``s``
         The period matches any character, including the newline character.
     """
-    raise NotImplementedError
+    compiled = _compile_pattern(pattern, options, target)
+    if compiled is None:
+        return Error()
+    return HTCBool(compiled.search(target) is not None)
 
 
 def regexps(
@@ -1044,8 +1112,18 @@ def regexps(
 
     ``S`` or ``s``
         The period matches any character, including the newline character.
+
+    The references ``\\0`` to ``\\9`` in :py:attr:`substitute` are replaced by
+    the entire match and the respective groups. If :py:attr:`target` does not
+    match, the empty string is returned.
     """
-    raise NotImplementedError
+    compiled = _compile_pattern(pattern, options, target, substitute)
+    if compiled is None:
+        return Error()
+    match = compiled.search(target)
+    if match is None:
+        return HTCStr("")
+    return HTCStr(expand(substitute, match))
 
 
 def stringList_regexpMember(
@@ -1082,7 +1160,32 @@ def stringList_regexpMember(
     ``S`` or ``s``
         The period matches any character, including the newline character.
     """
-    raise NotImplementedError
+    if delimiter is None:
+        delimiter = DEFAULT_DELIMITER
+    compiled = _compile_pattern(pattern, options, string_list, delimiter)
+    if compiled is None:
+        return Error()
+    search = compiled.search
+    return HTCBool(
+        any(
+            search(item) is not None
+            for item in _stringlist.items(string_list, delimiter)
+        )
+    )
+
+
+def _compile_pattern(pattern: Any, options: Any, *strings: Any):
+    """
+    Get the compiled :py:attr:`pattern` for the arguments of a regexp function
+
+    Gives :py:data:`None` if the pattern is invalid or any argument is not a
+    string, except for :py:attr:`options`, which may be :py:data:`None`.
+    """
+    if options is not None and not isinstance(options, HTCStr):
+        return None
+    elif not _all_strings(pattern, *strings):
+        return None
+    return pattern_cache.compile(pattern, options)
 
 
 def userHome(userName: HTCStr, default: Optional[HTCStr] = None) -> HTCStr:
@@ -1140,3 +1243,17 @@ def userMap(mapSetName, userName, *args):
     htcondor-wide-configuration-file-entries>`_).
     """
     raise NotImplementedError
+
+
+def _register_builtins():
+    """Register all functions of this module as builtins of expressions"""
+    for name, function in list(globals().items()):
+        if (
+            inspect.isfunction(function)
+            and function.__module__ == __name__
+            and not name.startswith("_")
+        ):
+            register_function(name, function, pure=name not in IMPURE)
+
+
+_register_builtins()
@@ -1,6 +1,11 @@
+from typing import Optional
+
 import pyparsing as pp
 
+from classad import _parser, _optimize
+from classad._cache import LRUCache, MISSING
 from classad._base_expression import CompoundExpression
+from classad._intern import intern
 from classad._expression import (
     ClassAd,
     AttributeExpression,
@@ -255,9 +260,113 @@ expression << pp.Group(
 )
 
 
-def parse(content: str):
+def _parse_pyparsing(content: str):
     try:
         result = expression.parseString(content, parseAll=True)
     except pp.ParseException:
         raise
-    return result[0]
+    return intern(result[0])
+
+
+#: available implementations to turn a string into an expression
+BACKENDS = {"pyparsing": _parse_pyparsing, "fast": _parser.parse}
+
+
+class ParseCache(LRUCache):
+    """
+    Bounded cache of parsed expressions keyed by their source text
+
+    Expressions are shared between all users of the cache, so that identical
+    sources such as the ``Requirements`` of many job ads are parsed only once
+    and kept in memory only once. When more than :py:attr:`maxsize` sources are
+    cached, the least recently used one is evicted.
+
+    Since a :py:class:`~.ClassAd` is mutable, content that parses to a record or
+    to an expression containing one, such as ``{[x = 1]}``, is never shared but
+    parsed anew on every request.
+
+    .. code:: python3
+
+        cache = ParseCache(maxsize=4096)
+        requirements = parse('TARGET.OpSys == "LINUX"', cache=cache)
+        cache.info()  # CacheInfo(hits=0, misses=1, evictions=0, ...)
+    """
+
+    __slots__ = ()
+
+    def __init__(self, maxsize: int = 1024):
+        super().__init__(maxsize)
+
+    def parse(self, content: str, backend: str = "pyparsing", optimize: bool = False):
+        """
+        Get the expression for :py:attr:`content`, parsing it if needed
+
+        The :py:attr:`backend` and :py:attr:`optimize` options only apply when
+        :py:attr:`content` is parsed. Since optimizations preserve the result of
+        evaluation, a cached expression may be returned regardless of them.
+        """
+        result = self._lookup(content)
+        if result is MISSING:
+            result = _parse_uncached(content, backend, optimize)
+            if not _contains_record(result):
+                self._store(content, result)
+        return result
+
+    def __contains__(self, content: str):
+        return content in self._entries
+
+
+def _contains_record(value) -> bool:
+    """Check whether a parsed tree contains a mutable :py:class:`~.ClassAd`"""
+    if isinstance(value, ClassAd):
+        return True
+    elif isinstance(value, tuple):
+        # includes lists as well as the elements of compound expressions
+        return any(map(_contains_record, value))
+    elif isinstance(value, CompoundExpression):
+        return _contains_record(value._expression)
+    return False
+
+
+def _select_backend(backend: str):
+    try:
+        return BACKENDS[backend]
+    except KeyError:
+        raise ValueError(
+            f"unknown parser backend {backend!r}, expected one of {', '.join(BACKENDS)}"
+        ) from None
+
+
+def _parse_uncached(content: str, backend: str, optimize: bool):
+    result = _select_backend(backend)(content)
+    if optimize:
+        result = intern(_optimize.fold_constants(result))
+    return result
+
+
+def parse(
+    content: str,
+    backend: str = "pyparsing",
+    cache: Optional[ParseCache] = None,
+    optimize: bool = False,
+):
+    """
+    Parse :py:attr:`content` to an expression
+
+    The :py:attr:`backend` selects the parser implementation. Both the default
+    ``"pyparsing"`` grammar and the hand-written ``"fast"`` parser create the
+    same expression trees, and both raise :py:exc:`pyparsing.ParseException`
+    for invalid content.
+
+    If a :py:class:`~.ParseCache` is given as :py:attr:`cache`, the expression
+    is looked up there first and shared with all other users of the cache.
+
+    If :py:attr:`optimize` is set, the expression is simplified after parsing
+    by folding all constant subexpressions, see :py:func:`~.fold_constants`.
+
+    Identical expressions and subexpressions of all parsed content are shared,
+    see :py:func:`~.intern`.
+    """
+    if cache is not None:
+        return cache.parse(content, backend=backend, optimize=optimize)
+    return _parse_uncached(content, backend, optimize)
@@ -0,0 +1,173 @@
+"""
+Incremental matchmaking of jobs against a pool of changing machines
+
+Machine ads are updated frequently, but each update changes only a few
+attributes. An :py:class:`~.IncrementalMatcher` remembers which machine
+attributes the ``Requirements`` and ``Rank`` of every job read, and after an
+update evaluates only the pairs of jobs and machines that may be affected.
+"""
+from typing import Iterable, List, Dict, Set, Mapping, Optional, Tuple
+
+from classad._base_expression import Expression
+from classad._expression import ClassAd
+from classad._autocluster import MATCH_KEYS, _target_references
+from classad._matchmaking import REQUIREMENTS, _score
+from classad._primitives import HTCBool
+
+RANK = ["Rank"]
+
+#: scores of a matching pair: the rank of the machine by the job and vice versa
+Scores = Tuple[float, float]
+
+
+def _affected(ad: ClassAd, changed: Set[str]) -> Set[str]:
+    """Get the names of all attributes of an ad that read any ``changed`` ones"""
+    readers: Dict[str, Set[str]] = {}
+    unknown = []
+    for name in ad:
+        references = ad._get(name).references()
+        if references.dynamic:
+            unknown.append(name)
+            continue
+        for reference in references.my:
+            readers.setdefault(reference, set()).add(name)
+    affected, pending = set(changed), list(changed)
+    if changed:
+        pending.extend(unknown)
+        affected.update(unknown)
+    while pending:
+        for name in readers.get(pending.pop(), ()):
+            if name not in affected:
+                affected.add(name)
+                pending.append(name)
+    return affected
+
+
+class IncrementalMatcher(object):
+    """
+    Matches of jobs and machines, kept up to date as machine ads change
+
+    All pairs are matched once when the matcher is created. Whenever a machine
+    is updated via :py:meth:`~.update`, only the jobs whose ``Requirements`` or
+    ``Rank`` read a changed attribute of the machine are matched again. If the
+    ``Requirements`` or ``Rank`` of the machine itself change, the machine is
+    matched against all jobs.
+
+    .. code:: python3
+
+        matcher = IncrementalMatcher(jobs, machines)
+        matcher.update(machines[0], {"State": parse('"Claimed"')})
+        matcher.matches(jobs[0])  # same as match(jobs[0], machines)
+
+    .. Note::
+
+        The job ads must not change once the matcher is created, and machine
+        ads must only be changed via :py:meth:`~.update`.
+    """
+
+    __slots__ = (
+        "_jobs",
+        "_machines",
+        "_job_positions",
+        "_machine_positions",
+        "_requirements",
+        "_ranks",
+        "_dependents",
+        "_unknown",
+        "_matches",
+        "evaluations",
+    )
+
+    def __init__(self, jobs: Iterable[ClassAd], machines: Iterable[ClassAd]):
+        self._jobs = list(jobs)
+        self._machines = list(machines)
+        #: position of each job and machine by identity
+        self._job_positions = {id(job): index for index, job in enumerate(self._jobs)}
+        self._machine_positions = {
+            id(machine): index for index, machine in enumerate(self._machines)
+        }
+        self._requirements = [job.compile(REQUIREMENTS) for job in self._jobs]
+        self._ranks = [job.compile(RANK) for job in self._jobs]
+        #: positions of jobs by the machine attributes they read
+        self._dependents: Dict[str, Set[int]] = {}
+        #: positions of jobs that may read any machine attribute
+        self._unknown: Set[int] = set()
+        for position, job in enumerate(self._jobs):
+            references = _target_references(job, MATCH_KEYS)
+            if references is None:
+                self._unknown.add(position)
+                continue
+            for name in references:
+                self._dependents.setdefault(name, set()).add(position)
+        #: scores of the matching machines of each job by their position
+        self._matches: List[Dict[int, Scores]] = [{} for _ in self._jobs]
+        #: number of pairs of jobs and machines evaluated so far
+        self.evaluations = 0
+        for machine in range(len(self._machines)):
+            for job in range(len(self._jobs)):
+                self._match(job, machine)
+
+    def _match(self, job: int, machine: int) -> bool:
+        """Evaluate a pair and report whether its match or scores changed"""
+        self.evaluations += 1
+        job_ad, machine_ad = self._jobs[job], self._machines[machine]
+        matches = self._matches[job]
+        if (
+            self._requirements[job](job_ad, machine_ad) is HTCBool.TRUE
+            and machine_ad.evaluate(REQUIREMENTS, my=machine_ad, target=job_ad)
+            is HTCBool.TRUE
+        ):
+            scores = (
+                _score(self._ranks[job](job_ad, machine_ad)),
+                _score(machine_ad.evaluate(RANK, my=machine_ad, target=job_ad)),
+            )
+            previous = matches.get(machine)
+            matches[machine] = scores
+            return previous != scores
+        return matches.pop(machine, None) is not None
+
+    def update(
+        self, machine: ClassAd, changes: Mapping[str, Optional[Expression]]
+    ) -> List[ClassAd]:
+        """
+        Change attributes of a :py:attr:`machine` and update its matches
+
+        Each of the :py:attr:`changes` sets an attribute to a new value or, if the
+        value is :py:data:`None`, removes it. The result are all jobs whose
+        matches or scores changed.
+        """
+        position = self._machine_positions[id(machine)]
+        changed = set()
+        for name, value in changes.items():
+            name = name.casefold()
+            if value is None:
+                del machine[name]
+            else:
+                machine[name] = value
+            changed.add(name)
+        affected = _affected(machine, changed)
+        if affected.intersection(MATCH_KEYS):
+            jobs = range(len(self._jobs))
+        else:
+            jobs = set(self._unknown)
+            for name in affected:
+                jobs.update(self._dependents.get(name, ()))
+            jobs = sorted(jobs)
+        return [self._jobs[job] for job in jobs if self._match(job, position)]
+
+    def matches(self, job: ClassAd) -> List[ClassAd]:
+        """Get the machines matching a :py:attr:`job` in the order of the pool"""
+        matches = self._matches[self._job_positions[id(job)]]
+        return [self._machines[machine] for machine in sorted(matches)]
+
+    def ranked(self, job: ClassAd) -> List[ClassAd]:
+        """
+        Get the machines matching a :py:attr:`job`, best first
+
+        The order is the same as for :py:func:`~.best_matches` of all machines.
+        """
+        matches = self._matches[self._job_positions[id(job)]]
+        order = sorted(
+            matches, key=lambda machine: (*matches[machine], -machine), reverse=True
+        )
+        return [self._machines[machine] for machine in order]
@@ -0,0 +1,281 @@
+"""
+Pre-filtering of machine pools by simple predicates of job requirements
+
+Job ``Requirements`` are mostly conjunctions of simple clauses such as
+``TARGET.Memory >= 2048`` or ``TARGET.OpSys == "LINUX"``. Each of these clauses
+must be ``True`` for the entire conjunction to be ``True``, so a machine that
+violates any of them can never match. A :py:class:`~.MachineIndex` uses this to
+select candidate machines by a few index lookups; the final verdict is always
+made by evaluating the full ``Requirements``.
+"""
+import bisect
+import operator
+from typing import NamedTuple, Union, Optional, List, Iterable, Dict, Set, Tuple
+
+from classad._base_expression import Expression, PrimitiveExpression
+from classad._expression import ClassAd, ArithmeticExpression, AttributeExpression
+from classad._matchmaking import REQUIREMENTS, match
+from classad._primitives import HTCInt, HTCFloat, HTCStr, Undefined
+
+#: operators of predicates and their equivalent with swapped operands
+OPERATORS = {"==": "==", "<": ">", "<=": ">=", ">=": "<=", ">": "<"}
+
+#: comparisons of plain values for range predicates
+COMPARISONS = {"<": operator.lt, "<=": operator.le, ">=": operator.ge, ">": operator.gt}
+
+Value = Union[int, float, str]
+
+
+class Predicate(NamedTuple):
+    """Clause ``TARGET.<attribute> <operator> <value>`` of a conjunction"""
+
+    #: casefolded name of the ``TARGET`` attribute
+    attribute: str
+    #: one of ``==``, ``<``, ``<=``, ``>=`` or ``>``
+    operator: str
+    #: literal value, a string only for ``==``
+    value: Union[HTCInt, HTCFloat, HTCStr]
+
+
+def _clauses(expression: Expression) -> Iterable[Expression]:
+    """Yield the clauses of a (nested) ``&&`` conjunction"""
+    if isinstance(expression, ArithmeticExpression) and all(
+        operator == "&&" for operator in expression._expression[1::2]
+    ):
+        for operand in expression._expression[::2]:
+            yield from _clauses(operand)
+    else:
+        yield expression
+
+
+def _target_attribute(expression: Expression, my: "Optional[ClassAd]") -> Optional[str]:
+    """Get the name of the ``TARGET`` attribute referenced by an expression"""
+    if not isinstance(expression, AttributeExpression):
+        return None
+    plan = expression._resolution_plan()
+    if plan is None:
+        return None
+    scope, name = plan
+    # plain names refer to TARGET only if they are not defined by MY
+    if scope == "target" or (
+        scope is None and my is not None and isinstance(my._get(name), Undefined)
+    ):
+        return name
+    return None
+
+
+def _literal(
+    expression: Expression, my: "Optional[ClassAd]"
+) -> Optional[Union[HTCInt, HTCFloat, HTCStr]]:
+    """Get the literal value of an expression or a literal ``MY`` attribute"""
+    if isinstance(expression, AttributeExpression) and my is not None:
+        plan = expression._resolution_plan()
+        if plan is None or plan[0] == "target":
+            return None
+        expression = my._get(plan[1])
+    if isinstance(expression, (HTCInt, HTCFloat, HTCStr)):
+        return expression
+    return None
+
+
+def extract_predicates(
+    expression: Expression, my: "Optional[ClassAd]" = None
+) -> List[Predicate]:
+    """
+    Extract the simple ``TARGET`` predicates that an expression implies
+
+    Every :py:class:`~.Predicate` is a clause of the top-level ``&&``
+    conjunction of :py:attr:`expression` comparing a ``TARGET`` attribute to a
+    literal: only if all of them are ``True`` can :py:attr:`expression` be
+    ``True``. Other clauses are ignored.
+
+    If the :py:attr:`my` ad of the expression is given, attributes it defines as
+    literals are used as values, and attributes it does not define are known to
+    refer to ``TARGET``.
+
+    .. code:: python3
+
+        extract_predicates(parse('TARGET.Memory >= 2048 && TARGET.Arch == "X86_64"'))
+        # [Predicate('memory', '>=', 2048), Predicate('arch', '==', 'X86_64')]
+    """
+    predicates = []
+    for clause in _clauses(expression):
+        if not isinstance(clause, ArithmeticExpression):
+            continue
+        if len(clause._expression) != 3 or clause._expression[1] not in OPERATORS:
+            continue
+        left, operator, right = clause._expression
+        attribute, value = _target_attribute(left, my), _literal(right, my)
+        if attribute is None or value is None:
+            attribute, value = _target_attribute(right, my), _literal(left, my)
+            operator = OPERATORS[operator]
+        if attribute is None or value is None:
+            continue
+        if operator != "==" and isinstance(value, HTCStr):
+            continue
+        predicates.append(Predicate(attribute, operator, value))
+    return predicates
+
+
+def _key(value: Expression) -> Optional[Value]:
+    """Plain value to index an attribute value by, if it is a literal"""
+    if isinstance(value, HTCStr):
+        return value.lower()
+    elif isinstance(value, HTCInt):
+        return int(value)
+    elif isinstance(value, HTCFloat):
+        return float(value)
+    return None
+
+
+class _AttributeIndex(object):
+    """Hash and sorted index of the values of one attribute across a pool"""
+
+    __slots__ = ("keys", "hashed", "values", "positions", "unindexed")
+
+    def __init__(self, attribute: str, machines: List[ClassAd]):
+        #: plain value of the attribute by position of each machine
+        self.keys: Dict[int, Value] = {}
+        #: positions of machines by the plain value of their attribute
+        self.hashed: Dict[Value, Set[int]] = {}
+        #: positions of machines whose attribute must be evaluated to be known
+        self.unindexed: Set[int] = set()
+        numeric = []
+        for position, machine in enumerate(machines):
+            value = machine._get(attribute)
+            key = _key(value)
+            if key is not None:
+                self.keys[position] = key
+                self.hashed.setdefault(key, set()).add(position)
+                if not isinstance(key, str):
+                    numeric.append((key, position))
+            # other literals, such as undefined, never satisfy a predicate
+            elif not isinstance(value, PrimitiveExpression):
+                self.unindexed.add(position)
+        numeric.sort()
+        #: numeric values in ascending order and the positions of their machines
+        self.values = [value for value, _ in numeric]
+        self.positions = [position for _, position in numeric]
+
+    def _span(self, operator: str, key: Value) -> Tuple[int, int]:
+        """Get the range of :py:attr:`positions` satisfying a range predicate"""
+        if operator == "<":
+            return 0, bisect.bisect_left(self.values, key)
+        elif operator == "<=":
+            return 0, bisect.bisect_right(self.values, key)
+        elif operator == ">=":
+            return bisect.bisect_left(self.values, key), len(self.values)
+        return bisect.bisect_right(self.values, key), len(self.values)
+
+    def count(self, predicate: Predicate) -> int:
+        """Get the number of machines that may satisfy a predicate"""
+        key = _key(predicate.value)
+        if predicate.operator == "==":
+            selected = len(self.hashed.get(key, ()))
+        else:
+            start, end = self._span(predicate.operator, key)
+            selected = end - start
+        return selected + len(self.unindexed)
+
+    def select(self, predicate: Predicate) -> Set[int]:
+        """Get the positions of machines that may satisfy a predicate"""
+        key = _key(predicate.value)
+        if predicate.operator == "==":
+            selected = self.hashed.get(key, ())
+        else:
+            start, end = self._span(predicate.operator, key)
+            selected = self.positions[start:end]
+        return self.unindexed.union(selected)
+
+    def filter(self, positions: Set[int], predicate: Predicate) -> Set[int]:
+        """Get the :py:attr:`positions` of machines that may satisfy a predicate"""
+        value, keys = _key(predicate.value), self.keys
+        if predicate.operator == "==":
+            accepted = {
+                position for position in positions if keys.get(position) == value
+            }
+        else:
+            compare = COMPARISONS[predicate.operator]
+            accepted = {
+                position
+                for position in positions
+                if type(keys.get(position)) in (int, float)
+                and compare(keys[position], value)
+            }
+        return accepted | (positions & self.unindexed)
+
+
+class MachineIndex(object):
+    """
+    Index of a pool of machine ads to quickly find candidates for matching
+
+    For each attribute used by a :py:class:`~.Predicate`, the index keeps a hash
+    index for equality and a sorted index for range queries. Indexes are built
+    once for each attribute when it is first queried.
+
+    .. code:: python3
+
+        index = MachineIndex(machines)
+        index.match(job)  # same as match(job, machines)
+
+    .. Note::
+
+        The index assumes that the machine ads do not change once it is
+        created. Machine attributes that are expressions instead of literals
+        are not indexed, but always taken as candidates.
+    """
+
+    __slots__ = ("_machines", "_indexes")
+
+    def __init__(self, machines: Iterable[ClassAd]):
+        self._machines = list(machines)
+        self._indexes: Dict[str, _AttributeIndex] = {}
+
+    def __len__(self):
+        return len(self._machines)
+
+    def __iter__(self):
+        return iter(self._machines)
+
+    def _index(self, attribute: str) -> _AttributeIndex:
+        try:
+            return self._indexes[attribute]
+        except KeyError:
+            index = self._indexes[attribute] = _AttributeIndex(
+                attribute, self._machines
+            )
+            return index
+
+    def select(self, predicates: Iterable[Predicate]) -> List[ClassAd]:
+        """Get all machines that may satisfy all :py:attr:`predicates`"""
+        indexes = [
+            (self._index(predicate.attribute), predicate) for predicate in predicates
+        ]
+        if not indexes:
+            return list(self._machines)
+        # start with the most selective predicate, and only check the remaining
+        # ones for the few machines left instead of selecting all their machines
+        counts = [index.count(predicate) for index, predicate in indexes]
+        order = sorted(range(len(indexes)), key=counts.__getitem__)
+        index, predicate = indexes[order[0]]
+        selected = index.select(predicate)
+        for position in order[1:]:
+            index, predicate = indexes[position]
+            if counts[position] <= len(selected):
+                selected &= index.select(predicate)
+            else:
+                selected = index.filter(selected, predicate)
+        return [self._machines[position] for position in sorted(selected)]
+
+    def candidates(self, job: ClassAd) -> List[ClassAd]:
+        """Get all machines that may match the ``Requirements`` of :py:attr:`job`"""
+        return self.select(extract_predicates(job[REQUIREMENTS], my=job))
+
+    def match(self, job: ClassAd) -> List[ClassAd]:
+        """
+        Get the machines matching the :py:attr:`job`
+
+        The result is the same as for :py:func:`~.match` on all machines of
+        the index, but only the candidates are fully evaluated.
+        """
+        return match(job, self.candidates(job))
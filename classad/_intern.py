@@ -0,0 +1,91 @@
+"""
+Sharing of structurally identical expressions
+
+The ads of a pool repeat the same expressions over and over, for example the
+``Requirements`` of all jobs submitted together. Expressions never change once
+created, so all identical trees can be replaced by a single shared one. The
+shared trees are kept in a table only while anything else still uses them.
+"""
+import weakref
+from typing import Any, Dict, List
+
+from classad._base_expression import Expression, CompoundExpression
+from classad._expression import ClassAd
+from classad._primitives import HTCList
+
+#: weak references to the shared expressions by their structural hash
+_interned: Dict[int, List[weakref.KeyedRef]] = {}
+
+
+def _discard(reference: weakref.KeyedRef):
+    """Remove the reference to a shared expression that is no longer used"""
+    bucket = _interned.get(reference.key)
+    if bucket is None:
+        return
+    try:
+        bucket.remove(reference)
+    except ValueError:
+        return
+    if not bucket:
+        del _interned[reference.key]
+
+
+def _share(expression: CompoundExpression) -> CompoundExpression:
+    """Get the shared instance of an expression whose elements are shared"""
+    code = hash(expression)
+    bucket = _interned.get(code)
+    if bucket is None:
+        bucket = _interned[code] = []
+    else:
+        for reference in bucket:
+            shared = reference()
+            if shared is not None and shared == expression:
+                return shared
+    bucket.append(weakref.KeyedRef(expression, _discard, code))
+    return expression
+
+
+def _intern_elements(value: Any) -> Any:
+    """Intern all expressions in the (nested) elements of an expression"""
+    if isinstance(value, tuple):
+        elements = tuple(map(_intern_elements, value))
+        if all(new is old for new, old in zip(elements, value)):
+            return value
+        return type(value)(elements)
+    elif isinstance(value, Expression):
+        return intern(value)
+    return value
+
+
+def intern(expression: Expression) -> Expression:
+    """
+    Get the shared instance of an expression and all its subexpressions
+
+    The result is an expression identical to :py:attr:`expression`, and is the
+    same object for all identical expressions that are interned. If there is no
+    shared instance yet, :py:attr:`expression` becomes the shared instance after
+    its subexpressions have been interned. The parser interns all expressions.
+
+    .. code:: python3
+
+        first = parse('TARGET.OpSys == "LINUX" && TARGET.Memory >= 2048')
+        second = parse('TARGET.OpSys == "LINUX" && TARGET.Memory >= 4096')
+        first._expression[0] is second._expression[0]  # True
+
+    Since a :py:class:`~.ClassAd` is mutable, it is never shared. Its attribute
+    values are interned in place, and expressions containing it are only
+    identical to themselves.
+    """
+    if isinstance(expression, ClassAd):
+        for key, value in list(expression._data.items()):
+            # unparsed values of lazy ads are not expressions yet
+            if isinstance(value, Expression):
+                expression._data[key] = intern(value)
+        return expression
+    elif isinstance(expression, HTCList):
+        return _intern_elements(expression)
+    elif not isinstance(expression, CompoundExpression):
+        return expression
+    # shared subexpressions make comparing with the shared instance cheap
+    expression._expression = _intern_elements(expression._expression)
+    return _share(expression)
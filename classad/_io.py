@@ -0,0 +1,118 @@
+"""
+Reading of ClassAds in the HTCondor *long* format
+
+The long format is written by ``condor_q -long`` and ``condor_status -long``:
+every attribute is a ``Name = value`` line of its own, and consecutive ads are
+separated by blank lines. The readers in this module yield one
+:py:class:`~.ClassAd` per block, so that memory consumption does not grow with
+the number of ads in a dump.
+"""
+import mmap
+import os
+import re
+from typing import Iterator, List, Optional, TextIO, Tuple
+
+import pyparsing as pp
+
+from classad._expression import ClassAd, LazyClassAd
+from classad._grammar import parse, ParseCache
+
+#: number of characters read from a file object at once
+CHUNK_SIZE = 1024 * 1024
+
+BLANK_LINE = re.compile(rb"\n[ \t\r]*\n")
+
+
+def _split_definitions(lines: List[str]) -> Iterator[Tuple[str, str]]:
+    for line in lines:
+        name, separator, value = line.partition("=")
+        if not separator:
+            raise pp.ParseException(line, 0, "Expected attribute definition")
+        yield name.strip(), value.strip()
+
+
+def _read_classad(
+    lines: List[str], cache: Optional[ParseCache], backend: str, lazy: bool
+) -> ClassAd:
+    if lazy:
+        return LazyClassAd.from_source(
+            _split_definitions(lines), backend=backend, cache=cache
+        )
+    result = ClassAd()
+    for name, value in _split_definitions(lines):
+        result[name] = parse(value, backend=backend, cache=cache)
+    return result
+
+
+def _block_lines(block: bytes, encoding: str) -> List[str]:
+    return [line for line in block.decode(encoding).splitlines() if line.strip()]
+
+
+def load_long(
+    fileobj: TextIO,
+    cache: Optional[ParseCache] = None,
+    backend: str = "fast",
+    chunk_size: int = CHUNK_SIZE,
+    lazy: bool = False,
+) -> Iterator[ClassAd]:
+    """
+    Lazily read all ads from :py:attr:`fileobj` in the long format
+
+    The file object must be opened in text mode. It is read in chunks of
+    :py:attr:`chunk_size` characters; only the current chunk and the lines of
+    the ad being read are kept in memory.
+
+    Every attribute value is parsed on its own with the given :py:attr:`backend`.
+    Pass a :py:class:`~.ParseCache` as :py:attr:`cache` to share the expressions
+    of identical values, e.g. the ``Requirements`` of all jobs in a cluster.
+    If :py:attr:`lazy` is set, values are parsed only once they are used, see
+    :py:class:`~.LazyClassAd`.
+    """
+    lines = []
+    remainder = ""
+    while True:
+        chunk = fileobj.read(chunk_size)
+        if not chunk:
+            break
+        chunk_lines = (remainder + chunk).split("\n")
+        remainder = chunk_lines.pop()
+        for line in chunk_lines:
+            if line and not line.isspace():
+                lines.append(line)
+            elif lines:
+                yield _read_classad(lines, cache, backend, lazy)
+                lines = []
+    if remainder and not remainder.isspace():
+        lines.append(remainder)
+    if lines:
+        yield _read_classad(lines, cache, backend, lazy)
+
+
+def load_long_path(
+    path: "os.PathLike",
+    cache: Optional[ParseCache] = None,
+    backend: str = "fast",
+    encoding: str = "utf-8",
+    lazy: bool = False,
+) -> Iterator[ClassAd]:
+    """
+    Lazily read all ads from the file at :py:attr:`path` in the long format
+
+    The file is memory mapped instead of read, so that separating the ads is
+    left to the operating system's page cache. See :py:func:`~.load_long` for
+    the meaning of :py:attr:`cache`, :py:attr:`backend` and :py:attr:`lazy`.
+    """
+    with open(path, "rb") as raw:
+        if os.fstat(raw.fileno()).st_size == 0:
+            return
+        with mmap.mmap(raw.fileno(), 0, access=mmap.ACCESS_READ) as content:
+            start = 0
+            for separator in BLANK_LINE.finditer(content):
+                end = separator.start()
+                lines = _block_lines(content[start:end], encoding)
+                if lines:
+                    yield _read_classad(lines, cache, backend, lazy)
+                start = separator.end()
+            lines = _block_lines(content[start:], encoding)
+            if lines:
+                yield _read_classad(lines, cache, backend, lazy)
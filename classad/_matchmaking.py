@@ -0,0 +1,90 @@
+"""
+Symmetric matchmaking of a job against a pool of machines
+"""
+import heapq
+import math
+from typing import Iterable, Iterator, List
+
+from classad._base_expression import Expression
+from classad._expression import ClassAd
+from classad._primitives import HTCBool
+
+REQUIREMENTS = ["Requirements"]
+
+
+def iter_matches(job: ClassAd, machines: Iterable[ClassAd]) -> Iterator[ClassAd]:
+    """
+    Yield the :py:attr:`machines` matching the :py:attr:`job`
+
+    A job and a machine match if the ``Requirements`` of both evaluate to
+    :py:class:`~.HTCBool` ``True``, each in the context of the other ad as
+    ``TARGET``. Anything else, including :py:class:`~.Undefined` and
+    :py:class:`~.Error`, means that they do not match.
+
+    The ``Requirements`` of the job are compiled once and evaluated first for
+    each machine, so that machines rejected by the job are never asked.
+    """
+    requirements = job.compile(REQUIREMENTS)
+    for machine in machines:
+        if (
+            requirements(job, machine) is HTCBool.TRUE
+            and machine.evaluate(REQUIREMENTS, my=machine, target=job) is HTCBool.TRUE
+        ):
+            yield machine
+
+
+def match(job: ClassAd, machines: Iterable[ClassAd]) -> List[ClassAd]:
+    """
+    Get the :py:attr:`machines` matching the :py:attr:`job`
+
+    See :py:func:`~.iter_matches` for details on matching.
+    """
+    return list(iter_matches(job, machines))
+
+
+def _score(rank: Expression) -> float:
+    """Numeric value of a rank, with non-numeric ranks being the lowest"""
+    if isinstance(rank, HTCBool):
+        return 1.0 if rank else 0.0
+    elif isinstance(rank, (int, float)) and not math.isnan(rank):
+        return float(rank)
+    return -math.inf
+
+
+def best_matches(
+    job: ClassAd, machines: Iterable[ClassAd], k: int, rank_key: str = "Rank"
+) -> List[ClassAd]:
+    """
+    Get the :py:attr:`k` best :py:attr:`machines` matching the :py:attr:`job`
+
+    Matching machines are ordered by how the job ranks them via its
+    :py:attr:`rank_key` expression, best first. :py:class:`~.Undefined` and other
+    non-numeric ranks count as the lowest possible rank, booleans as ``1`` and
+    ``0``. Ties are broken by how each machine ranks the job, and then by the
+    order of :py:attr:`machines`.
+
+    Only the best :py:attr:`k` candidates are kept while going over the pool,
+    and the rank of a machine is only evaluated if it may still be among them.
+    """
+    if k <= 0:
+        return []
+    rank_key = [rank_key]
+    rank = job.compile(rank_key)
+    # min-heap of the best candidates seen so far, the worst one is at the top
+    candidates = []
+    for index, machine in enumerate(iter_matches(job, machines)):
+        score = _score(rank(job, machine))
+        if len(candidates) == k and score < candidates[0][0]:
+            continue
+        candidate = (
+            score,
+            _score(machine.evaluate(rank_key, my=machine, target=job)),
+            -index,
+            machine,
+        )
+        if len(candidates) < k:
+            heapq.heappush(candidates, candidate)
+        elif candidate[:3] > candidates[0][:3]:
+            heapq.heapreplace(candidates, candidate)
+    candidates.sort(key=lambda candidate: candidate[:3], reverse=True)
+    return [candidate[3] for candidate in candidates]
@@ -0,0 +1,84 @@
+"""
+Memoization of pure function calls while evaluating many expressions
+
+Matchmaking evaluates the same expressions for many pairs of ads, and their
+function calls often get the same arguments every time, for example
+``toLower(TARGET.OpSys)`` for machines with the same operating system. Inside
+an :py:func:`evaluation_cache` block, the results of pure functions are reused
+for calls with identical arguments.
+"""
+import threading
+from contextlib import contextmanager
+from typing import Any, Callable, Iterator, Optional, Tuple
+
+from classad._cache import LRUCache, MISSING
+from classad._base_expression import PrimitiveExpression, _token
+from classad._primitives import HTCList
+
+
+class _Current(threading.local):
+    #: cache of the innermost active :py:func:`evaluation_cache` of the thread
+    cache: "Optional[EvaluationCache]" = None
+
+
+current = _Current()
+
+
+def _memoizable(value: Any) -> bool:
+    """Check whether :py:attr:`value` is an immutable argument or result"""
+    if isinstance(value, HTCList):
+        return all(map(_memoizable, value))
+    return isinstance(value, PrimitiveExpression)
+
+
+class EvaluationCache(LRUCache):
+    """
+    Bounded cache of the results of pure function calls by their arguments
+
+    Calls are only cached if all arguments and the result are primitive values.
+    Arguments are identical if they have the same type and value, so that for
+    example ``strcat(1)`` and ``strcat(1.0)`` are cached separately. When more
+    than :py:attr:`maxsize` calls are cached, the least recently used one is
+    evicted.
+    """
+
+    __slots__ = ()
+
+    def __init__(self, maxsize: int = 4096):
+        super().__init__(maxsize)
+
+    def call(self, function: Callable, arguments: Tuple[Any, ...]) -> Any:
+        """Get the result of the pure :py:attr:`function` for :py:attr:`arguments`"""
+        if not all(map(_memoizable, arguments)):
+            return function(*arguments)
+        key = function, _token(arguments)
+        result = self._lookup(key)
+        if result is MISSING:
+            result = function(*arguments)
+            if _memoizable(result):
+                self._store(key, result)
+        return result
+
+
+@contextmanager
+def evaluation_cache(maxsize: int = 4096) -> Iterator[EvaluationCache]:
+    """
+    Reuse the results of pure function calls for evaluations inside the block
+
+    Evaluated and compiled expressions look up calls of pure functions, such
+    as ``strcat`` or ``regexp``, in a cache shared by all evaluations of the
+    current thread inside the block. Impure functions such as ``random`` and
+    ``time`` are always called. The cache is discarded when the block ends.
+
+    .. code:: python3
+
+        with evaluation_cache() as cache:
+            matches = list(iter_matches(job, machines))
+        cache.info()  # CacheInfo(hits=..., misses=..., evictions=0, ...)
+    """
+    previous = current.cache
+    current.cache = cache = EvaluationCache(maxsize)
+    try:
+        yield cache
+    finally:
+        current.cache = previous
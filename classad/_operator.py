@@ -1,7 +1,7 @@
-from typing import Union
+from typing import Union, Optional, Callable, Dict
 
 from classad._base_expression import PrimitiveExpression
-from classad._primitives import HTCBool, Undefined, Error, HTCInt, HTCFloat
+from classad._primitives import HTCBool, Undefined, Error, HTCInt, HTCFloat, HTCStr
 
 
 def eq_operator(
@@ -73,3 +73,87 @@ def neg_operator(a: PrimitiveExpression) -> Union[HTCInt, HTCFloat, Undefined, E
     elif isinstance(result, float):
         return HTCFloat(result)
     return Error()
+
+
+# Shortcuts for compiled expressions
+#
+# Each shortcut computes the result of a binary operator for the most common
+# types of operands directly on the builtin types, without dispatching through
+# the methods of the primitives. Shortcuts return ``None`` for all other operands,
+# which are handled by the regular operator.
+
+_TRUE, _FALSE = HTCBool.TRUE, HTCBool.FALSE
+
+
+#: comparisons of two :py:class:`~.HTCInt` operands on the builtin ``int``
+int_comparisons: Dict[str, Callable[[int, int], bool]] = {
+    "<": int.__lt__,
+    "<=": int.__le__,
+    ">=": int.__ge__,
+    ">": int.__gt__,
+    "==": int.__eq__,
+    "!=": int.__ne__,
+}
+
+
+def _int_comparison(compare: Callable[[int, int], bool]):
+    def comparison(a, b) -> Optional[HTCBool]:
+        if type(a) is HTCInt and type(b) is HTCInt:
+            return _TRUE if compare(a, b) else _FALSE
+        return None
+
+    return comparison
+
+
+def _int_arithmetic(calculate: Callable[[int, int], int]):
+    def arithmetic(a, b) -> Optional[HTCInt]:
+        if type(a) is HTCInt and type(b) is HTCInt:
+            return HTCInt(calculate(a, b))
+        return None
+
+    return arithmetic
+
+
+def _eq_shortcut(a, b) -> Optional[HTCBool]:
+    if type(a) is HTCStr and type(b) is HTCStr:
+        return _TRUE if a.lower() == b.lower() else _FALSE
+    elif type(a) is HTCInt and type(b) is HTCInt:
+        return _TRUE if int.__eq__(a, b) else _FALSE
+    return None
+
+
+def _ne_shortcut(a, b) -> Optional[HTCBool]:
+    result = _eq_shortcut(a, b)
+    if result is None:
+        return None
+    return _FALSE if result is _TRUE else _TRUE
+
+
+def _and_shortcut(a, b) -> Optional[HTCBool]:
+    if type(a) is HTCBool and type(b) is HTCBool:
+        return b if a._value else a
+    return None
+
+
+def _or_shortcut(a, b) -> Optional[HTCBool]:
+    if type(a) is HTCBool and type(b) is HTCBool:
+        return a if a._value else b
+    return None
+
+
+shortcuts: Dict[
+    str,
+    Callable[[PrimitiveExpression, PrimitiveExpression], Optional[PrimitiveExpression]],
+] = {
+    "+": _int_arithmetic(int.__add__),
+    "-": _int_arithmetic(int.__sub__),
+    "*": _int_arithmetic(int.__mul__),
+    "<": _int_comparison(int_comparisons["<"]),
+    "<=": _int_comparison(int_comparisons["<="]),
+    ">=": _int_comparison(int_comparisons[">="]),
+    ">": _int_comparison(int_comparisons[">"]),
+    "==": _eq_shortcut,
+    "!=": _ne_shortcut,
+    "&&": _and_shortcut,
+    "||": _or_shortcut,
+}
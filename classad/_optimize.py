@@ -0,0 +1,303 @@
+"""
+Optimizations of parsed expression trees
+
+All optimizations are semantics preserving: evaluating an optimized expression
+in any context gives the same result as evaluating the original expression.
+"""
+from typing import Tuple, Optional, Set
+
+from classad._base_expression import Expression, PrimitiveExpression
+from classad._expression import (
+    ClassAd,
+    LazyClassAd,
+    ChainedClassAd,
+    ArithmeticExpression,
+    AttributeExpression,
+    FunctionExpression,
+    SubscriptableExpression,
+    TernaryExpression,
+    UnaryExpression,
+)
+from classad._primitives import Error, Undefined, HTCBool, HTCInt, HTCList
+
+
+def _is_constant(expression: Expression) -> bool:
+    return isinstance(expression, PrimitiveExpression)
+
+
+def _unchanged(new: Tuple[Expression, ...], old: Tuple[Expression, ...]) -> bool:
+    return all(new_element is old_element for new_element, old_element in zip(new, old))
+
+
+#: functions that always give a boolean for a single argument
+PREDICATES = frozenset(
+    ("isUndefined", "isError", "isString", "isInteger", "isReal", "isBoolean")
+)
+
+
+def _is_logical(expression: Expression) -> bool:
+    """
+    Check whether an expression always evaluates to a boolean, undefined or error
+
+    For such expressions, ``true && X`` and ``X && true`` are the same as ``X``.
+    Other values, such as numbers, turn these into an :py:class:`~.Error`.
+    """
+    if isinstance(expression, (HTCBool, Undefined, Error)):
+        return True
+    elif isinstance(expression, ArithmeticExpression):
+        operands, operators = expression._expression[::2], expression._expression[1::2]
+        if all(operator in ("&&", "||") for operator in operators):
+            return all(map(_is_logical, operands))
+        # equality of anything with a literal has a boolean, undefined or error result
+        return (
+            len(operands) == 2
+            and operators[0] in ("==", "!=")
+            and any(
+                isinstance(operand, PrimitiveExpression)
+                and not isinstance(operand, HTCList)
+                for operand in operands
+            )
+        )
+    elif isinstance(expression, TernaryExpression):
+        return all(
+            map(
+                _is_logical,
+                (element for element in expression._expression if element is not None),
+            )
+        )
+    elif isinstance(expression, FunctionExpression):
+        return expression._name in PREDICATES
+    return False
+
+
+def _fold_all(expressions: Tuple[Expression, ...]) -> Tuple[Expression, ...]:
+    return tuple(
+        element if element is None else fold_constants(element)
+        for element in expressions
+    )
+
+
+def _fold_arithmetic(expression: ArithmeticExpression) -> Expression:
+    operands = _fold_all(expression._expression)
+    # the chain is evaluated from the left, so only a constant prefix is folded
+    result = operands[0]
+    position = 1
+    while position < len(operands) and _is_constant(result):
+        operator, operand = operands[position], operands[position + 1]
+        if expression._short_circuits(result, operator):
+            # the operand is never evaluated
+            position += 2
+            continue
+        elif _is_identity(result, operator) and _is_logical(operand):
+            # true && X and false || X are the same as X
+            result = operand
+            position += 2
+            continue
+        elif not _is_constant(operand):
+            break
+        try:
+            calculated = expression._calculate(result, operand, operator)
+        except Exception:
+            # keep the operation, so that evaluation fails exactly as before
+            break
+        if not isinstance(calculated, PrimitiveExpression):
+            # some operators give plain Python values that are no expressions
+            break
+        result = calculated
+        position += 2
+    # X && true and X || false are the same as X
+    remainder, logical = [result], _is_logical(result)
+    for index in range(position, len(operands), 2):
+        operator, operand = operands[index], operands[index + 1]
+        if logical and _is_identity(operand, operator):
+            continue
+        remainder += [operator, operand]
+        logical = logical and operator in ("&&", "||") and _is_logical(operand)
+    if len(remainder) == 1:
+        return result
+    elif len(remainder) == len(operands) and _unchanged(
+        remainder, expression._expression
+    ):
+        return expression
+    return ArithmeticExpression.from_grammar(tuple(remainder))
+
+
+def _is_identity(operand: Expression, operator: str) -> bool:
+    """Check whether ``operand`` is the identity element of a boolean operator"""
+    if isinstance(operand, HTCBool) and operator in ("&&", "||"):
+        return bool(operand) is (operator == "&&")
+    return False
+
+
+def _fold_ternary(expression: TernaryExpression) -> Expression:
+    predicate, if_true, if_false = _fold_all(expression._expression)
+    if _is_constant(predicate):
+        # mirror the selection of TernaryExpression._evaluate
+        if if_true is None:
+            return if_false if isinstance(predicate, Undefined) else predicate
+        if isinstance(predicate, Undefined):
+            return Undefined()
+        if isinstance(predicate, HTCBool):
+            return if_true if predicate else if_false
+        return Error()
+    if _unchanged((predicate, if_true, if_false), expression._expression):
+        return expression
+    return TernaryExpression.from_grammar((predicate, if_true, if_false))
+
+
+def _fold_function(expression: FunctionExpression) -> Expression:
+    arguments = _fold_all(expression._expression)
+    builtin = expression._builtin
+    if builtin is not None and builtin.pure and all(map(_is_constant, arguments)):
+        try:
+            result = builtin.function(*arguments)
+        except Exception:
+            pass
+        else:
+            if isinstance(result, PrimitiveExpression):
+                return result
+    if _unchanged(arguments, expression._expression):
+        return expression
+    return FunctionExpression(expression._name, arguments)
+
+
+def _fold_subscript(expression: SubscriptableExpression) -> Expression:
+    operand, index = _fold_all(expression._expression)
+    if (
+        isinstance(operand, HTCList)
+        and isinstance(index, HTCInt)
+        and -len(operand) <= index < len(operand)
+        and _is_constant(operand[index])
+    ):
+        return operand[index]
+    if _unchanged((operand, index), expression._expression):
+        return expression
+    return SubscriptableExpression.from_grammar((operand, index))
+
+
+def fold_constants(expression: Expression) -> Expression:
+    """
+    Replace all subexpressions of constant value by their value
+
+    Subexpressions are constant if they consist only of literals, including
+    calls of functions that are free of side effects. The same methods are used
+    for folding as for regular evaluation, so all rules of the three-valued
+    logic apply. Subexpressions that are not changed are shared with the
+    original expression, but records are always copied.
+
+    .. code:: python3
+
+        fold_constants(parse("x = (3600 * 24) + 60"))  # result: [x = 86460]
+        fold_constants(parse('strcat("a", "b") == TARGET.Name'))  # "ab" == ...
+    """
+    if isinstance(expression, PrimitiveExpression):
+        # elements of lists are not evaluated with the list, so keep them as is
+        return expression
+    elif isinstance(expression, ArithmeticExpression):
+        return _fold_arithmetic(expression)
+    elif isinstance(expression, UnaryExpression):
+        operator, operand = expression._expression
+        operand = fold_constants(operand)
+        if _is_constant(operand):
+            try:
+                result = expression.operator_map[operator](operand)
+            except Exception:
+                pass
+            else:
+                if isinstance(result, PrimitiveExpression):
+                    return result
+        if operand is expression._expression[1]:
+            return expression
+        return UnaryExpression.from_grammar((operator, operand))
+    elif isinstance(expression, TernaryExpression):
+        return _fold_ternary(expression)
+    elif isinstance(expression, FunctionExpression):
+        return _fold_function(expression)
+    elif isinstance(expression, SubscriptableExpression):
+        return _fold_subscript(expression)
+    elif isinstance(expression, ClassAd) and not isinstance(
+        expression, (LazyClassAd, ChainedClassAd)
+    ):
+        return ClassAd.from_grammar(
+            [(key, fold_constants(value)) for key, value in expression._data.items()]
+        )
+    return expression
+
+
+def _substitute_attribute(
+    expression: AttributeExpression, my: ClassAd, resolving: Set[str]
+) -> Expression:
+    plan = expression._resolution_plan()
+    if plan is None:
+        return expression
+    scope, name = plan
+    if scope == "target":
+        return expression
+    value = my._get(name)
+    if isinstance(value, Undefined):
+        if scope == "my":
+            return Undefined()
+        # plain names not defined by my are looked up only in target
+        return AttributeExpression.from_grammar(("target", expression._expression))
+    elif isinstance(value, PrimitiveExpression):
+        return value
+    elif isinstance(value, AttributeExpression) and name not in resolving:
+        # references are followed with the same my and target ads
+        return _substitute(value, my, resolving | {name})
+    # other expressions are not evaluated when looked up
+    return expression
+
+
+def _substitute_all(
+    expressions: Tuple[Optional[Expression], ...], my: ClassAd, resolving: Set[str]
+) -> Tuple[Optional[Expression], ...]:
+    return tuple(
+        element if element is None else _substitute(element, my, resolving)
+        for element in expressions
+    )
+
+
+def _substitute(expression: Expression, my: ClassAd, resolving: Set[str]) -> Expression:
+    """Replace all attributes of an expression that :py:attr:`my` defines"""
+    if isinstance(expression, AttributeExpression):
+        return _substitute_attribute(expression, my, resolving)
+    elif isinstance(expression, FunctionExpression):
+        arguments = _substitute_all(expression._expression, my, resolving)
+        if _unchanged(arguments, expression._expression):
+            return expression
+        return FunctionExpression(expression._name, arguments)
+    elif isinstance(
+        expression,
+        (
+            ArithmeticExpression,
+            SubscriptableExpression,
+            TernaryExpression,
+            UnaryExpression,
+        ),
+    ):
+        elements = _substitute_all(expression._expression, my, resolving)
+        if _unchanged(elements, expression._expression):
+            return expression
+        return type(expression).from_grammar(elements)
+    return expression
+
+
+def specialize(expression: Expression, my: ClassAd) -> Expression:
+    """
+    Partially evaluate an expression for a fixed :py:attr:`my` ad
+
+    All attributes that :py:attr:`my` defines are replaced by their values,
+    plain attributes that it does not define are turned into ``TARGET``
+    references, and the result is simplified by :py:func:`~.fold_constants`.
+    What remains are mostly the ``TARGET`` references of the expression.
+
+    Evaluating the specialized expression with the same :py:attr:`my` and any
+    ``TARGET`` ad gives the same result as the original expression.
+
+    .. code:: python3
+
+        job = parse("[RequestMemory = 2048; Local = false]")
+        specialize(parse("Local || TARGET.Memory >= RequestMemory"), job)
+        # TARGET.Memory >= 2048
+    """
+    return fold_constants(_substitute(expression, my, set()))
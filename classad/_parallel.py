@@ -0,0 +1,55 @@
+"""
+Parsing of many expressions in parallel worker processes
+"""
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from typing import Iterable, Iterator, List, Optional
+
+from classad._base_expression import Expression
+from classad._grammar import parse
+from classad._intern import intern
+
+
+def _parse_chunk(chunk: List[str], backend: str) -> List[Expression]:
+    return [parse(content, backend=backend) for content in chunk]
+
+
+def _chunks(texts: Iterable[str], chunksize: int) -> Iterator[List[str]]:
+    texts = iter(texts)
+    chunk = list(islice(texts, chunksize))
+    while chunk:
+        yield chunk
+        chunk = list(islice(texts, chunksize))
+
+
+def parse_many(
+    texts: Iterable[str],
+    workers: Optional[int] = None,
+    chunksize: int = 256,
+    backend: str = "fast",
+) -> Iterator[Expression]:
+    """
+    Parse all :py:attr:`texts` in :py:attr:`workers` processes
+
+    The texts are sent to the worker processes in chunks of :py:attr:`chunksize`
+    and the results are yielded in the order of :py:attr:`texts`. Only a few
+    chunks per worker are in flight at any time, so that :py:attr:`texts` may
+    be an arbitrarily long iterable, e.g. the blocks of a dump.
+
+    If :py:attr:`workers` is :py:data:`None`, one process per CPU is used.
+    Parsing errors are raised when the result of the offending text is reached.
+    Identical expressions are shared across all results, as with :py:func:`~.parse`.
+    """
+    if chunksize < 1:
+        raise ValueError(f"chunksize must be positive, got {chunksize}")
+    workers = workers if workers is not None else os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = deque()
+        for chunk in _chunks(texts, chunksize):
+            pending.append(executor.submit(_parse_chunk, chunk, backend))
+            if len(pending) > 2 * workers:
+                yield from map(intern, pending.popleft().result())
+        while pending:
+            yield from map(intern, pending.popleft().result())
@@ -0,0 +1,312 @@
+"""
+Hand-written tokenizer and precedence-climbing parser for classad expressions
+
+This is an alternative backend to the :py:mod:`pyparsing` grammar defined in
+:py:mod:`classad._grammar`. It creates the very same expression trees but works
+on a flat list of tokens produced by a single regular expression, avoiding the
+overhead of generic parser combinators and packrat caching. Expressions are
+shared via :py:func:`~.intern` as they are created.
+"""
+import re
+from typing import List, Tuple, Optional
+
+import pyparsing as pp
+
+from classad._base_expression import Expression
+from classad._intern import _share
+from classad._expression import (
+    ClassAd,
+    AttributeExpression,
+    FunctionExpression,
+    ArithmeticExpression,
+    SubscriptableExpression,
+    TernaryExpression,
+    NamedExpression,
+    UnaryExpression,
+    DotExpression,
+)
+from classad._primitives import (
+    Error,
+    Undefined,
+    HTCBool,
+    HTCInt,
+    HTCFloat,
+    HTCStr,
+    HTCList,
+)
+
+TOKEN = re.compile(
+    r"""
+    [ \t\n\r]*(?:
+        (?P<float>(?:\d+\.\d+|\.\d+)(?:[eE][+-]?\d+)?|\d+[eE][+-]?\d+)
+        |(?P<integer>0|[1-9]\d*)
+        |"(?P<string>(?:[^"\\\n\r]|\\.)*)"
+        |'(?P<quoted>(?:[^'\\\n\r]|\\.)+)'
+        |(?P<name>[A-Za-z_][A-Za-z0-9_]*)
+        |(?P<operator>=\?=|=!=|==|!=|<=|>=|&&|\|\||[-*/+<>!=?:;,.()\[\]{}])
+    )
+    """,
+    re.VERBOSE,
+)
+WHITESPACE = re.compile(r"[ \t\n\r]*")
+END = "end"
+
+# binary operators and their precedence, higher values bind stronger
+BINARY_PRECEDENCE = {
+    "||": 1,
+    "&&": 2,
+    "==": 3,
+    "!=": 3,
+    "=?=": 3,
+    "=!=": 3,
+    "is": 3,
+    "isnt": 3,
+    "<": 4,
+    "<=": 4,
+    ">=": 4,
+    ">": 4,
+    "+": 5,
+    "-": 5,
+    "*": 6,
+    "/": 6,
+}
+UNARY_OPERATORS = {"-", "!"}
+
+Token = Tuple[str, str, int, int]
+
+
+def tokenize(content: str) -> List[Token]:
+    """
+    Split :py:attr:`content` into a list of ``(kind, value, start, end)`` tokens
+
+    The list is always terminated by a single token of kind ``"end"``.
+    """
+    tokens = []
+    position = 0
+    length = len(content)
+    match = TOKEN.match
+    while True:
+        result = match(content, position)
+        if result is None:
+            position = WHITESPACE.match(content, position).end()
+            if position == length:
+                break
+            raise pp.ParseException(content, position, "Unexpected character")
+        kind = result.lastgroup
+        tokens.append((kind, result.group(kind), result.start(kind), result.end()))
+        position = result.end()
+    tokens.append((END, "", length, length))
+    return tokens
+
+
+class Parser(object):
+    """
+    Recursive-descent parser for a single classad expression
+
+    Binary operators are parsed by precedence climbing. Consecutive operators of
+    the same precedence are collected into a single
+    :py:class:`~.ArithmeticExpression`, exactly as :py:func:`pyparsing.infixNotation`
+    does for the :py:mod:`pyparsing` backend.
+    """
+
+    __slots__ = ("_content", "_tokens", "_position")
+
+    def __init__(self, content: str):
+        self._content = content
+        self._tokens = tokenize(content)
+        self._position = 0
+
+    def parse(self) -> Expression:
+        result = self._expression()
+        if self._tokens[self._position][0] != END:
+            self._fail("Expected end of text")
+        return result
+
+    def _fail(self, message: str):
+        raise pp.ParseException(self._content, self._tokens[self._position][2], message)
+
+    def _at(self, value: str, offset: int = 0) -> bool:
+        kind, token, _, _ = self._tokens[self._position + offset]
+        return token == value and kind == "operator"
+
+    def _accept(self, value: str) -> bool:
+        if self._at(value):
+            self._position += 1
+            return True
+        return False
+
+    def _expect(self, value: str):
+        if not self._accept(value):
+            self._fail(f"Expected {value!r}")
+
+    def _binary_operator(self) -> Optional[str]:
+        kind, token, _, _ = self._tokens[self._position]
+        if kind == "operator" or (kind == "name" and token in ("is", "isnt")):
+            return token if token in BINARY_PRECEDENCE else None
+        return None
+
+    def _expression(self) -> Expression:
+        condition = self._binary(1)
+        if not self._accept("?"):
+            return condition
+        if_true = None if self._at(":") else self._expression()
+        self._expect(":")
+        if_false = self._expression()
+        return _share(TernaryExpression.from_grammar((condition, if_true, if_false)))
+
+    def _binary(self, min_precedence: int) -> Expression:
+        left = self._unary()
+        operator = self._binary_operator()
+        while operator is not None:
+            precedence = BINARY_PRECEDENCE[operator]
+            if precedence < min_precedence:
+                break
+            chain = [left]
+            while operator is not None and BINARY_PRECEDENCE[operator] == precedence:
+                self._position += 1
+                chain.append(operator)
+                chain.append(self._binary(precedence + 1))
+                operator = self._binary_operator()
+            left = _share(ArithmeticExpression.from_grammar(tuple(chain)))
+        return left
+
+    def _unary(self) -> Expression:
+        kind, token, _, _ = self._tokens[self._position]
+        if kind == "operator" and token in UNARY_OPERATORS:
+            self._position += 1
+            return _share(UnaryExpression.from_grammar((token, self._unary())))
+        return self._suffix()
+
+    def _suffix(self) -> Expression:
+        kind, token, _, _ = self._tokens[self._position]
+        if kind == "operator" and token == ".":
+            self._position += 1
+            names = self._attribute_names()
+            return _share(AttributeExpression.from_grammar((".", names)))
+        result, subscriptable = self._primary()
+        if not subscriptable:
+            return result
+        if self._accept("."):
+            names = self._attribute_names()
+            if isinstance(result, ClassAd):
+                attribute = _share(AttributeExpression.from_grammar(names))
+                return _share(DotExpression.from_grammar((result, attribute)))
+            return _share(AttributeExpression.from_grammar((result._expression, names)))
+        if self._accept("["):
+            index = self._expression()
+            self._expect("]")
+            return _share(SubscriptableExpression.from_grammar((result, index)))
+        return result
+
+    def _attribute_name(self) -> str:
+        kind, token, _, _ = self._tokens[self._position]
+        if kind != "name" and kind != "quoted":
+            self._fail("Expected attribute name")
+        self._position += 1
+        return token
+
+    def _attribute_names(self):
+        names = [self._attribute_name()]
+        while self._accept("."):
+            names.append(self._attribute_name())
+        return names[0] if len(names) == 1 else tuple(names)
+
+    def _primary(self) -> Tuple[Expression, bool]:
+        """Parse an atom and report whether it may carry a `.` or `[]` suffix"""
+        kind, token, _, end = self._tokens[self._position]
+        if kind == "name":
+            keyword = token.lower()
+            if keyword == "true" or keyword == "false":
+                self._position += 1
+                return HTCBool(1 if keyword == "true" else 0), False
+            elif keyword == "error":
+                self._position += 1
+                return Error(), True
+            elif keyword == "undefined":
+                self._position += 1
+                return Undefined(), True
+            elif keyword == "parent" or keyword == "super":
+                self._position += 1
+                return _share(NamedExpression.from_grammar(keyword)), True
+            if self._at("(", 1) and self._tokens[self._position + 1][2] == end:
+                return self._function_call(token), True
+            if self._at("=", 1):
+                return self._attribute_definitions(), False
+            self._position += 1
+            if keyword == "target" and (self._at(".") or self._at("[")):
+                return NamedExpression.from_grammar(keyword), True
+            return _share(AttributeExpression.from_grammar(token)), True
+        elif kind == "quoted":
+            if self._at("=", 1):
+                return self._attribute_definitions(), False
+            self._position += 1
+            return _share(AttributeExpression.from_grammar(token)), True
+        elif kind == "integer":
+            self._position += 1
+            return HTCInt(token), False
+        elif kind == "float":
+            self._position += 1
+            return HTCFloat(token), False
+        elif kind == "string":
+            self._position += 1
+            return HTCStr(token), False
+        elif kind == "operator":
+            if token == "(":
+                self._position += 1
+                result = self._expression()
+                self._expect(")")
+                return result, True
+            elif token == "[":
+                self._position += 1
+                return self._record(), True
+            elif token == "{":
+                self._position += 1
+                return HTCList(self._expression_list("}")), True
+        self._fail("Expected expression")
+
+    def _expression_list(self, closing: str) -> List[Expression]:
+        elements = []
+        if self._accept(closing):
+            return elements
+        elements.append(self._expression())
+        while self._accept(","):
+            elements.append(self._expression())
+        self._expect(closing)
+        return elements
+
+    def _function_call(self, name: str) -> FunctionExpression:
+        self._position += 2
+        arguments = tuple(self._expression_list(")"))
+        return _share(FunctionExpression.from_grammar((name, arguments)))
+
+    def _attribute_definition(self) -> Tuple[str, Expression]:
+        name = self._attribute_name()
+        self._expect("=")
+        return name, self._expression()
+
+    def _record(self) -> ClassAd:
+        """Parse the body of a ``[name = value; ...]`` record"""
+        definitions = []
+        if not self._accept("]"):
+            definitions.append(self._attribute_definition())
+            while self._accept(";"):
+                if self._at("]"):
+                    break
+                definitions.append(self._attribute_definition())
+            self._expect("]")
+        return ClassAd.from_grammar(definitions)
+
+    def _attribute_definitions(self) -> ClassAd:
+        """Parse an old-style record of undelimited ``name = value`` definitions"""
+        definitions = [self._attribute_definition()]
+        while True:
+            kind, _, _, _ = self._tokens[self._position]
+            if (kind != "name" and kind != "quoted") or not self._at("=", 1):
+                break
+            definitions.append(self._attribute_definition())
+        return ClassAd.from_grammar(definitions)
+
+
+def parse(content: str) -> Expression:
+    """Parse :py:attr:`content` to a classad expression without :py:mod:`pyparsing`"""
+    return Parser(content).parse()
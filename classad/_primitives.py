@@ -3,16 +3,22 @@ Literal constants: integer, float, string, boolean, error, or undefined
 """
 from typing import Union
 
-from classad._base_expression import PrimitiveExpression
+from classad._base_expression import PrimitiveExpression, Scopes, merge_scopes
 
 
 class Undefined(PrimitiveExpression):
     """
     The keyword ``UNDEFINED`` (case insensitive) represents the ``UNDEFINED`` value.
+
+    There is only a single instance, :py:data:`~.UNDEFINED`, which is returned
+    whenever a new :py:class:`~.Undefined` is created.
     """
 
     __slots__ = ()
 
+    def __new__(cls):
+        return UNDEFINED
+
     def __bool__(self):
         raise TypeError
 
@@ -70,10 +76,16 @@ class Undefined(PrimitiveExpression):
 class Error(PrimitiveExpression):
     """
     The keyword ``ERROR`` (case insensitive) represents the ``ERROR`` value.
+
+    There is only a single instance, :py:data:`~.ERROR`, which is returned
+    whenever a new :py:class:`~.Error` is created.
     """
 
     __slots__ = ()
 
+    def __new__(cls):
+        return ERROR
+
     def __bool__(self):
         raise TypeError
 
@@ -239,6 +251,9 @@ class HTCList(tuple, PrimitiveExpression):
     def __htc_not__(self) -> "Union[HTCBool, Undefined, Error]":
         return Error()
 
+    def _references(self) -> Scopes:
+        return merge_scopes(self)
+
     def __repr__(self):
         return f"<{self.__class__.__name__}>: {[element for element in self]}"
 
@@ -331,11 +346,21 @@ class HTCFloat(float, PrimitiveExpression):
 
 
 class HTCBool(PrimitiveExpression):
+    """
+    The keywords ``TRUE`` and ``FALSE`` (case insensitive) represent boolean values.
+
+    There are only the two instances :py:attr:`~.HTCBool.TRUE` and
+    :py:attr:`~.HTCBool.FALSE`, one of which is returned whenever a new
+    :py:class:`~.HTCBool` is created.
+    """
+
     __slots__ = ("_value",)
 
-    def __init__(self, x):
-        super().__init__()
-        self._value = True if x != 0 else False
+    TRUE: "HTCBool"
+    FALSE: "HTCBool"
+
+    def __new__(cls, x):
+        return HTCBool.TRUE if x != 0 else HTCBool.FALSE
 
     def __add__(self, other):
         return Error()
@@ -355,6 +380,9 @@ class HTCBool(PrimitiveExpression):
     def __bool__(self):
         return self._value
 
+    def __reduce__(self):
+        return self.__class__, (self._value,)
+
     def __or__(self, other):
         if not self._value:
             if isinstance(other, (HTCBool, Undefined)):
@@ -395,3 +423,19 @@ class HTCBool(PrimitiveExpression):
 
     def __hash__(self):
         return hash(self._value)
+
+
+def _instance(cls, **slots):
+    """Create the one instance of :py:attr:`cls` bypassing its ``__new__``"""
+    instance = PrimitiveExpression.__new__(cls)
+    for name, value in slots.items():
+        setattr(instance, name, value)
+    return instance
+
+
+#: the single instance of :py:class:`~.Undefined`
+UNDEFINED = _instance(Undefined)
+#: the single instance of :py:class:`~.Error`
+ERROR = _instance(Error)
+HTCBool.TRUE = _instance(HTCBool, _value=True)
+HTCBool.FALSE = _instance(HTCBool, _value=False)
@@ -0,0 +1,74 @@
+"""
+Compiled regular expressions for the ``regexp`` family of functions
+
+Matchmaking evaluates the same ``Requirements`` for every machine of a pool, so
+a ``regexp`` call sees the same pattern over and over. Compiled patterns are
+kept in a bounded cache, so that each pattern is compiled only once.
+"""
+import re
+from typing import Optional, Pattern, Tuple
+
+from classad._cache import LRUCache, MISSING
+
+#: flags enabled by the characters of the ``options`` of regular expressions
+OPTION_FLAGS = {"i": re.IGNORECASE, "m": re.MULTILINE, "s": re.DOTALL}
+
+#: backslash references to groups in the substitute of ``regexps``
+GROUP_REFERENCE = re.compile(r"\\([0-9])")
+
+
+def option_flags(options: Optional[str]) -> int:
+    """Get the ``re`` flags for the ``options`` of a ClassAd regular expression"""
+    flags = 0
+    if options:
+        for option in options.casefold():
+            flags |= OPTION_FLAGS.get(option, 0)
+    return flags
+
+
+class PatternCache(LRUCache):
+    """
+    Bounded cache of compiled regular expressions keyed by pattern and options
+
+    Invalid patterns are cached as well, so that they are rejected without
+    compiling them again. When more than :py:attr:`maxsize` patterns are cached,
+    the least recently used one is evicted.
+
+    .. code:: python3
+
+        parse('regexp("^slot1@", Name)').evaluate(my=machine)
+        pattern_cache.info()  # CacheInfo(hits=0, misses=1, evictions=0, ...)
+    """
+
+    __slots__ = ()
+
+    def __init__(self, maxsize: int = 256):
+        super().__init__(maxsize)
+
+    def compile(self, pattern: str, options: Optional[str] = None) -> Optional[Pattern]:
+        """Get the compiled :py:attr:`pattern` or :py:data:`None` if it is invalid"""
+        key: Tuple[str, int] = (pattern, option_flags(options))
+        result = self._lookup(key)
+        if result is MISSING:
+            try:
+                result = re.compile(*key)
+            except re.error:
+                result = None
+            self._store(key, result)
+        return result
+
+
+#: cache shared by all regular expression functions
+pattern_cache = PatternCache()
+
+
+def expand(substitute: str, match) -> str:
+    """Replace the references ``\\0`` to ``\\9`` in :py:attr:`substitute` by groups"""
+
+    def group(reference) -> str:
+        try:
+            return match.group(int(reference.group(1))) or ""
+        except IndexError:
+            return ""
+
+    return GROUP_REFERENCE.sub(group, substitute)
@@ -0,0 +1,123 @@
+"""
+Registry of the functions that can be called from ClassAd expressions
+
+Function calls are bound to the registered function when the call expression
+is created, so that evaluating a call does not need to look up the function
+again. Names of functions are case-insensitive, as are all names in ClassAds.
+"""
+import inspect
+from typing import Callable, Dict, Optional, Tuple
+
+from classad._primitives import Error
+
+#: builtin functions by their casefolded name
+_builtins: Dict[str, "Builtin"] = {}
+
+
+class Builtin(object):
+    """
+    Function callable from ClassAd expressions
+
+    The :py:attr:`function` receives the evaluated arguments of a call and
+    must return an :py:class:`~.Expression`, usually a primitive. A
+    :py:attr:`pure` function gives the same result for the same arguments, and
+    may thus be evaluated ahead of time or have its results reused.
+    """
+
+    __slots__ = ("name", "function", "minimum", "maximum", "pure")
+
+    def __init__(
+        self,
+        name: str,
+        function: Callable,
+        minimum: int,
+        maximum: Optional[int],
+        pure: bool,
+    ):
+        self.name = name
+        self.function = function
+        #: least number of arguments
+        self.minimum = minimum
+        #: largest number of arguments or :py:data:`None` if there is no limit
+        self.maximum = maximum
+        self.pure = pure
+
+    def accepts(self, count: int) -> bool:
+        """Check whether the function can be called with :py:attr:`count` arguments"""
+        return self.minimum <= count and (self.maximum is None or count <= self.maximum)
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__}>: {self.name}"
+
+
+def _arity(function: Callable) -> Tuple[int, Optional[int]]:
+    """Get the least and largest number of positional arguments of a function"""
+    try:
+        parameters = inspect.signature(function).parameters.values()
+    except (TypeError, ValueError):
+        # some functions implemented in C do not expose their signature
+        return 0, None
+    positional = [
+        parameter
+        for parameter in parameters
+        if parameter.kind
+        in (parameter.POSITIONAL_ONLY, parameter.POSITIONAL_OR_KEYWORD)
+    ]
+    minimum = sum(1 for parameter in positional if parameter.default is parameter.empty)
+    if any(parameter.kind is parameter.VAR_POSITIONAL for parameter in parameters):
+        return minimum, None
+    return minimum, len(positional)
+
+
+def register_function(name: str, function: Callable, pure: bool = False) -> Builtin:
+    """
+    Make :py:attr:`function` callable from expressions as :py:attr:`name`
+
+    The function receives the evaluated arguments of a call and must return an
+    expression, usually one of the primitive types such as
+    :py:class:`~.HTCInt`. The number of arguments it accepts is taken from its
+    signature; calls with another number of arguments evaluate to
+    :py:class:`~.Error`. Only a :py:attr:`pure` function, whose result depends on
+    nothing but its arguments, is evaluated ahead of time by optimizations.
+
+    .. code:: python3
+
+        def cores(memory):
+            return HTCInt(memory // 2048)
+
+        register_function("cores", cores, pure=True)
+        parse("cores(Memory)").evaluate(my=parse("Memory = 8192"))  # HTCInt(4)
+
+    Registering a function under the name of an existing one, which is
+    case-insensitive, replaces it for all expressions. Since the number of
+    arguments of existing calls has already been checked, the replacement
+    must accept the same number of arguments; a :py:exc:`ValueError` is raised
+    otherwise.
+    """
+    minimum, maximum = _arity(function)
+    key = name.casefold()
+    builtin = _builtins.get(key)
+    if builtin is None:
+        builtin = _builtins[key] = Builtin(name, function, minimum, maximum, pure)
+    elif (builtin.minimum, builtin.maximum) != (minimum, maximum):
+        raise ValueError(
+            f"{name!r} must accept the same arguments as the registered function"
+        )
+    else:
+        # replace in place, since call expressions are bound to the entry
+        builtin.name, builtin.function = name, function
+        builtin.minimum, builtin.maximum, builtin.pure = minimum, maximum, pure
+    return builtin
+
+
+def _invalid_call(*arguments) -> Error:
+    return Error()
+
+
+#: stands in for functions called with a number of arguments they do not accept
+INVALID_CALL = Builtin("invalid", _invalid_call, 0, None, True)
+
+
+def lookup(name: str) -> Optional[Builtin]:
+    """Get the function registered as :py:attr:`name` if there is one"""
+    return _builtins.get(name.casefold())
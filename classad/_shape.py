@@ -0,0 +1,128 @@
+"""
+Compact storage of ads that define the same attributes
+
+Most ads of a pool define exactly the same attribute names, for example all
+slots reported by ``condor_status``. Instead of a ``dict`` per ad, the names are
+kept once in a :py:class:`Shape` that maps each name to a slot, and every ad only
+stores the values of its slots. Ads that add names in the same order move
+through the same shapes and thus share them.
+
+Shapes only live as long as there are ads using them or the shapes following
+them. Names of ads that no longer exist thus do not count towards the
+:py:data:`MAX_TRANSITIONS` of a shape.
+"""
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from weakref import WeakValueDictionary
+
+#: maximum number of different names added to live ads of the same shape
+MAX_TRANSITIONS = 32
+
+
+class Shape(object):
+    """Names of the attributes of ads and the slot of each name"""
+
+    __slots__ = ("keys", "slots", "_parent", "_transitions", "__weakref__")
+
+    def __init__(self, keys: Tuple[str, ...] = (), parent: "Optional[Shape]" = None):
+        #: names in the order of their slots
+        self.keys = keys
+        #: slot of each name
+        self.slots: Dict[str, int] = {key: index for index, key in enumerate(keys)}
+        # the parent is kept alive so that ads with fewer names can share it,
+        # while shapes that no ad uses anymore are released by the parent
+        self._parent = parent
+        self._transitions: "WeakValueDictionary[str, Shape]" = WeakValueDictionary()
+
+    def add(self, key: str) -> "Optional[Shape]":
+        """
+        Get the shape with :py:attr:`key` as an additional name
+
+        There is no shape if too many different names have been added to live
+        ads already, as happens for ads whose names are not defined in a common
+        order.
+        """
+        try:
+            return self._transitions[key]
+        except KeyError:
+            if len(self._transitions) >= MAX_TRANSITIONS:
+                return None
+            shape = self._transitions[key] = Shape((*self.keys, key), self)
+            return shape
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__}>: {self.keys}"
+
+
+#: shape of all ads without any attributes
+EMPTY = Shape()
+
+
+class CompactRecord(object):
+    """
+    Attribute values of an ad, stored in the slots of a shared :py:class:`Shape`
+
+    The record supports the parts of the ``dict`` interface used by ads. Names
+    can be replaced and added, but not removed. An ad falls back to a ``dict``
+    if a name is removed or if there is no shape for adding a name, see
+    :py:meth:`fits`.
+    """
+
+    __slots__ = ("_shape", "_values")
+
+    def __init__(self):
+        self._shape = EMPTY
+        self._values: List[Any] = []
+
+    def fits(self, key: str) -> bool:
+        """Check whether :py:attr:`key` can be set without a fallback to a ``dict``"""
+        return key in self._shape.slots or self._shape.add(key) is not None
+
+    def get(self, key: str, default: Any = None) -> Any:
+        index = self._shape.slots.get(key)
+        if index is None:
+            return default
+        return self._values[index]
+
+    def __getitem__(self, key: str) -> Any:
+        return self._values[self._shape.slots[key]]
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        index = self._shape.slots.get(key)
+        if index is not None:
+            self._values[index] = value
+            return
+        shape = self._shape.add(key)
+        if shape is None:
+            raise KeyError(key)
+        self._shape = shape
+        self._values.append(value)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._shape.slots
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._shape.keys)
+
+    def keys(self):
+        return self._shape.keys
+
+    def values(self):
+        return iter(self._values)
+
+    def items(self):
+        return zip(self._shape.keys, self._values)
+
+    def __eq__(self, other):
+        if type(other) is CompactRecord and other._shape is self._shape:
+            return self._values == other._values
+        elif isinstance(other, (CompactRecord, dict)):
+            return dict(self.items()) == dict(other.items())
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self):
+        return repr(dict(self.items()))
@@ -0,0 +1,72 @@
+"""
+Tokenization of string lists for the ``stringList`` family of functions
+
+Machine ads carry long string lists, such as the file transfer plugins of a
+slot, and every job tests them for membership. The same list is thus split
+once per job and machine pair. Each list is tokenized once per delimiter
+instead, and its items are kept as a tuple and as a set for fast membership
+tests.
+"""
+import math
+import re
+from functools import lru_cache
+from typing import FrozenSet, Optional, Tuple, Union
+
+#: number of distinct string lists and delimiters whose tokens are cached
+CACHE_SIZE = 1024
+
+#: items that are integers and floating point numbers, respectively
+INTEGER = re.compile(r"[+-]?[0-9]+")
+REAL = re.compile(r"[+-]?(?:[0-9]+\.?[0-9]*|\.[0-9]+)(?:[eE][+-]?[0-9]+)?")
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def items(string_list: str, delimiter: str) -> Tuple[str, ...]:
+    """
+    Get the items of :py:attr:`string_list`
+
+    Items are separated by runs of any characters of :py:attr:`delimiter`.
+    Whitespace around items is removed and empty items are skipped.
+    """
+    if delimiter:
+        separator = delimiter[0]
+        for character in delimiter[1:]:
+            string_list = string_list.replace(character, separator)
+        tokens = string_list.split(separator)
+    else:
+        tokens = [string_list]
+    return tuple(token for token in map(str.strip, tokens) if token)
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def members(string_list: str, delimiter: str) -> FrozenSet[str]:
+    """Get the distinct items of :py:attr:`string_list`"""
+    return frozenset(items(string_list, delimiter))
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def folded_members(string_list: str, delimiter: str) -> FrozenSet[str]:
+    """Get the distinct casefolded items of :py:attr:`string_list`"""
+    return frozenset(item.casefold() for item in items(string_list, delimiter))
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def numbers(
+    string_list: str, delimiter: str
+) -> Optional[Tuple[Union[int, float], ...]]:
+    """
+    Get the numeric values of the items of :py:attr:`string_list`
+
+    The result is :py:data:`None` if any item is not a finite number. Unlike
+    for ``int`` and ``float``, items such as ``1_000``, ``nan`` or ``inf`` are
+    not numbers.
+    """
+    values = []
+    for item in items(string_list, delimiter):
+        if INTEGER.fullmatch(item):
+            values.append(int(item))
+        elif REAL.fullmatch(item) and math.isfinite(float(item)):
+            values.append(float(item))
+        else:
+            return None
+    return tuple(values)
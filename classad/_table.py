@@ -0,0 +1,467 @@
+"""
+Column-wise storage of many ClassAds for vectorized evaluation
+
+A :py:class:`~.ClassAdTable` holds the top-level attributes of many ads as
+:py:mod:`numpy` arrays. Each column stores the kind of value of every row,
+such as integer, string or ``undefined``, alongside its numeric value or the
+code of its string in a dictionary shared by all columns.
+
+Expressions are evaluated for all rows at once by combining entire columns.
+Whenever the result of a row cannot be computed column-wise, for example for
+function calls or attributes that are expressions themselves, the row is marked
+and evaluated by the regular interpreter instead.
+
+This module requires :py:mod:`numpy`, which is an optional dependency.
+"""
+from typing import Iterable, List, Dict, Optional, Tuple
+
+try:
+    import numpy
+except ImportError:  # pragma: no cover
+    numpy = None
+
+from classad._base_expression import Expression
+from classad._expression import (
+    ClassAd,
+    ArithmeticExpression,
+    AttributeExpression,
+    TernaryExpression,
+    UnaryExpression,
+)
+from classad._matchmaking import REQUIREMENTS
+from classad._primitives import (
+    Undefined,
+    Error,
+    HTCBool,
+    HTCInt,
+    HTCFloat,
+    HTCStr,
+    UNDEFINED,
+    ERROR,
+)
+
+#: state of a result that is a regular value
+VALUE = 0
+#: state of a result that is ``undefined``
+UNDEFINED_STATE = 1
+#: state of a result that is ``error``
+ERROR_STATE = 2
+
+# kinds of values stored in a column
+_UNDEFINED, _ERROR, _BOOL, _INT, _FLOAT, _STRING, _OTHER = range(7)
+
+# integers are stored as floats, which are exact up to this magnitude
+_MAX_EXACT = 2 ** 53
+
+_ARITHMETIC = {"+", "-", "*", "/"}
+_COMPARISON = {"<", "<=", ">=", ">"}
+_EQUALITY = {"==", "!="}
+
+
+class _Column(object):
+    """Kind, numeric value and string code of an expression for every row"""
+
+    __slots__ = ("kind", "number", "text")
+
+    def __init__(self, kind, number, text):
+        #: kind of the value of each row, such as ``_INT`` or ``_OTHER``
+        self.kind = kind
+        #: value of numbers and booleans, meaningless for other kinds
+        self.number = number
+        #: code of strings in the table dictionary, ``-1`` for other kinds
+        self.text = text
+
+    def where(self, mask, other: "_Column") -> "_Column":
+        """Take the rows of this column where ``mask`` is set, else of ``other``"""
+        return _Column(
+            numpy.where(mask, self.kind, other.kind),
+            numpy.where(mask, self.number, other.number),
+            numpy.where(mask, self.text, other.text),
+        )
+
+
+class ClassAdTable(object):
+    """
+    Column-wise store of many ads to evaluate expressions for all of them at once
+
+    Each ad is a row of the table and all expressions are evaluated with the
+    row as ``TARGET``. This matches evaluating the ``Requirements`` of a single
+    job against every machine of a pool:
+
+    .. code:: python3
+
+        table = ClassAdTable(machines)
+        values, states = table.evaluate(job["Requirements"], my=job)
+        table.matches(job["Requirements"], my=job)  # mask of rows evaluating to true
+
+    Arithmetic, comparisons, boolean logic, conditionals and top-level
+    attributes are evaluated column-wise; all other expressions and operands
+    are evaluated separately for each affected row. Either way, the results
+    are the same as evaluating the expression for each ad individually.
+
+    .. Note::
+
+        Columns are built from the ads when an attribute is first used. The
+        table assumes that the ads do not change once it is created.
+    """
+
+    __slots__ = ("_ads", "_columns", "_codes", "_strings", "_folded", "_folded_codes")
+
+    def __init__(self, ads: Iterable[ClassAd]):
+        if numpy is None:
+            raise ImportError(f"{self.__class__.__name__} requires numpy")
+        self._ads = list(ads)
+        self._columns: Dict[str, _Column] = {}
+        #: code of every string by its value
+        self._codes: Dict[str, int] = {}
+        #: value of every string by its code
+        self._strings: List[str] = []
+        #: code of the casefolded value of every string by its code
+        self._folded: List[int] = []
+        self._folded_codes: Dict[str, int] = {}
+
+    def __len__(self):
+        return len(self._ads)
+
+    def __iter__(self):
+        return iter(self._ads)
+
+    def __getitem__(self, row: int) -> ClassAd:
+        return self._ads[row]
+
+    def _code(self, value: str) -> int:
+        """Get the code of a string, adding it to the dictionary if needed"""
+        try:
+            return self._codes[value]
+        except KeyError:
+            folded = value.lower()
+            self._folded.append(
+                self._folded_codes.setdefault(folded, len(self._folded_codes))
+            )
+            self._strings.append(value)
+            code = self._codes[value] = len(self._codes)
+            return code
+
+    def _encode(self, value: Expression) -> Tuple[int, float, int]:
+        """Get the kind, number and string code of a single value"""
+        if isinstance(value, HTCBool):
+            return _BOOL, 1.0 if value else 0.0, -1
+        elif isinstance(value, HTCInt):
+            if -_MAX_EXACT <= int(value) <= _MAX_EXACT:
+                return _INT, float(value), -1
+        elif isinstance(value, HTCFloat):
+            return _FLOAT, float(value), -1
+        elif isinstance(value, HTCStr):
+            return _STRING, 0.0, self._code(value)
+        elif isinstance(value, Undefined):
+            return _UNDEFINED, 0.0, -1
+        elif isinstance(value, Error):
+            return _ERROR, 0.0, -1
+        return _OTHER, 0.0, -1
+
+    def _constant(self, value: Expression) -> _Column:
+        """Get a column with the same value for every row"""
+        kind, number, text = self._encode(value)
+        rows = len(self._ads)
+        return _Column(
+            numpy.full(rows, kind, dtype=numpy.int8),
+            numpy.full(rows, number),
+            numpy.full(rows, text, dtype=numpy.int64),
+        )
+
+    def _column(self, name: str) -> _Column:
+        """Get the column of the casefolded top-level attribute ``name``"""
+        try:
+            return self._columns[name]
+        except KeyError:
+            pass
+        kinds, numbers, texts = [], [], []
+        for ad in self._ads:
+            kind, number, text = self._encode(ad._get(name))
+            kinds.append(kind)
+            numbers.append(number)
+            texts.append(text)
+        column = self._columns[name] = _Column(
+            numpy.array(kinds, dtype=numpy.int8),
+            numpy.array(numbers, dtype=numpy.float64),
+            numpy.array(texts, dtype=numpy.int64),
+        )
+        return column
+
+    def _other(self) -> _Column:
+        return self._constant(None)
+
+    def _vectorize(self, expression: Expression, my: "Optional[ClassAd]") -> _Column:
+        """Evaluate an expression column-wise, marking rows it cannot evaluate"""
+        if isinstance(expression, AttributeExpression):
+            return self._attribute(expression, my)
+        elif isinstance(expression, ArithmeticExpression):
+            chain = expression._expression
+            result = self._vectorize(chain[0], my)
+            for index in range(1, len(chain), 2):
+                operator, operand = chain[index], chain[index + 1]
+                result = self._binary(operator, result, self._vectorize(operand, my))
+            return result
+        elif isinstance(expression, UnaryExpression):
+            operator, operand = expression._expression
+            return self._unary(operator, self._vectorize(operand, my))
+        elif isinstance(expression, TernaryExpression):
+            condition, if_true, if_false = expression._expression
+            return self._ternary(
+                self._vectorize(condition, my),
+                None if if_true is None else self._vectorize(if_true, my),
+                self._vectorize(if_false, my),
+            )
+        return self._constant(expression)
+
+    def _attribute(self, expression: AttributeExpression, my: "Optional[ClassAd]"):
+        plan = expression._resolution_plan()
+        if plan is None:
+            return self._other()
+        scope, name = plan
+        if scope == "target":
+            return self._column(name)
+        elif scope == "my":
+            return self._constant(UNDEFINED if my is None else my._get(name))
+        if my is None:
+            return self._constant(ERROR)
+        value = my._get(name)
+        if not isinstance(value, Undefined):
+            return self._constant(value)
+        column = self._column(name)
+        # the ad used as my cannot provide the attribute as target
+        mine = [row for row, ad in enumerate(self._ads) if ad is my]
+        if mine:
+            kind = column.kind.copy()
+            kind[mine] = _OTHER
+            column = _Column(kind, column.number, column.text)
+        return column
+
+    def _fill(self, rows, masks: Iterable[Tuple[object, int]]) -> _Column:
+        """Create a column of :py:attr:`rows` with kinds set by ``(mask, kind)``"""
+        kind = numpy.full(rows, _OTHER, dtype=numpy.int8)
+        for mask, value in masks:
+            kind[mask] = value
+        return _Column(kind, numpy.zeros(rows), numpy.full(rows, -1, dtype=numpy.int64))
+
+    def _binary(self, operator: str, left: _Column, right: _Column) -> _Column:
+        if operator == "&&" or operator == "||":
+            return self._logical(operator == "||", left, right)
+        lk, rk = left.kind, right.kind
+        other = (lk == _OTHER) | (rk == _OTHER)
+        if operator in _EQUALITY:
+            error = ~other & ((lk == _ERROR) | (rk == _ERROR))
+            undefined = ~other & ~error & ((lk == _UNDEFINED) | (rk == _UNDEFINED))
+            return self._equality(
+                operator == "!=", left, right, other, error, undefined
+            )
+        elif operator not in _ARITHMETIC and operator not in _COMPARISON:
+            return self._other()
+        # undefined and error propagate, unless a numeric operand is on the right
+        left_numeric = (lk == _INT) | (lk == _FLOAT)
+        error = ~other & (
+            (lk == _ERROR) | ((rk == _ERROR) & (left_numeric | (lk == _UNDEFINED)))
+        )
+        undefined = (
+            ~other & ~error & ((lk == _UNDEFINED) | ((rk == _UNDEFINED) & left_numeric))
+        )
+        integers = (lk == _INT) & (rk == _INT)
+        result = self._fill(len(lk), ((error, _ERROR), (undefined, _UNDEFINED)))
+        with numpy.errstate(all="ignore"):
+            if operator in _COMPARISON:
+                compare = {
+                    "<": numpy.less,
+                    "<=": numpy.less_equal,
+                    ">=": numpy.greater_equal,
+                    ">": numpy.greater,
+                }[operator]
+                result.kind[integers] = _BOOL
+                result.number = numpy.where(
+                    integers, compare(left.number, right.number), 0.0
+                )
+            elif operator == "/":
+                # dividing integers gives a float, and error for a zero divisor
+                zero = integers & (right.number == 0)
+                result.kind[integers] = _FLOAT
+                result.kind[zero] = _ERROR
+                result.number = numpy.where(
+                    integers & ~zero, left.number / right.number, 0.0
+                )
+            elif operator == "*":
+                numeric = left_numeric & ((rk == _INT) | (rk == _FLOAT))
+                number = left.number * right.number
+                result.kind[numeric] = _FLOAT
+                result.kind[integers] = _INT
+                result.number = numpy.where(numeric, number, 0.0)
+            else:
+                number = (
+                    left.number + right.number
+                    if operator == "+"
+                    else left.number - right.number
+                )
+                result.kind[integers] = _INT
+                result.number = numpy.where(integers, number, 0.0)
+            if operator in ("+", "-", "*"):
+                # results that are not exact as floats are left to the interpreter
+                inexact = integers & (numpy.abs(result.number) > _MAX_EXACT)
+                result.kind[inexact] = _OTHER
+        return result
+
+    def _equality(self, negate: bool, left, right, other, error, undefined) -> _Column:
+        lk, rk = left.kind, right.kind
+        result = self._fill(len(lk), ((error, _ERROR), (undefined, _UNDEFINED)))
+        valid = ~other & ~error & ~undefined
+        numeric = ((lk == _INT) | (lk == _FLOAT)) & ((rk == _INT) | (rk == _FLOAT))
+        booleans = (lk == _BOOL) & (rk == _BOOL)
+        strings = (lk == _STRING) & (rk == _STRING)
+        comparable = numeric | booleans | strings
+        # strings are compared case-insensitively by their casefolded codes
+        folded = numpy.array(self._folded + [-1], dtype=numpy.int64)
+        equal = numpy.where(
+            strings,
+            folded[left.text] == folded[right.text],
+            left.number == right.number,
+        )
+        result.kind[valid & comparable] = _BOOL
+        # values of different types cannot be compared
+        result.kind[valid & ~comparable] = _ERROR
+        result.number = numpy.where(valid & comparable, equal != negate, 0.0)
+        return result
+
+    def _logical(self, decisive: bool, left: _Column, right: _Column) -> _Column:
+        lk, rk = left.kind, right.kind
+        decisive = 1.0 if decisive else 0.0
+        left_bool, right_bool = lk == _BOOL, rk == _BOOL
+        # the right operand is not evaluated after a decisive left operand
+        decided = (left_bool & (left.number == decisive)) | (lk == _ERROR)
+        passed = left_bool & ~decided
+        undecided = lk == _UNDEFINED
+        right_decisive = right_bool & (right.number == decisive)
+        result = self._fill(
+            len(lk),
+            (
+                (passed & (right_bool | (rk == _UNDEFINED)), _BOOL),
+                (passed & (rk == _UNDEFINED), _UNDEFINED),
+                (passed & ~right_bool & (rk != _UNDEFINED), _ERROR),
+                (undecided, _UNDEFINED),
+                (undecided & right_decisive, _BOOL),
+                (undecided & (rk == _ERROR), _ERROR),
+                ((passed | undecided) & (rk == _OTHER), _OTHER),
+            ),
+        )
+        result.number = numpy.where(
+            passed, right.number, numpy.where(undecided, decisive, 0.0)
+        )
+        return left.where(decided, result)
+
+    def _unary(self, operator: str, operand: _Column) -> _Column:
+        kind = operand.kind
+        if operator == "!":
+            result = self._fill(
+                len(kind),
+                (
+                    ((kind == _INT) | (kind == _FLOAT) | (kind == _STRING), _ERROR),
+                    (kind == _ERROR, _ERROR),
+                    (kind == _UNDEFINED, _UNDEFINED),
+                    (kind == _BOOL, _BOOL),
+                ),
+            )
+            result.number = 1.0 - operand.number
+            return result
+        elif operator == "-":
+            numeric = (kind == _INT) | (kind == _FLOAT)
+            result = self._fill(
+                len(kind),
+                (
+                    (
+                        (kind == _UNDEFINED) | (kind == _ERROR) | (kind == _STRING),
+                        _ERROR,
+                    ),
+                    (numeric, kind[numeric]),
+                ),
+            )
+            result.number = numpy.where(numeric, -operand.number, 0.0)
+            return result
+        return self._other()
+
+    def _ternary(
+        self, condition: _Column, if_true: Optional[_Column], if_false: _Column
+    ) -> _Column:
+        kind = condition.kind
+        if if_true is None:
+            return if_false.where(kind == _UNDEFINED, condition)
+        result = self._fill(
+            len(kind), ((kind != _OTHER, _ERROR), (kind == _UNDEFINED, _UNDEFINED))
+        )
+        selected = if_true.where(condition.number != 0, if_false)
+        return selected.where(kind == _BOOL, result)
+
+    def _decode(self, kind: int, number: float, text: int) -> Expression:
+        """Get the value of a single row of a column"""
+        if kind == _BOOL:
+            return HTCBool(number)
+        elif kind == _INT:
+            return HTCInt(int(number))
+        elif kind == _FLOAT:
+            return HTCFloat(number)
+        elif kind == _STRING:
+            return HTCStr(self._strings[text])
+        elif kind == _UNDEFINED:
+            return UNDEFINED
+        return ERROR
+
+    def evaluate(
+        self, expression: Expression, my: "Optional[ClassAd]" = None
+    ) -> "Tuple[numpy.ndarray, numpy.ndarray]":
+        """
+        Evaluate an expression with every row as ``TARGET``
+
+        The result is a pair of arrays: the values of the expression for each
+        row, and the state of each value as :py:data:`~.VALUE`,
+        :py:data:`~.UNDEFINED_STATE` or :py:data:`~.ERROR_STATE`. Values are the
+        same as for ``expression.evaluate(my=my, target=row)``.
+        """
+        column = self._vectorize(expression, my)
+        values = numpy.empty(len(self._ads), dtype=object)
+        states = numpy.full(len(self._ads), VALUE, dtype=numpy.int8)
+        for row, (kind, number, text) in enumerate(
+            zip(column.kind.tolist(), column.number.tolist(), column.text.tolist())
+        ):
+            if kind == _OTHER:
+                value = expression._evaluate(key=[], my=my, target=self._ads[row])
+            else:
+                value = self._decode(kind, number, text)
+            values[row] = value
+            if isinstance(value, Undefined):
+                states[row] = UNDEFINED_STATE
+            elif isinstance(value, Error):
+                states[row] = ERROR_STATE
+        return values, states
+
+    def matches(
+        self, expression: Expression, my: "Optional[ClassAd]" = None
+    ) -> "numpy.ndarray":
+        """Get a mask of all rows for which an expression evaluates to ``true``"""
+        column = self._vectorize(expression, my)
+        result = (column.kind == _BOOL) & (column.number != 0)
+        for row in numpy.flatnonzero(column.kind == _OTHER).tolist():
+            result[row] = (
+                expression._evaluate(key=[], my=my, target=self._ads[row])
+                is HTCBool.TRUE
+            )
+        return result
+
+    def match(self, job: ClassAd) -> List[ClassAd]:
+        """
+        Get the ads matching the :py:attr:`job`
+
+        The ``Requirements`` of the :py:attr:`job` are evaluated column-wise; only
+        for the rows they accept the ``Requirements`` of the ad are evaluated
+        individually. The result is the same as for :py:func:`~.match`.
+        """
+        accepted = self.matches(job[REQUIREMENTS], my=job)
+        return [
+            ad
+            for ad in (self._ads[row] for row in numpy.flatnonzero(accepted).tolist())
+            if ad.evaluate(REQUIREMENTS, my=ad, target=job) is HTCBool.TRUE
+        ]
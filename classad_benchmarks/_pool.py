@@ -0,0 +1,76 @@
+"""
+Synthetic job and machine ads resembling ``condor_q -long``/``condor_status -long``
+"""
+import random
+from typing import List
+
+OPERATING_SYSTEMS = ("LINUX", "WINDOWS", "OSX")
+ARCHITECTURES = ("X86_64", "INTEL", "PPC")
+
+
+def label(index: int) -> str:
+    """Encode :py:attr:`index` without the digit ``0`` for use in string literals"""
+    digits = []
+    while True:
+        index, digit = divmod(index, 9)
+        digits.append("123456789"[digit])
+        if not index:
+            return "".join(reversed(digits))
+
+
+def machine_source(index: int, rng: random.Random) -> str:
+    """Source text of a single machine ad in long format"""
+    return "\n".join(
+        (
+            'MyType = "Machine"',
+            'TargetType = "Job"',
+            f'Name = "slot1@node{label(index)}.example.com"',
+            f'Machine = "node{label(index)}.example.com"',
+            f'OpSys = "{rng.choice(OPERATING_SYSTEMS)}"',
+            f'Arch = "{rng.choice(ARCHITECTURES)}"',
+            f"Memory = {rng.choice((1024, 2048, 4096, 8192, 16384))}",
+            f"Disk = {rng.randint(10, 500) * 1024 * 1024}",
+            f"Cpus = {rng.choice((1, 2, 4, 8))}",
+            f"LoadAvg = {rng.random():.4f}",
+            f"KeyboardIdle = {rng.randint(0, 3600)}",
+            'State = "Unclaimed"',
+            'Activity = "Idle"',
+            "Start = true",
+            "Requirements = START && (TARGET.RequestMemory <= MY.Memory)",
+            "Rank = TARGET.RequestCpus * 10 + (LoadAvg < 0.3 ? 5 : 0)",
+        )
+    )
+
+
+def job_source(index: int, rng: random.Random) -> str:
+    """Source text of a single job ad in long format"""
+    return "\n".join(
+        (
+            'MyType = "Job"',
+            'TargetType = "Machine"',
+            f"ClusterId = {index // 100}",
+            f"ProcId = {index % 100}",
+            f'Owner = "user{label(rng.randint(0, 20))}"',
+            f"RequestMemory = {rng.choice((512, 1024, 2048))}",
+            f"RequestCpus = {rng.choice((1, 2))}",
+            f"RequestDisk = {rng.randint(1, 10) * 1024}",
+            'Cmd = "/usr/bin/simulate"',
+            f'Arguments = "--seed {label(index)}"',
+            "JobUniverse = 5",
+            'Requirements = (TARGET.Arch == "X86_64") && (TARGET.OpSys == "LINUX")'
+            " && (TARGET.Disk >= RequestDisk) && (TARGET.Memory >= RequestMemory)",
+            "Rank = TARGET.Memory + TARGET.Cpus * 1024",
+            "PeriodicRemove = (JobStatus == 5)"
+            " && (time() - EnteredCurrentStatus > 3600 * 24)",
+        )
+    )
+
+
+def machine_sources(count: int, seed: int = 1337) -> List[str]:
+    rng = random.Random(seed)
+    return [machine_source(index, rng) for index in range(count)]
+
+
+def job_sources(count: int, seed: int = 1337) -> List[str]:
+    rng = random.Random(seed)
+    return [job_source(index, rng) for index in range(count)]
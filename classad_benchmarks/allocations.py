@@ -0,0 +1,52 @@
+"""
+Memory allocated by the results of a matchmaking loop
+
+Run as ``python -m classad_benchmarks.allocations``.
+"""
+import argparse
+import time
+import tracemalloc
+
+from classad._grammar import parse
+
+from ._pool import job_sources, machine_sources
+
+
+def main():
+    cli = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    cli.add_argument("--jobs", type=int, default=20, help="number of job ads")
+    cli.add_argument("--machines", type=int, default=500, help="number of machines")
+    options = cli.parse_args()
+    jobs = [parse(source, backend="fast") for source in job_sources(options.jobs)]
+    machines = [
+        parse(source, backend="fast") for source in machine_sources(options.machines)
+    ]
+    pairs = len(jobs) * len(machines)
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    start = time.perf_counter()
+    # keep the verdicts for both directions, as a negotiator does for each pair
+    results = [
+        (
+            job.evaluate("Requirements", my=job, target=machine),
+            machine.evaluate("Requirements", my=machine, target=job),
+        )
+        for job in jobs
+        for machine in machines
+    ]
+    duration = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    statistics = tracemalloc.take_snapshot().compare_to(before, "filename")
+    tracemalloc.stop()
+    size = sum(statistic.size_diff for statistic in statistics)
+    blocks = sum(statistic.count_diff for statistic in statistics)
+    distinct = len({id(result) for pair in results for result in pair})
+    print(f"    pairs: {pairs:10d}")
+    print(f" retained: {size / 1024:10.1f} KiB in {blocks} blocks")
+    print(f"     peak: {peak / 1024:10.1f} KiB")
+    print(f" distinct: {distinct:10d} result objects")
+    print(f"   traced: {pairs / duration:10.1f} pairs/s")
+
+
+if __name__ == "__main__":
+    main()
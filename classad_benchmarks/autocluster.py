@@ -0,0 +1,38 @@
+"""
+Throughput of matching many jobs one by one and by autoclusters
+
+Run as ``python -m classad_benchmarks.autocluster``.
+"""
+import argparse
+import time
+
+from classad import match, Autoclusters
+from classad._grammar import parse
+
+from ._pool import job_sources, machine_sources
+
+
+def main():
+    cli = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    cli.add_argument("--jobs", type=int, default=2_000, help="number of job ads")
+    cli.add_argument("--machines", type=int, default=1_000, help="number of slots")
+    options = cli.parse_args()
+    jobs = [parse(source, backend="fast") for source in job_sources(options.jobs)]
+    machines = [
+        parse(source, backend="fast") for source in machine_sources(options.machines)
+    ]
+    start = time.perf_counter()
+    expected = [match(job, machines) for job in jobs]
+    single = time.perf_counter() - start
+    start = time.perf_counter()
+    autoclusters = Autoclusters(machines)
+    results = autoclusters.match(jobs)
+    clustered = time.perf_counter() - start
+    assert results == expected
+    print(f"      single: {len(jobs) / single:10.1f} jobs/s")
+    print(f"autoclusters: {len(jobs) / clustered:10.1f} jobs/s")
+    print(f"    clusters: {len(autoclusters.group(jobs)):10d} of {len(jobs)} jobs")
+
+
+if __name__ == "__main__":
+    main()
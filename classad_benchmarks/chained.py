@@ -0,0 +1,46 @@
+"""
+Memory of the proc ads of a cluster as full copies versus chained to the cluster
+
+Run as ``python -m classad_benchmarks.chained``.
+"""
+import argparse
+import gc
+import random
+import tracemalloc
+
+from classad._expression import ChainedClassAd, ClassAd
+from classad._grammar import parse
+from classad._primitives import HTCInt, HTCStr
+
+from ._pool import job_source, label
+
+
+def main():
+    cli = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    cli.add_argument("--procs", type=int, default=10_000, help="number of procs")
+    options = cli.parse_args()
+    cluster = parse(job_source(0, random.Random(1337)), backend="fast")
+    size = {}
+    for layout in ("copied", "chained"):
+        gc.collect()
+        tracemalloc.start()
+        procs = []
+        for index in range(options.procs):
+            proc = ChainedClassAd(cluster) if layout == "chained" else ClassAd()
+            if layout == "copied":
+                for key, value in cluster.items():
+                    proc[key] = value
+            proc["ProcId"] = HTCInt(index)
+            proc["Arguments"] = HTCStr(f"--seed {label(index)}")
+            procs.append(proc)
+        gc.collect()
+        size[layout], _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        del procs
+    for layout, total in size.items():
+        print(f"{layout:>8}: {total / options.procs:8.1f} B/proc")
+    print(f"   saved: {1 - size['chained'] / size['copied']:8.1%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+"""
+Throughput of interpreted versus compiled evaluation of job Requirements
+
+Run as ``python -m classad_benchmarks.evaluate``.
+"""
+import argparse
+import timeit
+
+from classad._grammar import parse
+
+from ._pool import job_sources, machine_sources
+
+
+def main():
+    cli = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    cli.add_argument("--jobs", type=int, default=20, help="number of job ads")
+    cli.add_argument("--machines", type=int, default=500, help="number of machines")
+    cli.add_argument("--repeat", type=int, default=5, help="best of repetitions")
+    options = cli.parse_args()
+    jobs = [parse(source, backend="fast") for source in job_sources(options.jobs)]
+    machines = [
+        parse(source, backend="fast") for source in machine_sources(options.machines)
+    ]
+    pairs = len(jobs) * len(machines)
+
+    def interpret():
+        return [
+            job.evaluate("Requirements", my=job, target=machine)
+            for job in jobs
+            for machine in machines
+        ]
+
+    def execute():
+        results = []
+        for job in jobs:
+            requirements = job.compile("Requirements")
+            results.extend(requirements(job, machine) for machine in machines)
+        return results
+
+    assert interpret() == execute()
+    interpreted = min(timeit.repeat(interpret, number=1, repeat=options.repeat))
+    compiled = min(timeit.repeat(execute, number=1, repeat=options.repeat))
+    print(f"interpreted: {pairs / interpreted:10.1f} pairs/s")
+    print(f"   compiled: {pairs / compiled:10.1f} pairs/s")
+    print(f"    speedup: {interpreted / compiled:10.1f}x")
+
+
+if __name__ == "__main__":
+    main()
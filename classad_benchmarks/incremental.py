@@ -0,0 +1,57 @@
+"""
+Cost of keeping matches up to date while machine ads change
+
+Run as ``python -m classad_benchmarks.incremental``.
+"""
+import argparse
+import random
+import time
+
+from classad import IncrementalMatcher
+from classad._grammar import parse
+
+from ._pool import job_sources, machine_sources
+
+#: partial updates of machine ads as sent by a busy pool
+UPDATES = (
+    {"State": '"Claimed"', "Activity": '"Busy"'},
+    {"State": '"Unclaimed"', "Activity": '"Idle"'},
+    {"KeyboardIdle": "1200"},
+    {"LoadAvg": "0.9"},
+)
+
+
+def main():
+    cli = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    cli.add_argument("--jobs", type=int, default=500, help="number of job ads")
+    cli.add_argument("--machines", type=int, default=500, help="number of slots")
+    cli.add_argument("--updates", type=int, default=2_000, help="number of updates")
+    options = cli.parse_args()
+    jobs = [parse(source, backend="fast") for source in job_sources(options.jobs)]
+    machines = [
+        parse(source, backend="fast") for source in machine_sources(options.machines)
+    ]
+    rng = random.Random(1337)
+    updates = [
+        (
+            rng.choice(machines),
+            {name: parse(value) for name, value in rng.choice(UPDATES).items()},
+        )
+        for _ in range(options.updates)
+    ]
+    start = time.perf_counter()
+    matcher = IncrementalMatcher(jobs, machines)
+    build = time.perf_counter() - start
+    pairs = matcher.evaluations
+    start = time.perf_counter()
+    for machine, changes in updates:
+        matcher.update(machine, changes)
+    incremental = time.perf_counter() - start
+    evaluations = matcher.evaluations - pairs
+    print(f"      build: {build:10.3f} s for {pairs} pairs")
+    print(f"incremental: {len(updates) / incremental:10.1f} updates/s")
+    print(f"  evaluated: {evaluations / len(updates):10.1f} of {len(jobs)} jobs/update")
+
+
+if __name__ == "__main__":
+    main()
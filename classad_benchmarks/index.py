@@ -0,0 +1,44 @@
+"""
+Throughput of matching with and without a machine index
+
+Run as ``python -m classad_benchmarks.index``.
+"""
+import argparse
+import time
+
+from classad import match, MachineIndex
+from classad._grammar import parse
+
+from ._pool import job_sources, machine_sources
+
+
+def main():
+    cli = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    cli.add_argument("--jobs", type=int, default=20, help="number of job ads")
+    cli.add_argument("--machines", type=int, default=50_000, help="number of slots")
+    options = cli.parse_args()
+    jobs = [parse(source, backend="fast") for source in job_sources(options.jobs)]
+    machines = [
+        parse(source, backend="fast") for source in machine_sources(options.machines)
+    ]
+    start = time.perf_counter()
+    expected = [match(job, machines) for job in jobs]
+    scan = time.perf_counter() - start
+    start = time.perf_counter()
+    index = MachineIndex(machines)
+    # the first query of each attribute includes building its index
+    results = [index.match(job) for job in jobs[:1]]
+    build = time.perf_counter() - start
+    start = time.perf_counter()
+    results += [index.match(job) for job in jobs[1:]]
+    indexed = time.perf_counter() - start
+    assert results == expected
+    candidates = sum(len(index.candidates(job)) for job in jobs)
+    print(f"     scan: {len(jobs) / scan:10.1f} jobs/s")
+    print(f"    index: {(len(jobs) - 1) / indexed:10.1f} jobs/s")
+    print(f"    build: {build:10.3f} s for the first job")
+    print(f"evaluated: {candidates / len(jobs):10.1f} of {len(machines)} machines")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""
+Memory of a pool with and without sharing identical expressions
+
+Run as ``python -m classad_benchmarks.intern``.
+"""
+import argparse
+import copy
+import gc
+import os
+import subprocess
+import sys
+
+from classad._grammar import parse
+
+from ._pool import job_sources, machine_sources
+
+
+def rss() -> int:
+    """Current resident set size of this process in bytes"""
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except OSError:
+        import resource
+
+        # peak instead of current size, but grows the same for a single pool
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def measure(jobs: int, machines: int, shared: bool) -> int:
+    """Get the growth of the resident set size for holding a pool"""
+    sources = job_sources(jobs) + machine_sources(machines)
+    gc.collect()
+    before = rss()
+    if shared:
+        pool = [parse(source, backend="fast") for source in sources]
+    else:
+        # copies do not share any expressions, as before interning
+        pool = [copy.deepcopy(parse(source, backend="fast")) for source in sources]
+    gc.collect()
+    assert len(pool) == len(sources)
+    return rss() - before
+
+
+def main():
+    cli = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    cli.add_argument("--jobs", type=int, default=20_000, help="number of job ads")
+    cli.add_argument("--machines", type=int, default=5000, help="number of slots")
+    cli.add_argument("--mode", choices=("private", "shared"), help=argparse.SUPPRESS)
+    options = cli.parse_args()
+    if options.mode is not None:
+        print(measure(options.jobs, options.machines, options.mode == "shared"))
+        return
+    # each pool is measured in a fresh process to not reuse freed memory
+    growth = {}
+    for mode in ("private", "shared"):
+        output = subprocess.run(
+            [
+                sys.executable,
+                "-m",
+                __spec__.name,
+                f"--jobs={options.jobs}",
+                f"--machines={options.machines}",
+                f"--mode={mode}",
+            ],
+            check=True,
+            stdout=subprocess.PIPE,
+            universal_newlines=True,
+        ).stdout
+        growth[mode] = int(output)
+    ads = options.jobs + options.machines
+    for mode, size in growth.items():
+        print(f"{mode:>8}: {size / 2**20:10.1f} MiB {size / ads:10.1f} B/ad")
+    print(f"   saved: {1 - growth['shared'] / growth['private']:10.1%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""
+Throughput of matching jobs against a pool of machines
+
+Run as ``python -m classad_benchmarks.match``.
+"""
+import argparse
+import timeit
+
+from classad import match, best_matches
+from classad._grammar import parse
+from classad._primitives import HTCBool
+
+from ._pool import job_sources, machine_sources
+
+
+def main():
+    cli = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    cli.add_argument("--jobs", type=int, default=20, help="number of job ads")
+    cli.add_argument("--machines", type=int, default=2000, help="number of machines")
+    cli.add_argument("--best", type=int, default=10, help="number of best matches")
+    cli.add_argument("--repeat", type=int, default=3, help="best of repetitions")
+    options = cli.parse_args()
+    jobs = [parse(source, backend="fast") for source in job_sources(options.jobs)]
+    machines = [
+        parse(source, backend="fast") for source in machine_sources(options.machines)
+    ]
+    pairs = len(jobs) * len(machines)
+
+    def evaluate():
+        return [
+            [
+                machine
+                for machine in machines
+                if job.evaluate("Requirements", my=job, target=machine) is HTCBool.TRUE
+                and machine.evaluate("Requirements", my=machine, target=job)
+                is HTCBool.TRUE
+            ]
+            for job in jobs
+        ]
+
+    def matchmaking():
+        return [match(job, machines) for job in jobs]
+
+    def ranked():
+        return [best_matches(job, machines, options.best) for job in jobs]
+
+    assert evaluate() == matchmaking()
+    evaluated = min(timeit.repeat(evaluate, number=1, repeat=options.repeat))
+    matched = min(timeit.repeat(matchmaking, number=1, repeat=options.repeat))
+    best = min(timeit.repeat(ranked, number=1, repeat=options.repeat))
+    print(f"    evaluate: {pairs / evaluated:10.1f} pairs/s")
+    print(f"       match: {pairs / matched:10.1f} pairs/s")
+    print(f"best_matches: {pairs / best:10.1f} pairs/s")
+
+
+if __name__ == "__main__":
+    main()
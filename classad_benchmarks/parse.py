@@ -0,0 +1,32 @@
+"""
+Throughput of the available parser backends
+
+Run as ``python -m classad_benchmarks.parse``.
+"""
+import argparse
+import time
+
+from classad._grammar import parse, BACKENDS
+
+from ._pool import job_sources, machine_sources
+
+
+def main():
+    cli = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    cli.add_argument("--ads", type=int, default=200, help="number of ads per kind")
+    options = cli.parse_args()
+    sources = job_sources(options.ads) + machine_sources(options.ads)
+    volume = sum(map(len, sources))
+    for backend in BACKENDS:
+        start = time.perf_counter()
+        for source in sources:
+            parse(source, backend=backend)
+        duration = time.perf_counter() - start
+        print(
+            f"{backend:>10}: {len(sources) / duration:10.1f} ads/s"
+            f" {volume / duration / 1024:10.1f} KiB/s"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,38 @@
+"""
+Scaling of multi-process parsing with the number of workers
+
+Run as ``python -m classad_benchmarks.parse_many``.
+"""
+import argparse
+import time
+
+from classad import parse, parse_many
+
+from ._pool import job_sources, machine_sources
+
+
+def main():
+    cli = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    cli.add_argument("--ads", type=int, default=100_000, help="total number of ads")
+    cli.add_argument("--chunksize", type=int, default=256)
+    cli.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    options = cli.parse_args()
+    sources = job_sources(options.ads // 2) + machine_sources(options.ads // 2)
+    start = time.perf_counter()
+    for source in sources:
+        parse(source, backend="fast")
+    serial = time.perf_counter() - start
+    print(f"{'serial':>10}: {len(sources) / serial:10.1f} ads/s")
+    for workers in options.workers:
+        start = time.perf_counter()
+        for _ in parse_many(sources, workers=workers, chunksize=options.chunksize):
+            pass
+        duration = time.perf_counter() - start
+        print(
+            f"{workers:>10}: {len(sources) / duration:10.1f} ads/s"
+            f" {serial / duration:6.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""
+Memory and lookup speed of ads stored in shared shapes versus own dicts
+
+Run as ``python -m classad_benchmarks.shape``.
+"""
+import argparse
+import gc
+import timeit
+import tracemalloc
+
+from classad._expression import ClassAd
+from classad._grammar import parse
+
+from ._pool import job_sources, machine_sources
+
+
+def as_dict(classad: ClassAd) -> ClassAd:
+    """Copy of an ad with its attributes stored in a dict, as before shapes"""
+    result = ClassAd()
+    result._data = dict(classad.items())
+    return result
+
+
+def as_shaped(classad: ClassAd) -> ClassAd:
+    """Copy of an ad with its attributes stored in a shape"""
+    result = ClassAd()
+    for key, value in classad.items():
+        result[key] = value
+    return result
+
+
+def main():
+    cli = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    cli.add_argument("--jobs", type=int, default=20_000, help="number of job ads")
+    cli.add_argument("--machines", type=int, default=5000, help="number of slots")
+    cli.add_argument("--repeat", type=int, default=5, help="best of repetitions")
+    options = cli.parse_args()
+    sources = job_sources(options.jobs) + machine_sources(options.machines)
+    # both layouts hold the same values, only the storage of names differs
+    pool = [parse(source, backend="fast") for source in sources]
+    lookups = sum(map(len, pool))
+    size, duration = {}, {}
+    for layout, copy in (("dict", as_dict), ("shape", as_shaped)):
+        gc.collect()
+        tracemalloc.start()
+        ads = [copy(classad) for classad in pool]
+        gc.collect()
+        size[layout], _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        probes = [(classad._get, list(classad)) for classad in ads]
+
+        def probe(probes=probes):
+            for get, keys in probes:
+                for key in keys:
+                    get(key)
+
+        duration[layout] = min(timeit.repeat(probe, number=1, repeat=options.repeat))
+        del ads, probes
+    for layout in ("dict", "shape"):
+        print(
+            f"{layout:>6}: {size[layout] / len(pool):8.1f} B/ad"
+            f" {lookups / duration[layout] / 1e6:8.2f} M lookups/s"
+        )
+    print(f" saved: {1 - size['shape'] / size['dict']:8.1%}")
+
+
+if __name__ == "__main__":
+    main()
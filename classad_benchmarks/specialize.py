@@ -0,0 +1,75 @@
+"""
+Throughput of job requirements specialized for their job ad
+
+Run as ``python -m classad_benchmarks.specialize``.
+"""
+import argparse
+import timeit
+
+from classad._grammar import parse
+from classad._primitives import HTCBool
+
+from ._pool import job_sources, machine_sources
+
+
+def main():
+    cli = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    cli.add_argument("--jobs", type=int, default=20, help="number of job ads")
+    cli.add_argument("--machines", type=int, default=2000, help="number of machines")
+    cli.add_argument("--repeat", type=int, default=3, help="best of repetitions")
+    options = cli.parse_args()
+    jobs = [parse(source, backend="fast") for source in job_sources(options.jobs)]
+    machines = [
+        parse(source, backend="fast") for source in machine_sources(options.machines)
+    ]
+    pairs = len(jobs) * len(machines)
+
+    def evaluate():
+        return [
+            [
+                machine
+                for machine in machines
+                if job["Requirements"]._evaluate(key=[], my=job, target=machine)
+                is HTCBool.TRUE
+            ]
+            for job in jobs
+        ]
+
+    def specialized():
+        results = []
+        for job in jobs:
+            requirements = job["Requirements"].specialize(my=job)
+            results.append(
+                [
+                    machine
+                    for machine in machines
+                    if requirements._evaluate(key=[], my=job, target=machine)
+                    is HTCBool.TRUE
+                ]
+            )
+        return results
+
+    def compiled():
+        results = []
+        for job in jobs:
+            requirements = job["Requirements"].specialize(my=job).compile([])
+            results.append(
+                [
+                    machine
+                    for machine in machines
+                    if requirements(job, machine) is HTCBool.TRUE
+                ]
+            )
+        return results
+
+    assert evaluate() == specialized() == compiled()
+    evaluated = min(timeit.repeat(evaluate, number=1, repeat=options.repeat))
+    partial = min(timeit.repeat(specialized, number=1, repeat=options.repeat))
+    both = min(timeit.repeat(compiled, number=1, repeat=options.repeat))
+    print(f"           evaluate: {pairs / evaluated:10.1f} pairs/s")
+    print(f"specialize+evaluate: {pairs / partial:10.1f} pairs/s")
+    print(f" specialize+compile: {pairs / both:10.1f} pairs/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+"""
+Throughput of evaluating job requirements per machine and column-wise
+
+Run as ``python -m classad_benchmarks.table``.
+"""
+import argparse
+import time
+
+from classad import match, ClassAdTable
+from classad._grammar import parse
+
+from ._pool import job_sources, machine_sources
+
+
+def main():
+    cli = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    cli.add_argument("--jobs", type=int, default=10, help="number of job ads")
+    cli.add_argument("--machines", type=int, default=100_000, help="number of slots")
+    options = cli.parse_args()
+    jobs = [parse(source, backend="fast") for source in job_sources(options.jobs)]
+    machines = [
+        parse(source, backend="fast") for source in machine_sources(options.machines)
+    ]
+    start = time.perf_counter()
+    expected = [match(job, machines) for job in jobs]
+    scan = time.perf_counter() - start
+    start = time.perf_counter()
+    table = ClassAdTable(machines)
+    # the first query of each attribute includes building its column
+    results = [table.match(job) for job in jobs[:1]]
+    build = time.perf_counter() - start
+    start = time.perf_counter()
+    results += [table.match(job) for job in jobs[1:]]
+    columns = time.perf_counter() - start
+    assert results == expected
+    start = time.perf_counter()
+    for job in jobs:
+        table.matches(job["Requirements"], my=job)
+    requirements = time.perf_counter() - start
+    print(f"        scan: {len(jobs) / scan:10.1f} jobs/s")
+    print(f"       table: {(len(jobs) - 1) / columns:10.1f} jobs/s")
+    print(f"requirements: {len(jobs) / requirements:10.1f} jobs/s")
+    print(f"       build: {build:10.3f} s for the first job")
+
+
+if __name__ == "__main__":
+    main()
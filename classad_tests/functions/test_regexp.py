@@ -0,0 +1,80 @@
+import pytest
+
+from classad import parse, regexp, regexps, stringList_regexpMember
+from classad._primitives import Error, HTCBool, HTCInt, HTCStr, Undefined
+from classad import PatternCache, pattern_cache
+
+
+class TestRegexp(object):
+    def test_match(self):
+        assert regexp(HTCStr("^slot[0-9]+@"), HTCStr("slot12@node")) == HTCBool(True)
+        assert regexp(HTCStr("node$"), HTCStr("slot12@node")) == HTCBool(True)
+        assert regexp(HTCStr("^node"), HTCStr("slot12@node")) == HTCBool(False)
+
+    def test_options(self):
+        assert not regexp(HTCStr("LINUX"), HTCStr("linux"))
+        assert regexp(HTCStr("LINUX"), HTCStr("linux"), HTCStr("i"))
+        assert regexp(HTCStr("^b$"), HTCStr("a\nb"), HTCStr("M"))
+        assert not regexp(HTCStr("a.b"), HTCStr("a\nb"), HTCStr("xyz"))
+        assert regexp(HTCStr("a.b"), HTCStr("a\nb"), HTCStr("s"))
+
+    def test_error(self):
+        assert isinstance(regexp(HTCStr("("), HTCStr("a")), Error)
+        assert isinstance(regexp(HTCInt(1), HTCStr("1")), Error)
+        assert isinstance(regexp(HTCStr("a"), Undefined()), Error)
+        assert isinstance(regexp(HTCStr("a"), HTCStr("a"), HTCInt(1)), Error)
+
+    def test_substitute(self):
+        name = HTCStr("slot1_2@node.example.com")
+        assert regexps(
+            HTCStr("^(slot[0-9]+)_[0-9]+@(.*)$"), name, HTCStr(r"\1@\2")
+        ) == HTCStr("slot1@node.example.com")
+        assert regexps(HTCStr("node"), name, HTCStr(r"[\0\3]")) == HTCStr("[node]")
+        assert regexps(HTCStr("^x"), name, HTCStr("y")) == HTCStr("")
+        assert isinstance(regexps(HTCStr("x"), name, Undefined()), Error)
+
+    def test_string_list(self):
+        methods = HTCStr("http, https,ftp  file")
+        assert stringList_regexpMember(HTCStr("^ftp$"), methods)
+        assert not stringList_regexpMember(HTCStr("^FILE$"), methods)
+        assert stringList_regexpMember(
+            HTCStr("^FILE$"), methods, HTCStr(" ,"), HTCStr("I")
+        )
+        assert not stringList_regexpMember(HTCStr("^ftp$"), methods, HTCStr(","))
+        assert isinstance(stringList_regexpMember(HTCStr("["), methods), Error)
+
+    def test_evaluate(self):
+        machine = parse('Name = "slot1@node"\nSlots = "a,b"')
+        assert parse('regexp("^SLOT1@", Name, "I")').evaluate(my=machine)
+        assert parse('stringList_regexpMember("b", Slots, ",")').evaluate(my=machine)
+
+
+class TestPatternCache(object):
+    def test_lru(self):
+        cache = PatternCache(maxsize=2)
+        first = cache.compile("a+", "i")
+        assert cache.compile("a+", "I") is first
+        assert cache.compile("a+") is not first
+        assert cache.compile("(") is None
+        assert cache.compile("(") is None
+        assert cache.info() == (2, 3, 1, 2, 2)
+        cache.clear()
+        assert len(cache) == 0 and cache.info() == (0, 0, 0, 2, 0)
+
+    def test_invalid(self):
+        with pytest.raises(ValueError):
+            PatternCache(maxsize=0)
+
+    def test_pool(self):
+        requirements = parse(
+            'regexp("^slot[0-9]+@worker", TARGET.Name)', backend="fast"
+        )
+        machines = [
+            parse(f'Name = "slot{index}@worker"', backend="fast") for index in range(20)
+        ]
+        pattern_cache.clear()
+        assert all(
+            requirements.evaluate(my=parse("a = 1"), target=machine)
+            for machine in machines
+        )
+        assert pattern_cache.misses == 1 and pattern_cache.hits == 19
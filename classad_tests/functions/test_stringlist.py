@@ -0,0 +1,71 @@
+from classad import (
+    parse,
+    stringListSize,
+    stringListSum,
+    stringListAvg,
+    stringListMin,
+    stringListMax,
+    stringListMember,
+    stringListIMember,
+    stringListsIntersect,
+)
+from classad._primitives import Error, HTCBool, HTCFloat, HTCInt, HTCStr, Undefined
+from classad import _stringlist
+
+
+class TestStringList(object):
+    def test_size(self):
+        assert stringListSize(HTCStr("a, b,c  d")) == HTCInt(4)
+        assert stringListSize(HTCStr(" ,, ")) == HTCInt(0)
+        assert stringListSize(HTCStr("a b;c"), HTCStr(";")) == HTCInt(2)
+        assert stringListSize(HTCStr("a::b:;c"), HTCStr(":;")) == HTCInt(3)
+        assert isinstance(stringListSize(HTCInt(1)), Error)
+        assert isinstance(stringListSize(HTCStr("a"), Undefined()), Error)
+
+    def test_numbers(self):
+        assert stringListSum(HTCStr("1, 2, 3")) == HTCInt(6)
+        assert stringListSum(HTCStr("1, 2.5")) == HTCFloat(3.5)
+        assert stringListSum(HTCStr("")) == HTCInt(0)
+        assert isinstance(stringListSum(HTCStr("1, a")), Error)
+        assert stringListAvg(HTCStr("1, 2")) == HTCFloat(1.5)
+        assert stringListAvg(HTCStr("")) == HTCFloat(0.0)
+        assert stringListMin(HTCStr("3;1;2"), HTCStr(";")) == HTCInt(1)
+        assert stringListMin(HTCStr("3, 1, 2.0")) == HTCFloat(1.0)
+        assert stringListMax(HTCStr("3, 1, 2")) == HTCInt(3)
+        assert isinstance(stringListMax(HTCStr("")), Undefined)
+        assert isinstance(stringListMin(HTCStr("x")), Error)
+        assert stringListSum(HTCStr("-1, +2, .5, 1e2")) == HTCFloat(101.5)
+        for invalid in ("1_000", "nan", "inf", "-Infinity", "1e999", "0x10"):
+            assert isinstance(stringListSum(HTCStr(invalid)), Error), invalid
+
+    def test_member(self):
+        methods = HTCStr("http, https,ftp file")
+        assert stringListMember(HTCStr("ftp"), methods) == HTCBool(True)
+        assert stringListMember(HTCStr("FTP"), methods) == HTCBool(False)
+        assert stringListIMember(HTCStr("FTP"), methods) == HTCBool(True)
+        assert stringListMember(HTCStr("ftp"), methods, HTCStr(",")) == HTCBool(False)
+        assert isinstance(stringListMember(HTCInt(1), HTCStr("1")), Error)
+        assert isinstance(stringListIMember(HTCStr("a"), Undefined()), Error)
+
+    def test_intersect(self):
+        assert stringListsIntersect(HTCStr("a, b"), HTCStr("c,b")) == HTCBool(True)
+        assert stringListsIntersect(HTCStr("a, b"), HTCStr("A, c")) == HTCBool(False)
+        assert stringListsIntersect(HTCStr("a;b"), HTCStr("b c"), HTCStr(";")) == (
+            HTCBool(False)
+        )
+        assert isinstance(stringListsIntersect(HTCStr("a"), HTCInt(1)), Error)
+
+    def test_evaluate(self):
+        machine = parse('Plugins = "http,https,s3"\nSlots = "4, 8"')
+        job = parse('Requirements = stringListMember("s3", TARGET.Plugins)')
+        assert job.evaluate("Requirements", my=job, target=machine)
+        assert parse("stringListSum(Slots)").evaluate(my=machine) == HTCInt(12)
+
+    def test_cached(self):
+        plugins = HTCStr("http, https, s3, gsiftp")
+        _stringlist.items.cache_clear()
+        _stringlist.members.cache_clear()
+        for name in ("s3", "ftp", "http", "gsiftp"):
+            stringListMember(HTCStr(name), plugins)
+        assert _stringlist.members.cache_info()[:2] == (3, 1)
+        assert _stringlist.items.cache_info()[:2] == (0, 1)
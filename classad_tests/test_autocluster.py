@@ -0,0 +1,85 @@
+import random
+
+from classad import parse, match, Autoclusters, significant_attributes
+
+from classad_benchmarks._pool import job_sources, machine_sources
+
+
+def test_significant_attributes():
+    machines = [
+        parse(
+            """
+            Memory = 2048
+            Start = TARGET.RequestMemory <= Memory && KeyboardIdle > 60
+            Requirements = START && MY.Cpus >= TARGET.RequestCpus
+            Rank = TARGET.Owner == "alice"
+            """
+        ),
+        parse("Requirements = isUndefined(Target.Foo) ? true : Bar"),
+    ]
+    assert significant_attributes(machines) == {
+        "requestmemory",
+        "keyboardidle",
+        "requestcpus",
+        "owner",
+        "foo",
+        "bar",
+        # read from the job if it evaluates TARGET.Start or TARGET.Requirements
+        "memory",
+        "start",
+        "cpus",
+    }
+    assert significant_attributes(machines[:1], keys=["Requirements"]) == {
+        "requestmemory",
+        "keyboardidle",
+        "requestcpus",
+    }
+    assert significant_attributes([parse('Requirements = eval("true")')]) is None
+
+
+def test_signature():
+    machine = parse("Requirements = TARGET.RequestMemory <= 2048")
+    autoclusters = Autoclusters([machine])
+    jobs = [
+        parse(source)
+        for source in (
+            "RequestMemory = 1024\nCmd = 1\nRequirements = TARGET.Arch == Arch",
+            "RequestMemory = 1024\nCmd = 2\nRequirements = TARGET.Arch == Arch",
+            "RequestMemory = 1024.0\nCmd = 2\nRequirements = TARGET.Arch == Arch",
+            "RequestMemory = 1024\nArch = 1\nRequirements = TARGET.Arch == Arch",
+            "RequestMemory = Memory\nMemory = 1024\nRequirements = true",
+            "RequestMemory = Memory\nMemory = 2048\nRequirements = true",
+        )
+    ]
+    signatures = [autoclusters.signature(job) for job in jobs]
+    assert signatures[0] == signatures[1]
+    assert len(set(signatures)) == len(signatures) - 1
+    assert list(map(len, autoclusters.group(jobs).values())) == [2, 1, 1, 1, 1]
+
+
+def test_match():
+    rng = random.Random(42)
+    machines = [parse(source, backend="fast") for source in machine_sources(200)]
+    jobs = [parse(source, backend="fast") for source in job_sources(200)]
+    jobs += [parse(source, backend="fast") for source in job_sources(50, seed=2)]
+    rng.shuffle(jobs)
+    autoclusters = Autoclusters(machines)
+    assert len(autoclusters.group(jobs)) < len(jobs)
+    assert autoclusters.match(jobs) == [match(job, machines) for job in jobs]
+
+
+def test_indirect():
+    # the job reads a machine attribute that in turn reads a job attribute
+    machine = parse("Requirements = true\nBar = Y")
+    jobs = [parse(f"Requirements = TARGET.Bar == 1\nY = {y}") for y in (1, 2)]
+    assert "y" in significant_attributes([machine])
+    assert Autoclusters([machine]).match(jobs) == [[machine], []]
+
+
+def test_indirect_my():
+    # machine attributes read via TARGET look up plain names in the job first
+    machine = parse("Requirements = true\nBar = Y\nY = 5")
+    jobs = [parse(f"Requirements = TARGET.Bar == 1\nY = {y}") for y in (1, 2)]
+    expected = [match(job, [machine]) for job in jobs]
+    assert list(map(len, expected)) == [1, 0]
+    assert Autoclusters([machine]).match(jobs) == expected
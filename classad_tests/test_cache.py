@@ -0,0 +1,51 @@
+import pytest
+
+from classad import parse, ParseCache
+from classad._primitives import HTCInt
+
+
+class TestParseCache(object):
+    def test_shared(self):
+        cache = ParseCache()
+        first = parse("a + 2", cache=cache)
+        assert parse("a + 2", cache=cache) is first
+        assert parse("a + 2", backend="fast", cache=cache) is first
+        assert cache.info() == (2, 1, 0, 1024, 1)
+        assert first.evaluate(my=parse("a = 4")) == HTCInt(6)
+
+    def test_lru(self):
+        cache = ParseCache(maxsize=2)
+        parse("1", cache=cache)
+        parse("2", cache=cache)
+        parse("1", cache=cache)
+        parse("3", cache=cache)
+        assert "1" in cache and "3" in cache
+        assert "2" not in cache
+        assert len(cache) == 2
+        assert cache.evictions == 1
+        assert cache.hits == 1 and cache.misses == 3
+
+    def test_classad_not_shared(self):
+        cache = ParseCache()
+        assert parse("[a = 1]", cache=cache) is not parse("[a = 1]", cache=cache)
+        assert len(cache) == 0
+
+    def test_nested_classad_not_shared(self):
+        cache = ParseCache()
+        for content in ("{[x = 1]}", "true ? [x = 1] : 2", "size({1, [x = 1]})"):
+            first = parse(content, cache=cache)
+            assert parse(content, cache=cache) is not first
+        records = parse("{[x = 1]}", cache=cache)
+        records[0]["x"] = HTCInt(99)
+        assert parse("{[x = 1]}", cache=cache)[0]["x"] == HTCInt(1)
+        assert len(cache) == 0
+
+    def test_clear(self):
+        cache = ParseCache()
+        parse("a", cache=cache)
+        cache.clear()
+        assert cache.info() == (0, 0, 0, 1024, 0)
+
+    def test_invalid(self):
+        with pytest.raises(ValueError):
+            ParseCache(maxsize=0)
@@ -0,0 +1,60 @@
+import pickle
+
+from classad import parse, ChainedClassAd
+from classad._expression import ClassAd
+from classad._primitives import HTCInt, HTCStr, Undefined
+
+
+def cluster_ad() -> ClassAd:
+    return parse('ClusterId = 42\nRequestMemory = 2048\nOwner = "alice"')
+
+
+class TestChainedClassAd(object):
+    def test_lookup(self):
+        cluster = cluster_ad()
+        proc = ChainedClassAd(cluster)
+        proc["ProcId"] = HTCInt(3)
+        proc["RequestMemory"] = HTCInt(4096)
+        assert proc["owner"] == HTCStr("alice")
+        assert proc["requestmemory"] == HTCInt(4096)
+        assert cluster["requestmemory"] == HTCInt(2048)
+        assert "ClusterId" in proc and "ProcId" not in cluster
+        assert list(proc) == ["clusterid", "requestmemory", "owner", "procid"]
+        assert len(proc) == 4 and len(proc._data) == 2
+        assert isinstance(proc["missing"], Undefined)
+
+    def test_delete(self):
+        proc = ChainedClassAd(cluster_ad())
+        proc["Owner"] = HTCStr("bob")
+        del proc["Owner"]
+        assert proc["Owner"] == HTCStr("alice")
+        assert "owner" not in proc._data
+
+    def test_evaluate(self):
+        cluster = parse("RequestMemory = 1024 * Factor\nFactor = 2")
+        proc = ChainedClassAd(cluster)
+        assert proc.evaluate("RequestMemory") == HTCInt(2048)
+        proc["Factor"] = HTCInt(4)
+        assert proc.evaluate("RequestMemory") == HTCInt(4096)
+        assert proc.compile("RequestMemory")(proc, None) == HTCInt(4096)
+        assert cluster.evaluate("RequestMemory") == HTCInt(2048)
+        cluster["Owner"] = HTCStr("alice")
+        machine = parse('Requirements = TARGET.Owner == "alice" && TARGET.Factor > 2')
+        assert machine.evaluate("Requirements", my=machine, target=proc)
+        references = parse("TARGET.Memory >= RequestMemory").references(my=proc)
+        assert references.my == {"requestmemory", "factor"}
+
+    def test_nested_chain(self):
+        proc = ChainedClassAd(ChainedClassAd(cluster_ad()))
+        proc.parent["Owner"] = HTCStr("bob")
+        assert proc["Owner"] == HTCStr("bob")
+        flat = proc.flatten()
+        assert type(flat) is ClassAd
+        assert flat == parse('ClusterId = 42\nRequestMemory = 2048\nOwner = "bob"')
+
+    def test_pickle(self):
+        proc = ChainedClassAd(cluster_ad())
+        proc["ProcId"] = HTCInt(1)
+        restored = pickle.loads(pickle.dumps(proc))
+        assert restored == proc
+        assert restored.parent == proc.parent
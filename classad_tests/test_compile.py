@@ -0,0 +1,118 @@
+import pytest
+
+from classad import parse, match
+from classad._primitives import HTCInt, HTCBool, Undefined
+
+MY = parse(
+    """
+    a = 4
+    b = true
+    c = a
+    d = TARGET.Memory
+    Name = "slot1"
+    list = {1, 2, a}
+    record = [x = 3; y = a]
+    RequestMemory = 1024
+    """
+)
+TARGET = parse(
+    """
+    Memory = 2048
+    Name = "ab"
+    e = 7
+    f = a
+    OpSys = "LINUX"
+    """
+)
+
+EXPRESSIONS = (
+    "a",
+    "missing",
+    "e",
+    "c",
+    "d",
+    "my.a",
+    "my.e",
+    "MY.a",
+    "TARGET.Memory",
+    "TARGET.missing",
+    "TARGET.f",
+    "record.x",
+    "record.y",
+    ".a",
+    "[x = 1; y = x].y",
+    "list[2]",
+    "1 + 2 * a - 3",
+    "a / 0",
+    '10 * "foo"',
+    "a < 5 < 7",
+    "b && TARGET.Memory >= RequestMemory",
+    'TARGET.OpSys == "linux" || false',
+    "undefined && false",
+    "false && TARGET.missing",
+    "error || true",
+    "true && missing",
+    "a && true",
+    "TARGET.missing || true",
+    "a =?= 4",
+    "a isnt undefined",
+    'b && a == 4 && TARGET.OpSys != "WINDOWS" && TARGET.Memory > 1024',
+    "false || missing || a || true",
+    "b && undefined && error",
+    'Name == "SLOT1" && a != "4" && TARGET.missing >= 2 && a <= 4.0',
+    'a == 4.0 && TARGET.missing == "x"',
+    "-a",
+    "!b",
+    "!undefined",
+    "b ? a : e",
+    "missing ? a : e",
+    "a ? 1 : 2",
+    "missing ?: a",
+    "e ?: a",
+    'strcat(Name, "/", TARGET.Name)',
+    "isInteger(a) && isString(TARGET.Name)",
+    "ifThenElse(b, a, e)",
+)
+
+
+@pytest.mark.parametrize("content", EXPRESSIONS)
+@pytest.mark.parametrize("backend", ("pyparsing", "fast"))
+def test_same_result(content, backend):
+    expression = parse(content, backend=backend)
+    compiled = expression.compile([])
+    for my, target in ((MY, TARGET), (MY, None), (TARGET, MY), (MY, MY)):
+        expected = expression.evaluate(key=[], my=my, target=target)
+        result = compiled(my, target)
+        assert type(result) is type(expected) and result == expected
+
+
+def test_classad_key():
+    job = parse(
+        """
+        RequestMemory = 2048
+        Requirements = TARGET.Memory >= RequestMemory && TARGET.OpSys == "LINUX"
+        """
+    )
+    requirements = job.compile("Requirements")
+    assert requirements(job, TARGET) == HTCBool(True)
+    assert requirements(None, parse("Memory = 1024")) == HTCBool(False)
+    assert requirements(job, None) == Undefined()
+    assert job.compile()(None, None) is job
+
+
+def test_nested_record():
+    job = parse("Requirements = TARGET.Memory > 1 || size([q = 1]) > 0")
+    requirements = job.compile("Requirements")
+    assert requirements(job, TARGET) == job.evaluate("Requirements", target=TARGET)
+    machine = parse("Memory = 2048\nRequirements = true")
+    assert match(job, [machine]) == [machine]
+
+
+def test_unknown_function():
+    compiled = parse("false || nosuchfunction(1)").compile()
+    with pytest.raises(AttributeError):
+        compiled(MY, TARGET)
+
+
+def test_primitive():
+    assert HTCInt(3).compile()(None, None) == HTCInt(3)
@@ -1,8 +1,37 @@
+import pickle
+
+import pytest
+
 from classad import parse
-from classad._primitives import HTCInt
+from classad._primitives import HTCInt, HTCBool, Error, Undefined, UNDEFINED, ERROR
 
 
 def test_simple():
     first_part = parse("my.a + 2")
     my_classad = parse("a = 4")
     assert first_part.evaluate(my=my_classad) == HTCInt(6)
+
+
+def test_short_circuit():
+    # the unknown function would fail if it was evaluated
+    assert parse("false && nosuchfunction()").evaluate() == HTCBool(False)
+    assert parse("true || nosuchfunction()").evaluate() == HTCBool(True)
+    assert isinstance(parse("error && nosuchfunction()").evaluate(), Error)
+    assert parse("false && true || true").evaluate() == HTCBool(True)
+    assert parse("true && false && nosuchfunction()").evaluate() == HTCBool(False)
+    assert parse("undefined && false").evaluate() == HTCBool(False)
+    assert parse("undefined || true").evaluate() == HTCBool(True)
+    with pytest.raises(AttributeError):
+        parse("true && nosuchfunction()").evaluate()
+    for content in ("false && nosuchfunction()", "true || nosuchfunction()"):
+        expression = parse(content)
+        assert expression.compile()(None, None) == expression.evaluate()
+
+
+def test_singletons():
+    assert HTCBool(True) is HTCBool.TRUE and HTCBool(0) is HTCBool.FALSE
+    assert Undefined() is UNDEFINED and Error() is ERROR
+    assert parse("1 < 2").evaluate() is HTCBool.TRUE
+    assert parse("a").evaluate([], my=parse("b = 1")) is UNDEFINED
+    assert pickle.loads(pickle.dumps(HTCBool(False))) is HTCBool.FALSE
+    assert pickle.loads(pickle.dumps(Error())) is ERROR
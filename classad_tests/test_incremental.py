@@ -0,0 +1,59 @@
+import random
+
+from classad import parse, match, best_matches, IncrementalMatcher
+
+from classad_benchmarks._pool import job_sources, machine_sources
+
+CHANGES = (
+    {"State": '"Claimed"'},
+    {"LoadAvg": "0.1"},
+    {"Memory": "512"},
+    {"Memory": "16384", "Cpus": "2"},
+    {"Start": "false"},
+    {"Start": "KeyboardIdle > 600"},
+    {"Disk": None},
+)
+
+
+def test_same_matches():
+    rng = random.Random(42)
+    machines = [parse(source, backend="fast") for source in machine_sources(40)]
+    jobs = [parse(source, backend="fast") for source in job_sources(40)]
+    matcher = IncrementalMatcher(jobs, machines)
+    for _ in range(40):
+        changes = rng.choice(CHANGES)
+        matcher.update(
+            rng.choice(machines),
+            {
+                name: None if value is None else parse(value)
+                for name, value in changes.items()
+            },
+        )
+        for job in jobs:
+            assert matcher.matches(job) == match(job, machines)
+            assert matcher.ranked(job) == best_matches(job, machines, len(machines))
+
+
+def test_evaluations():
+    machines = [
+        parse(f'Memory = {memory}\nState = "Idle"\nRequirements = true')
+        for memory in (1024, 2048, 4096)
+    ]
+    jobs = [
+        parse("Requirements = TARGET.Memory >= 2048"),
+        parse("Requirements = true\nRank = MY.Priority\nPriority = Memory"),
+        parse('Requirements = TARGET.State == "Idle"'),
+    ]
+    matcher = IncrementalMatcher(jobs, machines)
+    assert matcher.evaluations == 9
+    assert matcher.update(machines[0], {"Memory": parse("8192")}) == jobs[:2]
+    assert matcher.evaluations == 11
+    assert matcher.matches(jobs[0]) == machines
+    assert matcher.ranked(jobs[1]) == [machines[0], machines[2], machines[1]]
+    assert matcher.update(machines[1], {"Cpus": parse("8")}) == []
+    assert matcher.evaluations == 11
+    assert matcher.update(machines[1], {"State": parse('"Busy"')}) == jobs[2:]
+    assert matcher.matches(jobs[2]) == [machines[0], machines[2]]
+    assert matcher.update(machines[2], {"Requirements": parse("false")}) == jobs
+    assert matcher.evaluations == 15
+    assert matcher.matches(jobs[1]) == machines[:2]
@@ -0,0 +1,96 @@
+import random
+
+import pytest
+
+from classad import parse, match, MachineIndex, Predicate, extract_predicates
+from classad._primitives import HTCInt, HTCFloat, HTCStr
+
+
+def test_extract():
+    expression = parse(
+        """
+        TARGET.Memory >= 2048 && (TARGET.OpSys == "LINUX" && 4 < TARGET.Cpus)
+        && TARGET.Name > "a" && (TARGET.Disk > 1 || TARGET.Disk < 0)
+        && TARGET.LoadAvg < 0.5 && isUndefined(TARGET.Foo)
+        """
+    )
+    assert extract_predicates(expression) == [
+        Predicate("memory", ">=", HTCInt(2048)),
+        Predicate("opsys", "==", HTCStr("LINUX")),
+        Predicate("cpus", ">", HTCInt(4)),
+        Predicate("loadavg", "<", HTCFloat(0.5)),
+    ]
+    assert extract_predicates(parse("TARGET.Memory >= 2048 || true")) == []
+    assert extract_predicates(parse("TARGET.Memory")) == []
+
+
+def test_extract_my():
+    job = parse(
+        """
+        RequestMemory = 2048
+        RequestDisk = 1024 * 1024
+        Requirements = Memory >= RequestMemory && TARGET.Disk >= RequestDisk
+        """
+    )
+    requirements = job["Requirements"]
+    assert extract_predicates(requirements) == []
+    assert extract_predicates(requirements, my=job) == [
+        Predicate("memory", ">=", HTCInt(2048))
+    ]
+
+
+def machine(rng: random.Random, index: int):
+    memory = rng.choice(("1024", "2048", "2048.0", "4096", "undefined", "MaxMemory"))
+    opsys = rng.choice(('"LINUX"', '"linux"', '"WINDOWS"', "true", "Kernel"))
+    return parse(
+        f"""
+        Name = "slot{index}"
+        Memory = {memory}
+        MaxMemory = {rng.choice((1024, 8192))}
+        Kernel = "LINUX"
+        OpSys = {opsys}
+        Cpus = {rng.randint(1, 8)}
+        Requirements = true
+        """,
+        backend="fast",
+    )
+
+
+JOBS = (
+    'TARGET.Memory >= 2048 && TARGET.OpSys == "LINUX"',
+    "TARGET.Memory == 2048 && TARGET.Cpus < 4",
+    "2048 > TARGET.Memory || TARGET.Cpus < 4",
+    "TARGET.Cpus <= 2 && TARGET.Cpus >= 2",
+    "TARGET.Memory > RequestMemory && TARGET.Cpus != 3",
+    "TARGET.Memory >= 1000000",
+    "true",
+)
+
+
+@pytest.mark.parametrize("requirements", JOBS)
+def test_same_matches(requirements):
+    rng = random.Random(requirements)
+    machines = [machine(rng, index) for index in range(200)]
+    index = MachineIndex(machines)
+    job = parse(f"RequestMemory = 1024\nRequirements = {requirements}", backend="fast")
+    candidates = index.candidates(job)
+    assert len(candidates) <= len(machines)
+    assert index.match(job) == match(job, machines)
+
+
+def test_candidates():
+    machines = [
+        parse(source, backend="fast")
+        for source in (
+            'Memory = 1024\nOpSys = "LINUX"',
+            'Memory = 4096\nOpSys = "linux"',
+            'Memory = 4096\nOpSys = "WINDOWS"',
+            'Memory = 8192.0\nOpSys = "LINUX"',
+            'Memory = MaxMemory\nOpSys = "LINUX"',
+            'OpSys = "LINUX"',
+        )
+    ]
+    index = MachineIndex(machines)
+    job = parse('Requirements = TARGET.Memory > 2048 && TARGET.OpSys == "Linux"')
+    assert index.candidates(job) == [machines[1], machines[3], machines[4]]
+    assert len(index) == len(machines) and list(index) == machines
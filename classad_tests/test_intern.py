@@ -0,0 +1,63 @@
+import gc
+import pickle
+
+import pytest
+
+from classad import parse, intern
+from classad._intern import _interned
+
+
+@pytest.mark.parametrize("backend", ["pyparsing", "fast"])
+def test_shared(backend):
+    first = parse('TARGET.Arch == "X86_64" && TARGET.Memory >= 2048', backend=backend)
+    second = parse('TARGET.Arch == "X86_64" && TARGET.Memory >= 4096', backend=backend)
+    assert first is not second
+    assert first._expression[0] is second._expression[0]
+    assert first._expression[2]._expression[0] is second._expression[2]._expression[0]
+    ads = [parse("Requirements = TARGET.Memory > 1024", backend=backend) for _ in "ab"]
+    assert ads[0] is not ads[1] and ads[0]["Requirements"] is ads[1]["Requirements"]
+
+
+@pytest.mark.parametrize(
+    "first, second",
+    [
+        ("a + 1", "a + 1"),
+        ("a is b", "a =?= b"),
+        ("f(x, {1, 2})", "f(x, {1, 2})"),
+        ("x ?: y", "x ?: y"),
+    ],
+)
+def test_identical(first, second):
+    first = parse(first, backend="fast")
+    # unpickled copies are not shared until interned
+    second = pickle.loads(pickle.dumps(parse(second)))
+    assert first == second and hash(first) == hash(second)
+    assert intern(second) is first
+
+
+@pytest.mark.parametrize(
+    "first, second",
+    [
+        ("a + 1", "a + 1.0"),
+        ("a + 1", "A + 1"),
+        ("a + 1", "a - 1"),
+        ('a == "x"', 'a == "X"'),
+        ("f(x)", "g(x)"),
+        ("x ?: y", "x ? x : y"),
+        ("{1, 2}[a]", "{1, 2.0}[a]"),
+        ("[a = 1].a", "[a = 1].a"),
+    ],
+)
+def test_different(first, second):
+    first, second = parse(first, backend="fast"), parse(second, backend="fast")
+    assert first != second and first is not second
+
+
+def test_released():
+    source = "TARGET.Unique_Attribute_Name * 17 > 4"
+    expression = parse(source)
+    entries = len(_interned)
+    del expression
+    gc.collect()
+    assert len(_interned) < entries
+    assert parse(source) == parse(source, backend="fast")
@@ -0,0 +1,60 @@
+import io
+
+import pyparsing as pp
+import pytest
+
+from classad import load_long, load_long_path, ParseCache
+from classad._expression import ArithmeticExpression
+from classad._primitives import HTCInt, HTCStr
+
+DUMP = """
+MyType = "Job"
+ClusterId = 1
+ProcId = 1
+Requirements = TARGET.Memory >= RequestMemory
+RequestMemory = 2048
+
+MyType = "Job"
+ClusterId = 1
+ProcId = 2
+Requirements = TARGET.Memory >= RequestMemory
+RequestMemory = 4096
+   \t
+MyType = "Job"
+ClusterId = 2
+ProcId = 1
+Requirements = TARGET.Memory >= RequestMemory
+"""
+
+
+def check_dump(classads):
+    assert [classad["procid"] for classad in classads] == [1, 2, 1]
+    assert classads[0]["mytype"] == HTCStr("Job")
+    assert classads[1]["requestmemory"] == HTCInt(4096)
+    assert "requestmemory" not in list(classads[2])
+    assert isinstance(classads[2]["requirements"], ArithmeticExpression)
+
+
+class TestLoadLong(object):
+    @pytest.mark.parametrize("chunk_size", [1, 7, 64, 1024 * 1024])
+    def test_fileobj(self, chunk_size):
+        check_dump(list(load_long(io.StringIO(DUMP), chunk_size=chunk_size)))
+
+    def test_lazy(self):
+        classads = load_long(io.StringIO(DUMP + "\n\ninvalid line\n"))
+        check_dump([next(classads) for _ in range(3)])
+        with pytest.raises(pp.ParseException):
+            next(classads)
+
+    def test_path(self, tmp_path):
+        path = tmp_path / "dump.txt"
+        path.write_text(DUMP + "\n\n\n")
+        check_dump(list(load_long_path(path)))
+        path.write_text("")
+        assert list(load_long_path(path)) == []
+
+    def test_cache(self):
+        cache = ParseCache()
+        classads = list(load_long(io.StringIO(DUMP), cache=cache))
+        assert classads[0]["requirements"] is classads[2]["requirements"]
+        assert cache.info()[:2] == (8, 6)
@@ -0,0 +1,39 @@
+import io
+
+from classad import parse, load_long, ParseCache
+from classad._expression import LazyClassAd, _Unparsed
+from classad._primitives import HTCInt, Undefined
+
+
+class TestLazyClassAd(object):
+    def test_unparsed(self):
+        classad = LazyClassAd.from_source([("A", "1 +"), ("b", "2")])
+        assert len(classad) == 2
+        assert list(classad) == ["a", "b"]
+        assert "A" in classad and "c" not in classad
+        assert all(type(value) is _Unparsed for value in classad._data.values())
+        assert classad["B"] == HTCInt(2)
+        assert type(classad._data["a"]) is _Unparsed
+
+    def test_evaluate(self):
+        classad = LazyClassAd.from_source(
+            [("a", "4"), ("rank", "TARGET.Memory + a"), ("unused", "[")]
+        )
+        target = parse("Memory = 8")
+        assert classad.evaluate("rank", my=classad, target=target) == HTCInt(12)
+        assert classad.evaluate("missing") == Undefined()
+        assert type(classad._data["unused"]) is _Unparsed
+
+    def test_eq(self):
+        first = LazyClassAd.from_source([("a", "1"), ("b", "a + 2")])
+        second = LazyClassAd.from_source([("a", "1"), ("b", "a + 2")])
+        assert first == second
+
+    def test_load_long(self):
+        cache = ParseCache()
+        dump = io.StringIO("a = 1\nb = a + 2\n\na = 1\nb = a + 2\n")
+        first, second = load_long(dump, cache=cache, lazy=True)
+        assert isinstance(first, LazyClassAd)
+        assert first.evaluate("b") == HTCInt(3)
+        assert first["b"] is second["b"]
+        assert cache.info()[:2] == (1, 2)
@@ -1,4 +1,4 @@
-from classad import parse
+from classad import parse, match, iter_matches, best_matches
 from classad._primitives import HTCInt, Undefined
 
 
@@ -47,3 +47,85 @@ def test_nested_lookup():
     assert my_classad.evaluate(
         key="rank", my=my_classad, target=target_classad
     ) == HTCInt(3)
+
+
+def test_scope_case():
+    my_classad = parse("""a = 1\nrank = MY.a + My.a + TARGET.b + target.b""")
+    target_classad = parse("""b = 2""")
+    assert my_classad.evaluate(
+        key="rank", my=my_classad, target=target_classad
+    ) == HTCInt(6)
+
+
+def test_resolution_plan():
+    expression = parse("""TARGET.Memory >= RequestMemory""")
+    job = parse("""RequestMemory = 2048""")
+    # the same expression is resolved against different ads each time
+    for memory, expected in ((1024, False), (4096, True), (2048, True)):
+        machine = parse(f"""Memory = {memory}""")
+        assert expression.evaluate(key=[], my=job, target=machine) == expected
+    assert expression._expression[0]._resolution_plan() == ("target", "memory")
+    assert expression._expression[2]._resolution_plan() == (None, "requestmemory")
+    assert parse("""a.b""")._resolution_plan() is None
+
+
+def test_match():
+    job = parse(
+        """
+    RequestMemory = 2048
+    Requirements = TARGET.Memory >= RequestMemory && TARGET.OpSys == "LINUX"
+    """
+    )
+    machines = [
+        parse(source)
+        for source in (
+            """Memory = 4096\nOpSys = "LINUX"\nRequirements = true""",
+            """Memory = 1024\nOpSys = "LINUX"\nRequirements = true""",
+            """Memory = 4096\nOpSys = "WINDOWS"\nRequirements = true""",
+            """Memory = 4096\nOpSys = "LINUX"\nRequirements = TARGET.Owner == "me" """,
+            """Memory = 4096\nOpSys = "LINUX"\nRequirements = MY.Memory > 1024""",
+            """Memory = 4096\nOpSys = "LINUX" """,
+            """OpSys = "LINUX"\nRequirements = true""",
+        )
+    ]
+    assert match(job, machines) == [machines[0], machines[4]]
+    matches = iter_matches(job, iter(machines))
+    assert next(matches) is machines[0]
+    assert next(matches) is machines[4]
+    assert list(matches) == []
+    assert match(parse("""Memory = 1"""), machines) == []
+
+
+def test_best_matches():
+    job = parse(
+        """
+    Requirements = TARGET.Memory >= 1024
+    Rank = TARGET.Memory
+    """
+    )
+    machines = [
+        parse(f"""Name = {index}\nMemory = {memory}\nRequirements = true\n{rank}""")
+        for index, (memory, rank) in enumerate(
+            (
+                (2048, "Rank = 1"),
+                (512, "Rank = 10"),
+                (4096, "Rank = 1"),
+                (2048, "Rank = 5"),
+                ("undefined", "Rank = 1"),
+                (8192, 'Requirements = TARGET.Rank =?= "none"'),
+                (4096, "Rank = 1"),
+                (2048, ""),
+            )
+        )
+    ]
+
+    def names(matches):
+        return [int(machine["name"]) for machine in matches]
+
+    assert names(best_matches(job, machines, 3)) == [2, 6, 3]
+    assert names(best_matches(job, machines, 10)) == [2, 6, 3, 0, 7]
+    assert best_matches(job, machines, 0) == []
+    # a missing or non-numeric rank is the lowest rank
+    assert names(best_matches(job, machines, 2, rank_key="Missing")) == [0, 2]
+    job["Rank"] = parse("""TARGET.Memory > 2048""")
+    assert names(best_matches(job, machines, 3)) == [2, 6, 3]
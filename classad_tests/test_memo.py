@@ -0,0 +1,72 @@
+import pytest
+
+from classad import parse, evaluation_cache, register_function, EvaluationCache
+from classad._memo import current
+from classad._registry import _builtins
+from classad._primitives import HTCFloat, HTCInt, HTCStr
+
+
+@pytest.fixture
+def counted():
+    calls = []
+
+    def count(value):
+        calls.append(value)
+        return value
+
+    register_function("countedIdentity", count, pure=True)
+    yield calls
+    del _builtins["countedidentity"]
+
+
+def test_cached(counted):
+    expression = parse("countedIdentity(TARGET.OpSys)")
+    machines = [parse(f'OpSys = "{name}"') for name in ("LINUX", "linux", "LINUX")]
+    with evaluation_cache() as cache:
+        results = [expression.evaluate(my=None, target=machine) for machine in machines]
+        assert current.cache is cache
+    assert current.cache is None
+    assert results == [HTCStr("LINUX"), HTCStr("linux"), HTCStr("LINUX")]
+    assert counted == [HTCStr("LINUX"), HTCStr("linux")]
+    assert cache.info() == (1, 2, 0, 4096, 2)
+    expression.evaluate(target=machines[0])
+    assert len(counted) == 3
+
+
+def test_compiled(counted):
+    compiled = parse("countedIdentity(MY.a) + countedIdentity(1.0)").compile()
+    job = parse("a = 1")
+    with evaluation_cache() as cache:
+        assert [compiled(job, None) for _ in range(3)] == [HTCInt(2)] * 3
+    assert counted == [HTCInt(1), HTCFloat(1.0)]
+    assert type(counted[1]) is HTCFloat
+    assert cache.hits == 4 and cache.misses == 2
+
+
+def test_impure():
+    expression = parse("random(1000000)")
+    with evaluation_cache() as cache:
+        for _ in range(2):
+            expression.evaluate()
+            expression.compile()(None, None)
+    assert cache.info()[:2] == (0, 0)
+
+
+def test_not_memoized(counted):
+    expression = parse("countedIdentity([a = 1])")
+    with evaluation_cache() as cache:
+        expression.evaluate()
+        expression.evaluate()
+    assert len(counted) == 2 and len(cache) == 0
+
+
+def test_nested_and_bounded():
+    expression = parse('strcat("a", TARGET.x)')
+    with evaluation_cache() as outer:
+        with evaluation_cache(maxsize=1) as inner:
+            for x in (1, 2, 1):
+                expression.evaluate(target=parse(f"x = {x}"))
+        assert current.cache is outer
+    assert inner.info() == (0, 3, 2, 1, 1) and len(outer) == 0
+    with pytest.raises(ValueError):
+        EvaluationCache(maxsize=0)
@@ -0,0 +1,85 @@
+import pytest
+
+from classad import parse
+from classad._expression import FunctionExpression, ArithmeticExpression
+from classad._optimize import fold_constants
+from classad._primitives import HTCInt, HTCFloat, HTCStr, HTCBool, Undefined, Error
+
+MY = parse('a = 4\nb = true\nName = "slot1"')
+TARGET = parse('Memory = 2048\nName = "ab"')
+
+EXPRESSIONS = (
+    "2 * 1024",
+    "(3600 * 24) + 60",
+    "1 + 2 + a + 3",
+    "a + 2 * 3",
+    "1 < 2 < 3",
+    '10 * "foo"',
+    "17 / 0",
+    "10 + undefined",
+    "True && Undefined",
+    "Error || b",
+    "b && false",
+    "-(2)",
+    "!true",
+    "!undefined",
+    "true ? a : b",
+    "undefined ?: a",
+    "5 ? 1 : 2",
+    "b ? 1 + 1 : 2",
+    "{1, 2 * 3}[0]",
+    "{1, 2 * 3}[1]",
+    "{1, 2 * 3}",
+    "{a, 2}[0]",
+    'strcat("a", "b") == TARGET.Name',
+    "floor(3.7) + TARGET.Memory",
+    "(2.5 / 2) + a",
+    "-3 || 0",
+    "(isUndefined(TARGET.a) ? undefined : true) && TARGET.b",
+)
+
+
+@pytest.mark.parametrize("content", EXPRESSIONS)
+def test_same_result(content):
+    expression = parse(content)
+    folded = fold_constants(expression)
+    for my, target in ((MY, TARGET), (MY, None), (None, None)):
+        expected = expression.evaluate(my=my, target=target)
+        result = folded.evaluate(my=my, target=target)
+        assert type(result) is type(expected) and result == expected
+
+
+def test_folded():
+    assert fold_constants(parse("2 * 1024")) == HTCInt(2048)
+    assert fold_constants(parse("(3600 * 24) + 60")) == HTCInt(86460)
+    assert fold_constants(parse("1.5 * 2")) == HTCFloat(3.0)
+    assert fold_constants(parse('strcat("a", "b")')) == HTCStr("ab")
+    assert fold_constants(parse("floor(3.7)")) == HTCInt(3)
+    assert fold_constants(parse("10 == undefined")) == Undefined()
+    assert fold_constants(parse('10 == "ABC"')) == Error()
+    assert fold_constants(parse("! false")) == HTCBool(True)
+    classad = fold_constants(parse("RequestMemory = 2 * 1024\nRank = a + 1 * 2"))
+    assert classad["requestmemory"] == HTCInt(2048)
+    assert classad["rank"]._expression[2] == HTCInt(2)
+
+
+def test_partial():
+    result = fold_constants(parse("1 + 2 + a + 3"))
+    assert isinstance(result, ArithmeticExpression)
+    assert result._expression[0] == HTCInt(3)
+    assert len(result._expression) == 5
+
+
+def test_impure():
+    assert isinstance(fold_constants(parse("random()")), FunctionExpression)
+    assert isinstance(fold_constants(parse("time()")), FunctionExpression)
+
+
+def test_shared():
+    expression = parse("TARGET.Memory >= a")
+    assert fold_constants(expression) is expression
+
+
+def test_parse_optimize():
+    assert parse("2 * 1024", optimize=True) == HTCInt(2048)
+    assert parse("2 * 1024", backend="fast", optimize=True) == HTCInt(2048)
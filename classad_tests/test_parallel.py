@@ -0,0 +1,44 @@
+import pickle
+
+import pyparsing as pp
+import pytest
+
+from classad import parse, parse_many
+from classad._expression import LazyClassAd, _Unparsed
+from classad._primitives import HTCBool, HTCInt, Undefined
+from classad_tests.test_parser import EXPRESSIONS, assert_same_tree
+
+
+@pytest.mark.parametrize("content", EXPRESSIONS)
+def test_pickle(content):
+    expression = parse(content, backend="fast")
+    assert_same_tree(pickle.loads(pickle.dumps(expression)), expression)
+
+
+def test_pickle_primitives():
+    for primitive in (HTCBool(True), HTCBool(False), Undefined(), HTCInt(3)):
+        assert pickle.loads(pickle.dumps(primitive)) == primitive
+
+
+def test_pickle_lazy():
+    classad = LazyClassAd.from_source([("a", "1"), ("b", "a + 1")])
+    classad["a"]
+    restored = pickle.loads(pickle.dumps(classad))
+    assert type(restored._data["b"]) is _Unparsed
+    assert restored.evaluate("b") == HTCInt(2)
+
+
+def test_parse_many():
+    texts = [f"a = {index}\nb = a * 2" for index in range(50)]
+    results = list(parse_many(texts, workers=2, chunksize=3))
+    assert [result.evaluate("b") for result in results] == [
+        HTCInt(index * 2) for index in range(50)
+    ]
+    assert list(parse_many([], workers=1)) == []
+
+
+def test_parse_many_invalid():
+    with pytest.raises(pp.ParseException):
+        list(parse_many(["a", "(a"], workers=1))
+    with pytest.raises(ValueError):
+        list(parse_many(["a"], chunksize=0))
@@ -0,0 +1,104 @@
+from functools import partial
+
+import pyparsing as pp
+import pytest
+
+from classad import parse
+from classad._base_expression import CompoundExpression
+from classad._expression import ClassAd, FunctionExpression
+from classad._parser import tokenize
+from classad_tests import test_grammar
+
+EXPRESSIONS = (
+    "10",
+    "1.5e-3",
+    ".5",
+    '"ab\\"cd\\\\ef"',
+    "'quoted name'",
+    "a + b - c * d / e",
+    "a < b <= c",
+    "a == b != c =?= d is e =!= f isnt g",
+    "a && b || c && d",
+    "!-a",
+    "--1",
+    "-a.b",
+    "a ? b ? c : d : e",
+    "true ?: 1",
+    "{1, {2, 3}, [a = b]}",
+    "{1, 2}[0]",
+    "f(1, 2)[0]",
+    "(a).b",
+    "a.b.c.d",
+    ".a.b",
+    "MY.a",
+    "TARGET.a.b",
+    "TARGET[1]",
+    "target",
+    "parent.a",
+    "[c = 5].c",
+    "[a = 1; b = [a = 2; c = [b = .a]]; d = .b.c.a]",
+    "[a = 1;]",
+    "a = b c = d",
+    "x = y = 1",
+    "1 + a = 2",
+    'strcat("slot", SlotID + 10, "_State")',
+    'Requirements = TARGET.Owner=="smith" || LoadAvg<=0.3 && KeyboardIdle>15*60',
+)
+
+
+def assert_same_tree(first, second):
+    assert type(first) is type(second)
+    if isinstance(first, ClassAd):
+        assert first.keys() == second.keys()
+        for key in first:
+            assert_same_tree(first[key], second[key])
+    elif isinstance(first, CompoundExpression):
+        if isinstance(first, FunctionExpression):
+            assert first._name == second._name
+        assert_same_tree(first._expression, second._expression)
+    elif isinstance(first, tuple):
+        assert len(first) == len(second)
+        for first_element, second_element in zip(first, second):
+            assert_same_tree(first_element, second_element)
+    else:
+        assert first == second
+
+
+@pytest.mark.parametrize("content", EXPRESSIONS)
+def test_same_tree(content):
+    assert_same_tree(parse(content), parse(content, backend="fast"))
+
+
+@pytest.mark.parametrize(
+    "content", ("", "a b", "(a", "[a = 1", "f(a,)", "a ?", "00", "1.", "f (x)", "$")
+)
+def test_invalid(content):
+    with pytest.raises(pp.ParseException):
+        parse(content)
+    with pytest.raises(pp.ParseException):
+        parse(content, backend="fast")
+
+
+def test_unknown_backend():
+    with pytest.raises(ValueError):
+        parse("1", backend="unknown")
+
+
+def test_tokenize():
+    assert [token[:2] for token in tokenize("f(a)>=1.0")] == [
+        ("name", "f"),
+        ("operator", "("),
+        ("name", "a"),
+        ("operator", ")"),
+        ("operator", ">="),
+        ("float", "1.0"),
+        ("end", ""),
+    ]
+
+
+class TestFastGrammar(test_grammar.TestGrammar):
+    """Run the entire grammar test suite against the fast parser backend"""
+
+    @pytest.fixture(autouse=True)
+    def fast_backend(self, monkeypatch):
+        monkeypatch.setattr(test_grammar, "parse", partial(parse, backend="fast"))
@@ -0,0 +1,51 @@
+import pytest
+
+from classad import parse, References
+
+
+def names(*names):
+    return frozenset(names)
+
+
+@pytest.mark.parametrize("backend", ["pyparsing", "fast"])
+@pytest.mark.parametrize(
+    "expression, my, target",
+    [
+        ("1 + 2", names(), names()),
+        ("TARGET.Memory >= MY.RequestMemory", names("requestmemory"), names("memory")),
+        ("Cpus", names("cpus"), names("cpus")),
+        ("-a * (b ? TARGET.c : MY.d)", names("a", "b", "d"), names("a", "b", "c")),
+        ("x ?: TARGET.y", names("x"), names("x", "y")),
+        ("{a, TARGET.b}[MY.c]", names("a", "c"), names("a", "b")),
+        ("strcat(MY.a, TARGET.b)", names("a"), names("b")),
+        ("MY.a.b + TARGET.c.d + e.f", names("a", "e"), names("c", "e")),
+    ],
+)
+def test_references(backend, expression, my, target):
+    assert parse(expression, backend=backend).references() == References(my, target)
+
+
+@pytest.mark.parametrize("expression", ["eval(a)", "parent.a", "[a = 1].a"])
+def test_dynamic(expression):
+    assert parse(expression).references().dynamic
+
+
+def test_follow():
+    job = parse(
+        """
+        RequestMemory = MyMemoryReq
+        MyMemoryReq = 2 * TARGET.Disk + Base
+        Cycle = MY.Cycle
+        Requirements = TARGET.Memory >= RequestMemory && Foo && Cycle
+        """
+    )
+    assert job["Requirements"].references(my=job) == References(
+        names("requestmemory", "mymemoryreq", "base", "foo", "cycle"),
+        names("memory", "disk", "base", "foo"),
+    )
+    assert job.references().target >= names("memory", "disk", "base", "foo")
+
+
+def test_memoized():
+    expression = parse("TARGET.Memory >= RequestMemory")
+    assert expression._references() is expression._references()
@@ -0,0 +1,70 @@
+import pytest
+
+from classad import parse, register_function
+from classad._registry import _builtins, lookup
+from classad._primitives import Error, HTCInt, HTCStr
+
+
+@pytest.fixture
+def cores():
+    def cores(memory, per_core=HTCInt(2048)):
+        return HTCInt(memory // per_core)
+
+    yield register_function("memoryCores", cores, pure=True)
+    del _builtins["memorycores"]
+
+
+def test_builtins():
+    strcat = lookup("STRCAT")
+    assert strcat is lookup("strcat") and strcat.pure
+    assert (strcat.minimum, strcat.maximum) == (1, None)
+    assert not lookup("random").pure
+    assert lookup("parse") is None and lookup("_all_strings") is None
+    assert parse('StrCat("a", "b")').evaluate() == HTCStr("ab")
+
+
+@pytest.mark.parametrize("backend", ["pyparsing", "fast"])
+def test_arity(backend):
+    for source in ("toLower()", "isString(1, 2)", "stringListMember(a)"):
+        expression = parse(source, backend=backend)
+        assert isinstance(expression.evaluate(), Error)
+        assert isinstance(expression.compile()(None, None), Error)
+    assert isinstance(parse("isString(1, 2)", optimize=True), Error)
+
+
+def test_custom(cores):
+    assert (cores.minimum, cores.maximum) == (1, 2)
+    machine = parse("Memory = 8192")
+    expression = parse("MemoryCores(Memory) + memorycores(Memory, 4096)")
+    assert expression.evaluate(my=machine) == HTCInt(6)
+    assert expression.compile()(machine, None) == HTCInt(6)
+    assert parse("memoryCores(4096)", optimize=True) == HTCInt(2)
+    assert isinstance(parse("memoryCores()").evaluate(), Error)
+
+
+def test_late_registration():
+    expression = parse("latelyRegistered(1)")
+    with pytest.raises(AttributeError):
+        expression.evaluate()
+    register_function("latelyRegistered", lambda value: value + HTCInt(1))
+    try:
+        assert expression.evaluate() == HTCInt(2)
+        assert not lookup("LatelyRegistered").pure
+        assert parse("latelyRegistered(1)", optimize=True) == expression
+    finally:
+        del _builtins["latelyregistered"]
+
+
+def test_replace(cores):
+    expression = parse("memoryCores(8192)")
+    register_function(
+        "MEMORYCORES", lambda memory, per_core=1024: HTCInt(memory // per_core)
+    )
+    assert expression.evaluate() == HTCInt(8)
+    invalid = parse("memoryCores(1, 2, 3)")
+    with pytest.raises(ValueError):
+        register_function("memoryCores", lambda memory: memory)
+    with pytest.raises(ValueError):
+        register_function("memoryCores", lambda *arguments: HTCInt(len(arguments)))
+    assert expression.evaluate() == HTCInt(8)
+    assert isinstance(invalid.evaluate(), Error)
@@ -0,0 +1,72 @@
+import gc
+import pickle
+
+from classad import parse
+from classad._expression import ClassAd
+from classad._primitives import HTCInt, Undefined
+from classad._shape import CompactRecord, MAX_TRANSITIONS
+
+
+def test_shared_shape():
+    first, second = parse("a = 1\nB = 2"), parse("A = 3\nb = a + 1")
+    assert type(first._data) is CompactRecord
+    assert first._data._shape is second._data._shape
+    assert list(first) == ["a", "b"] and len(second) == 2
+    assert second.evaluate("b") == HTCInt(4)
+    assert first == parse("a = 1\nb = 2") and first != second
+
+
+def test_change_shape():
+    classad = parse("a = 1\nb = 2")
+    shape = classad._data._shape
+    classad["A"] = HTCInt(5)
+    assert classad._data._shape is shape
+    classad["c"] = HTCInt(3)
+    assert classad._data._shape is not shape
+    assert classad._data._shape is parse("a = 1\nb = 2\nc = 3")._data._shape
+    assert dict(classad.items()) == {"a": HTCInt(5), "b": HTCInt(2), "c": HTCInt(3)}
+
+
+def test_delete():
+    classad = parse("a = 1\nb = 2")
+    del classad["c"]
+    assert type(classad._data) is CompactRecord
+    del classad["a"]
+    assert type(classad._data) is dict
+    assert list(classad) == ["b"] and isinstance(classad["a"], Undefined)
+    classad["a"] = HTCInt(1)
+    assert classad == parse("b = 2\na = 1")
+
+
+def test_fallback():
+    ads = []
+    for index in range(MAX_TRANSITIONS + 1):
+        classad = ClassAd()
+        classad["common"] = HTCInt(index)
+        classad[f"name{index}"] = HTCInt(index)
+        ads.append(classad)
+    assert all(type(classad._data) is CompactRecord for classad in ads[:-1])
+    assert type(ads[-1]._data) is dict
+    assert ads[-1].evaluate(f"name{MAX_TRANSITIONS}") == HTCInt(MAX_TRANSITIONS)
+
+
+def test_pickle():
+    classad = parse("a = 1\nb = a * 2")
+    restored = pickle.loads(pickle.dumps(classad))
+    assert restored == classad
+    assert restored._data._shape is classad._data._shape
+
+
+def test_release():
+    shape = ClassAd()._data._shape
+    # ads of many different kinds that are discarded do not exhaust the shapes
+    for index in range(4 * MAX_TRANSITIONS):
+        classad = ClassAd()
+        classad[f"kind{index}"] = HTCInt(index)
+        assert type(classad._data) is CompactRecord
+    del classad
+    gc.collect()
+    assert not any(key.startswith("kind") for key in shape._transitions)
+    kept = parse("a = 1\nb = 2")
+    assert "a" in shape._transitions
+    assert kept._data._shape._parent is shape._transitions["a"]
@@ -0,0 +1,95 @@
+import pytest
+
+from classad import parse
+from classad._expression import ArithmeticExpression, AttributeExpression
+from classad._primitives import HTCBool, HTCInt, HTCStr, Undefined
+
+from classad_tests.utility import outcome, same
+
+JOBS = (
+    """
+    RequestMemory = 2048
+    Local = false
+    Arch = "X86_64"
+    Alias = RequestMemory
+    Loop = Loop
+    """,
+    """
+    RequestMemory = 1024.5
+    Local = true
+    Alias = Missing
+    """,
+    "Local = undefined",
+)
+
+MACHINES = (
+    'Memory = 4096\nArch = "X86_64"\nCpus = 4',
+    'Memory = 1024\nArch = "INTEL"\nRequestMemory = 1',
+    "Memory = undefined\nArch = 5",
+    "Memory = Cpus * 2\nCpus = 2\nLocal = true",
+)
+
+EXPRESSIONS = (
+    "TARGET.Memory >= RequestMemory",
+    "TARGET.Memory >= MY.RequestMemory",
+    "Local || TARGET.Memory >= RequestMemory",
+    "true && (TARGET.Arch == Arch)",
+    "(Arch == TARGET.Arch) && true",
+    "Local && TARGET.Memory",
+    "true && TARGET.Memory",
+    "false || TARGET.Cpus > 2",
+    "Local ? TARGET.Memory : RequestMemory * 2",
+    "Local ?: TARGET.Cpus",
+    "isUndefined(Missing) && TARGET.Arch == Arch",
+    "Missing + 1",
+    "MY.Missing",
+    "Alias * 2",
+    "Loop",
+    "-RequestMemory + TARGET.Memory",
+    "!Local",
+    "{RequestMemory, TARGET.Cpus}[1]",
+    "strcat(Arch, TARGET.Arch)",
+    "(RequestMemory / 2) + TARGET.Memory",
+    "(isUndefined(TARGET.Cpus) ? undefined : true) && TARGET.Memory",
+)
+
+
+@pytest.mark.parametrize("expression", EXPRESSIONS)
+def test_same_result(expression):
+    expression = parse(expression, backend="fast")
+    for job in map(parse, JOBS):
+        specialized = expression.specialize(my=job)
+        compiled = specialized.compile([])
+        for machine in map(parse, MACHINES):
+            expected = outcome(expression._evaluate, key=[], my=job, target=machine)
+            result = outcome(specialized._evaluate, key=[], my=job, target=machine)
+            assert same(result, expected)
+            assert same(outcome(compiled, job, machine), expected)
+
+
+def test_target_only():
+    job = parse(JOBS[0])
+    requirements = parse(
+        "Local || TARGET.Memory >= RequestMemory && TARGET.Arch == Arch && Cpus > 1"
+    ).specialize(my=job)
+    references = requirements.references()
+    assert references.target == {"memory", "arch", "cpus"}
+    assert references.my == set() and not references.dynamic
+
+
+def test_simplified():
+    job = parse(JOBS[0])
+    assert parse("Local && TARGET.Memory > 1").specialize(job) == HTCBool(False)
+    assert parse("!Local || TARGET.Memory > 1").specialize(job) == HTCBool(True)
+    assert parse("RequestMemory * 2").specialize(job) == HTCInt(4096)
+    assert isinstance(parse("MY.Missing").specialize(job), Undefined)
+    residual = parse("true && (TARGET.Arch == Arch) && true").specialize(job)
+    assert isinstance(residual, ArithmeticExpression)
+    assert residual._expression[1] == "==" and residual._expression[2] == HTCStr(
+        "X86_64"
+    )
+    # only boolean results may be simplified, numbers are an error for &&
+    residual = parse("true && TARGET.Memory").specialize(job)
+    assert isinstance(residual, ArithmeticExpression)
+    # self-references are kept as they are
+    assert isinstance(parse("Loop").specialize(job), AttributeExpression)
@@ -0,0 +1,134 @@
+import random
+
+import pytest
+
+from classad import parse, match
+from classad._primitives import HTCBool, HTCInt, HTCFloat, Undefined, Error
+
+numpy = pytest.importorskip("numpy")
+
+from classad import ClassAdTable  # noqa: E402
+from classad._table import VALUE, UNDEFINED_STATE, ERROR_STATE  # noqa: E402
+from classad_tests.utility import outcome, same  # noqa: E402
+
+LITERALS = (
+    "0",
+    "2",
+    "-3",
+    "2.5",
+    '"abc"',
+    '"ABC"',
+    "true",
+    "false",
+    "undefined",
+    "error",
+    "{1, 2}",
+)
+
+
+def row(rng: random.Random):
+    # attributes may be expressions of the attributes defined before them
+    return parse(
+        f"""
+        a = {rng.choice(LITERALS)}
+        b = {rng.choice(LITERALS + ("a + 1", "a"))}
+        c = {rng.choice(LITERALS + ("isInteger(a)", "b"))}
+        """,
+        backend="fast",
+    )
+
+
+EXPRESSIONS = (
+    "TARGET.a + TARGET.b * 2",
+    "TARGET.a / TARGET.b",
+    "a - b",
+    "MY.a * TARGET.b",
+    "TARGET.a < TARGET.b",
+    "TARGET.a >= 2 && TARGET.b < 3",
+    "TARGET.a == TARGET.b",
+    'TARGET.c != "abc"',
+    "TARGET.a || TARGET.b && !TARGET.a",
+    "undefined && TARGET.a",
+    "-(TARGET.a + 0)",
+    "TARGET.a ? TARGET.b : TARGET.c",
+    "TARGET.a ?: TARGET.b",
+    "TARGET.a =?= TARGET.b",
+    "isInteger(TARGET.a) && TARGET.b > 0",
+    "TARGET.missing == 1",
+    "d > 1",
+)
+
+
+@pytest.mark.parametrize("expression", EXPRESSIONS)
+def test_same_result(expression):
+    rng = random.Random(expression)
+    rows = [row(rng) for _ in range(100)]
+    table = ClassAdTable(rows)
+    expression = parse(expression, backend="fast")
+    for my in (rows[0], parse("a = 2\nd = 3", backend="fast"), None):
+        expected = [
+            outcome(expression._evaluate, key=[], my=my, target=ad) for ad in rows
+        ]
+        failure = next((value for value in expected if isinstance(value, type)), None)
+        if failure is not None:
+            # rows that the interpreter fails on fail the same way
+            assert outcome(table.evaluate, expression, my=my) is failure
+            continue
+        values, states = table.evaluate(expression, my=my)
+        for result, state, reference in zip(values, states, expected):
+            assert same(result, reference)
+            if isinstance(reference, Undefined):
+                assert state == UNDEFINED_STATE
+            elif isinstance(reference, Error):
+                assert state == ERROR_STATE
+            else:
+                assert state == VALUE
+        mask = table.matches(expression, my=my)
+        assert mask.tolist() == [result is HTCBool.TRUE for result in expected]
+
+
+def test_columns():
+    rows = [
+        parse(source, backend="fast")
+        for source in (
+            'Memory = 2048\nOpSys = "LINUX"',
+            'Memory = 4096.5\nOpSys = "linux"',
+            "Memory = undefined\nOpSys = true",
+            'Memory = error\nOpSys = "WINDOWS"',
+            "Memory = MaxMemory\nMaxMemory = 8192",
+        )
+    ]
+    table = ClassAdTable(rows)
+    job = parse("RequestMemory = 1024")
+    values, states = table.evaluate(parse("TARGET.Memory * 2"), my=job)
+    assert states.tolist() == [VALUE, VALUE, UNDEFINED_STATE, ERROR_STATE, VALUE]
+    assert type(values[0]) is HTCInt and int(values[0]) == 4096
+    assert type(values[1]) is HTCFloat and values[1] == 8193.0
+    assert int(values[4]) == 16384
+    values, states = table.evaluate(parse('TARGET.OpSys == "Linux"'), my=job)
+    assert values.tolist()[:2] == [HTCBool(True), HTCBool(True)]
+    assert states.tolist() == [VALUE, VALUE, ERROR_STATE, VALUE, UNDEFINED_STATE]
+    assert len(table) == len(rows) and list(table) == rows and table[1] is rows[1]
+
+
+def test_match():
+    rng = random.Random(1337)
+    machines = [
+        parse(
+            f"""
+            Memory = {rng.choice((1024, 2048, 4096))}
+            OpSys = {rng.choice(('"LINUX"', '"WINDOWS"'))}
+            Requirements = TARGET.RequestMemory <= {rng.choice((1024, 2048))}
+            """,
+            backend="fast",
+        )
+        for _ in range(200)
+    ]
+    job = parse(
+        """
+        RequestMemory = 2048
+        Requirements = TARGET.Memory >= RequestMemory && TARGET.OpSys == "LINUX"
+        """
+    )
+    table = ClassAdTable(machines)
+    assert table.match(job) == match(job, machines)
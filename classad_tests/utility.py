@@ -0,0 +1,24 @@
+from typing import Any, Callable
+
+from classad._primitives import HTCInt, HTCFloat
+
+
+def outcome(function: Callable, *args, **kwargs) -> Any:
+    """Get the result of calling ``function`` or the type of exception it raises"""
+    try:
+        return function(*args, **kwargs)
+    except Exception as err:
+        return type(err)
+
+
+def same(result, expected) -> bool:
+    """Check that two results or exception types of an evaluation are identical"""
+    if type(result) is not type(expected):
+        return False
+    elif isinstance(result, HTCInt):
+        return int(result) == int(expected)
+    elif isinstance(result, HTCFloat):
+        return float(result) == float(expected) or (
+            result != result and expected != expected
+        )
+    return result is expected or result == expected